@@ -5,18 +5,45 @@
 # ============================================================================
 
 # stdlib
+import os
 import sys
-import shutil
+import csv
+import array
+import json
+import mmap
+import argparse
+import struct
+import zlib
+import random
+import itertools
+import hashlib
+import marshal
+import tempfile
+import io
+import timeit
+import platform
+import statistics
+import threading
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from functools import partial
 
+# optional: NumPy backs the whole-table views (read_table/write_table)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # tkinter
 import tkinter as tk
 from tkinter import (
     Toplevel, Frame, Label, Button, Radiobutton, StringVar, IntVar,
     LabelFrame, Checkbutton, Entry, filedialog, messagebox
 )
-from tkinter.ttk import Combobox, Separator
+from tkinter.ttk import Combobox, Progressbar, Separator
 
 # --- Characters: Base editor for reading/writing character records (party or enemy). Builds common UI and handles byte parsing from the ROM.
 class Characters:
@@ -25,55 +52,56 @@ class Characters:
         self.win = Toplevel()
         self.win.resizable(False, False)
         self.win.geometry('+200+10')
+        self.guards = FieldGuards(self.win)
         self.filename = f
         self.addresses = a
         self.name_length = n
         self.data_read = r
         self.char_type = t
         self.data_seek = 44
+        self.rom = open_rom(self.filename)
+        self.codec = ENEMY_CODEC if t == 1 else CHARACTER_CODEC
 
         # dictionaries and lists
         self.major_dic = get_major_item_dic(self.filename)
         self.inv_major_dic = {v: k for k, v in self.major_dic.items()}
-        self.armor_lst = ['NONE'] + [item[8:] for item in self.major_dic.values() if item.startswith('(armor)')]
-        self.shield_lst = ['NONE'] + [item[9:] for item in self.major_dic.values() if item.startswith('(shield)')]
-        self.weapon_lst = ['NONE'] + [item[9:] for item in self.major_dic.values() if item.startswith('(weapon)')]
+        self.armor_lst, self.shield_lst, self.weapon_lst = get_equipment_lists(self.filename)
         self.spell_dic = get_minor_dic(self.filename, SPELL_DIC, 22)
         self.inv_spell_dic = {v: k for k, v in self.spell_dic.items()}
-        self.character_list, self.character_addresses = get_major_name_lists(self.filename, self.addresses,
-                                                                             self.name_length)
+        self.names = name_list(self.filename, self.addresses, self.name_length)
+        self.character_list, self.character_addresses = self.names.names, self.names.addresses
 
         # variables
         self.character = StringVar()
         self.character.trace('w', self.set_defaults)
         self.name = StringVar()
-        self.name.trace('w', partial(limit_name_size, self.name, self.name_length))
+        self.guards.name(self.name, self.name_length)
         self.aspect = IntVar()
         self.skills = []
         for _ in SKILLS:
             i = StringVar()
-            i.trace('w', partial(limit, i, 10))
+            self.guards.limit(i, 10)
             self.skills.append(i)
         self.shield_skill = StringVar()
-        self.shield_skill.trace('w', partial(limit, self.shield_skill, 10))
+        self.guards.limit(self.shield_skill, 10)
         self.atts = []
         for i in range(6):
             i = StringVar()
-            i.trace('w', partial(limit, i, 127))
+            self.guards.limit(i, 127)
             self.atts.append(i)
         self.level = StringVar()
-        self.level.trace('w', partial(limit, self.level, 40))
+        self.guards.limit(self.level, 40)
         self.weapons = [StringVar() for i in range(3)]
         self.spells = [StringVar() for i in range(5)]
         self.schools = StringVar()
         self.spell_levels = []
         for i in range(5):
             i = StringVar()
-            i.trace('w', partial(limit, i, 15))
+            self.guards.limit(i, 15)
             self.spell_levels.append(i)
         self.armor = StringVar()
         self.protection = StringVar()
-        self.protection.trace('w', partial(limit_127, self.protection))
+        self.guards.limit_127(self.protection)
         self.shield = StringVar()
         self.resist1a = StringVar()
         self.resist1b = StringVar()
@@ -102,8 +130,7 @@ class Characters:
         self.spell_level = []
         for x in range(5):
             self.spell.append(
-                Combobox(self.spell_frame, textvariable=self.spells[x], values=list(self.inv_spell_dic.keys()),
-                         width=16, state='readonly'))
+                Picker(self.spell_frame, self.inv_spell_dic, textvariable=self.spells[x], width=16))
             self.spell_level.append(Entry(self.spell_frame, textvariable=self.spell_levels[x], width=4))
         self.resist_frame = LabelFrame(self.not_loot_frame, text='Resists')
         self.resist_menu1 = Combobox(self.resist_frame, textvariable=self.resist1a, values=list(RESIST.keys()),
@@ -127,14 +154,11 @@ class Characters:
         self.weapon_frame = LabelFrame(self.equipment_frame, text='Weapons')
         self.weapon_menu = []
         for x in range(3):
-            self.weapon_menu.append(Combobox(self.weapon_frame, textvariable=self.weapons[x], values=self.weapon_lst,
-                                             width=16, state='readonly'))
+            self.weapon_menu.append(Picker(self.weapon_frame, self.weapon_lst, textvariable=self.weapons[x], width=16))
         self.armor_frame = LabelFrame(self.equipment_frame, text='Armor')
-        self.armor_menu = Combobox(self.armor_frame, textvariable=self.armor, values=self.armor_lst, width=16,
-                                   state='readonly')
+        self.armor_menu = Picker(self.armor_frame, self.armor_lst, textvariable=self.armor, width=16)
         self.shield_frame = LabelFrame(self.equipment_frame, text='Shield')
-        self.shield_menu = Combobox(self.shield_frame, textvariable=self.shield, values=self.shield_lst, width=16,
-                                    state='readonly')
+        self.shield_menu = Picker(self.shield_frame, self.shield_lst, textvariable=self.shield, width=16)
         self.skill_frame = LabelFrame(self.not_loot_frame)
         self.shield_num = Entry(self.skill_frame, textvariable=self.shield_skill, width=4)
         self.shield_label = Label(self.skill_frame, text='Shield', anchor='e', width=9)
@@ -144,176 +168,94 @@ class Characters:
         idx = self.default_name_menu.current()
         if idx < 0 or idx >= len(self.character_addresses):
             return
-        with open(self.filename, 'rb') as f:
-            address = self.character_addresses[idx]
-            f.seek(address)
-            self.name.set(f.read(self.name_length).decode("utf-8"))
-
-            f.seek(address + self.data_seek)
-            d = f.read(self.data_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-
-            # IntVar
-            self.aspect.set(int(d[0:2], 16))
-
-            # skills -> StringVar ('' when 255)
-            for i, s in enumerate(self.skills):
-                sn = int(d[6 + i * 2: 8 + i * 2], 16)
-                s.set('' if sn == 255 else str(sn))
-
-            # shield skill -> StringVar ('' when 255)
-            shi = int(d[146:148], 16)
-            self.shield_skill.set('' if shi == 255 else str(shi))
-
-            # attributes -> StringVar
-            for i, a in enumerate(self.atts):
-                a.set(str(int(d[52 + i * 2: 54 + i * 2], 16)))
-
-            # level -> StringVar
-            self.level.set(str(int(d[66:68], 16)))
-
-            # set_defaults: weapons
-            for idx, w in enumerate(self.weapons):
-                code = d[70 + idx * 4: 74 + idx * 4].upper()
-                if code == '0000':
-                    w.set(self.major_dic.get(code))
-                else:
-                    w.set(self.major_dic.get(code)[9:])
-
-            # armor -> StringVar
-            ar = d[136:140].upper()
-            if ar == '0000':
-                self.armor.set(self.major_dic[ar])
-            else:
-                self.armor.set(self.major_dic[ar][8:])
-
-            # base protection -> StringVar
-            self.protection.set(str(int(d[140:142], 16)))
-
-            # shield -> StringVar
-            sh = d[142:146].upper()
-            if sh == '0000':
-                self.shield.set(self.major_dic[sh])
-            else:
-                self.shield.set(self.major_dic[sh][9:])
-
-            # school -> StringVar
-            self.schools.set(inv_SCHOOL[d[106:108].upper()])
-
-            # spells -> StringVar
-            for i, sv in enumerate(self.spells):
-                sv.set(self.spell_dic[d[86 + i * 4: 90 + i * 4].upper()])
-
-            # spell levels -> StringVar
-            for i, sv in enumerate(self.spell_levels):
-                sv.set(str(int(d[108 + i * 2: 110 + i * 2], 16)))
-
-            # resists -> StringVar
-            self.resist1a.set(inv_RESIST[d[148:150].upper()])
-            self.resist1b.set(inv_RESIST_AMOUNTS[d[150:152].upper()])
-            self.resist2a.set(inv_RESIST[d[152:154].upper()])
-            self.resist2b.set(inv_RESIST_AMOUNTS[d[154:156].upper()])
+        address = self.character_addresses[idx]
+        self.name.set(self.rom.text(address, self.name_length))
+        self.load_record(self.codec.decode(self.rom.read(address + self.data_seek, self.data_read)))
+
+    # Push a decoded character record into the Tk variables ('' when a skill is 255).
+    def load_record(self, rec):
+        self.aspect.set(rec['aspect'])
+
+        for s, sn in zip(self.skills, rec['skills']):
+            s.set('' if sn == 255 else str(sn))
+        shi = rec['shield_skill']
+        self.shield_skill.set('' if shi == 255 else str(shi))
+
+        for a, v in zip(self.atts, rec['attributes']):
+            a.set(str(v))
+        self.level.set(str(rec['level']))
+
+        # equipment menus list names without the '(weapon) ' / '(armor) ' / '(shield) ' prefix
+        for w, code in zip(self.weapons, rec['weapons']):
+            w.set(self.item_label(code, 9))
+        self.armor.set(self.item_label(rec['armor'], 8))
+        self.protection.set(str(rec['protection']))
+        self.shield.set(self.item_label(rec['shield'], 9))
+
+        self.schools.set(inv_SCHOOL[f"{rec['school']:02X}"])
+        for sv, code in zip(self.spells, rec['spells']):
+            sv.set(self.spell_dic[code])
+        for sv, lv in zip(self.spell_levels, rec['spell_levels']):
+            sv.set(str(lv))
+
+        self.resist1a.set(inv_RESIST[f"{rec['resist1']:02X}"])
+        self.resist1b.set(inv_RESIST_AMOUNTS[f"{rec['resist1_amount']:02X}"])
+        self.resist2a.set(inv_RESIST[f"{rec['resist2']:02X}"])
+        self.resist2b.set(inv_RESIST_AMOUNTS[f"{rec['resist2_amount']:02X}"])
+
+    # Collect the Tk variables as record fields; blank skills are 255 for party, 0 for enemies.
+    def record_values(self):
+        blank = 255 if self.char_type == 0 else 0
+        return {
+            'aspect': self.aspect.get(),
+            'skills': [blank if s.get() == '' else int_cast(s.get()) for s in self.skills],
+            'attributes': [int_cast(a.get()) for a in self.atts],
+            'level': int_cast(self.level.get()),
+            'weapons': [self.item_code('(weapon) ', w.get()) for w in self.weapons],
+            'spells': [self.inv_spell_dic[s.get()] for s in self.spells],
+            'school': int(SCHOOL[self.schools.get()], 16),
+            'spell_levels': [int_cast(s.get()) for s in self.spell_levels],
+            'armor': self.item_code('(armor) ', self.armor.get()),
+            'protection': int_cast(self.protection.get()),
+            'shield': self.item_code('(shield) ', self.shield.get()),
+            'shield_skill': blank if self.shield_skill.get() == '' else int_cast(self.shield_skill.get()),
+            'resist1': int(RESIST[self.resist1a.get()], 16),
+            'resist1_amount': int(RESIST_AMOUNTS[self.resist1b.get()], 16),
+            'resist2': int(RESIST[self.resist2a.get()], 16),
+            'resist2_amount': int(RESIST_AMOUNTS[self.resist2b.get()], 16),
+        }
+
+    # Menu label for an item code: the item name minus its type prefix, or 'NONE'.
+    def item_label(self, code, prefix_length):
+        name = self.major_dic[code]
+        return name if code == '0000' else name[prefix_length:]
+
+    # Item code for a menu label; 'NONE' is the only label stored without a prefix.
+    def item_code(self, prefix, label):
+        return self.inv_major_dic[label if label == 'NONE' else prefix + label]
 
     # Serialize Tk values back to bytes and write to ROM; clamps/normalizes empty cases.
     def write(self):
+        self.guards.check()
         try:
             idx = self.default_name_menu.current()
             if idx < 0 or idx >= len(self.character_addresses):
                 return
-            with open(self.filename, 'rb+') as f:
-                address = self.character_addresses[idx]
-                new_name = bytearray(self.name.get(), 'utf-8')
-                if len(new_name) < self.name_length:
-                    while len(new_name) < self.name_length:
-                        new_name.append(0x00)
-                f.seek(address)
-                f.write(new_name)
-
-                f.seek(address + self.data_seek)
-                d = f.read(self.data_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-
-                towrite = [self.aspect.get(), (d[2] + d[3]),
-                           (d[4] + d[5])]
-
-                for i in self.skills:
-                    j = i.get()
-                    if j == '':
-                        if self.char_type == 0:
-                            j = 255
-                        elif self.char_type == 1:
-                            j = 0
-                    towrite.append(j)
-
-                for i in self.atts:
-                    j = i.get()
-                    towrite.append(j)
-
-                towrite.append(d[64] + d[65])
-                towrite.append(self.level.get())
-                towrite.append(d[68] + d[69])
-
-                for i in self.weapons:
-                    w = i.get()
-                    if w == 'NONE':
-                        towrite.append(int((self.inv_major_dic[w])[:2], 16))
-                        towrite.append(int((self.inv_major_dic[w])[2:], 16))
-                    else:
-
-                        towrite.append(int((self.inv_major_dic['(weapon) ' + w])[:2], 16))
-                        towrite.append(int((self.inv_major_dic['(weapon) ' + w])[2:], 16))
-
-                towrite.append(d[82] + d[83])
-                towrite.append(d[84] + d[85])
-
-                for i in self.spells:
-                    towrite.append(int(self.inv_spell_dic[i.get()][:2], 16))
-                    towrite.append(int(self.inv_spell_dic[i.get()][2:], 16))
-
-                towrite.append(SCHOOL[self.schools.get()])
-
-                for i in self.spell_levels:
-                    towrite.append(i.get())
-
-                for i in range(118, 136, 2):
-                    towrite.append(d[i] + d[i + 1])
+            address = self.character_addresses[idx]
+            new_name = bytearray(self.name.get(), 'utf-8')
+            if len(new_name) < self.name_length:
+                while len(new_name) < self.name_length:
+                    new_name.append(0x00)
 
-                a = self.armor.get()
-                if a == 'NONE':
-                    towrite.append(int((self.inv_major_dic[a])[:2], 16))
-                    towrite.append(int((self.inv_major_dic[a])[2:], 16))
-                else:
-                    towrite.append(int((self.inv_major_dic['(armor) ' + a])[:2], 16))
-                    towrite.append(int((self.inv_major_dic['(armor) ' + a])[2:], 16))
+            # unknown bytes are carried over from the current record
+            current = self.rom.read(address + self.data_seek, self.data_read)
+            data = self.codec.encode(self.record_values(), current)
 
-                towrite.append(self.protection.get())
+            self.rom.stage(address, new_name)
+            self.rom.stage(address + self.data_seek, data)
+            self.rom.commit()
 
-                s = self.shield.get()
-                if s == 'NONE':
-                    towrite.append(int((self.inv_major_dic[s])[:2], 16))
-                    towrite.append(int((self.inv_major_dic[s])[2:], 16))
-                else:
-                    towrite.append(int((self.inv_major_dic['(shield) ' + s])[:2], 16))
-                    towrite.append(int((self.inv_major_dic['(shield) ' + s])[2:], 16))
-
-                shi = self.shield_skill.get()
-                if shi == '':
-                    if self.char_type == 0:
-                        shi = 255
-                    elif self.char_type == 1:
-                        shi = 0
-                towrite.append(shi)
-
-                towrite.append(int(RESIST[self.resist1a.get()], 16))
-                towrite.append(int(RESIST_AMOUNTS[self.resist1b.get()], 16))
-                towrite.append(int(RESIST[self.resist2a.get()], 16))
-                towrite.append(int(RESIST_AMOUNTS[self.resist2b.get()], 16))
-
-                f.seek(address + self.data_seek)
-                for item in towrite:
-                    item = int_cast(item)
-                    f.write(item.to_bytes(1, byteorder='big'))  # write one unsigned byte)
-
-                self.reset_character_list()
-                self.character.set(self.character_list[self.character_list.index(self.name.get().rstrip('\x00'))])
+            self.character.set(self.character_list[self.character_list.index(self.name.get().rstrip('\x00'))])
             self.set_defaults()
 
             flash_saved(self.save, "Saved")
@@ -329,9 +271,8 @@ class Characters:
 
         self.default_name_menu = Combobox(self.not_loot_frame, width=17,
                                           state='readonly',
-                                          textvariable=self.character,
-                                          values=self.character_list,
-                                          postcommand=self.reset_character_list)
+                                          textvariable=self.character)
+        self.names.subscribe(self.default_name_menu)
         self.default_name_menu.grid(column=0, row=0)
         if self.character_list:
             self.default_name_menu.current(0)
@@ -403,17 +344,14 @@ class Characters:
         self.shield_label.grid(column=0, row=23)
         self.shield_num.grid(column=1, row=23)
 
-    # Refresh character dropdown by re-reading names from ROM.
-    def reset_character_list(self):
-        prev = self.default_name_menu.current()
-        self.character_list[:] = []
-        self.character_addresses[:] = []
-        self.character_list, self.character_addresses = get_major_name_lists(self.filename, self.addresses,
-                                                                             self.name_length)
-        self.default_name_menu['values'] = self.character_list
-        if 0 <= prev < len(self.character_list):
-            self.default_name_menu.current(prev)
-            self.character.set(self.character_list[prev])
+    # Re-read the item/spell names and the shown record, e.g. when a hidden window is reopened after other saves.
+    def refresh(self):
+        major_dic = get_major_item_dic(self.filename)
+        spell_dic = get_minor_dic(self.filename, SPELL_DIC, 22)
+        refill_lookups((self.major_dic, major_dic), (self.inv_major_dic, {v: k for k, v in major_dic.items()}),
+                       *zip((self.armor_lst, self.shield_lst, self.weapon_lst), get_equipment_lists(self.filename)),
+                       (self.spell_dic, spell_dic), (self.inv_spell_dic, {v: k for k, v in spell_dic.items()}))
+        self.set_defaults()
 
 # base editor: follows item.py style
 # short comments aligned with logic
@@ -467,52 +405,53 @@ class EnemyEdit(Characters):
         self.drop_data_read = 34
         self.loot_name_length = 19
 
-        self.loot_name_list, self.loot_code_list, self.loot_address_list = \
-            get_major_loot_lists(self.filename, DROP_CAT, self.loot_name_length)
+        self.loot_names = name_list(self.filename, DROP_CAT, self.loot_name_length)
+        self.loot_name_list = self.loot_names.names
+        self.loot_code_list = self.loot_names.codes
+        self.loot_address_list = self.loot_names.addresses
 
         # variables
         self.exp = StringVar()
         self.exp.set(0)
-        self.exp.trace('w', partial(limit, self.exp, 255))
-        self.exp.trace('w', self.update_exp)
+        self.guards.limit(self.exp, 255)
         self.enemy_drop_cat = StringVar()
         self.drop_cat = StringVar()
         self.drop_cat.trace('w', self.set_drop_defaults)
         self.loot_name = StringVar()
-        self.loot_name.trace('w', partial(limit_name_size, self.loot_name, self.loot_name_length))
+        self.guards.name(self.loot_name, self.loot_name_length)
         self.gold_min = StringVar()
-        self.gold_min.trace('w', partial(limit, self.gold_min, 65535))
+        self.guards.limit(self.gold_min, 65535)
         self.gold_max = StringVar()
-        self.gold_max.trace('w', partial(limit, self.gold_max, 65535))
+        self.guards.limit(self.gold_max, 65535)
         self.armor_chance = StringVar()
-        self.armor_chance.trace('w', partial(limit, self.armor_chance, 100))
+        self.guards.limit(self.armor_chance, 100)
         self.shield_chance = StringVar()
-        self.shield_chance.trace('w', partial(limit, self.shield_chance, 100))
+        self.guards.limit(self.shield_chance, 100)
         self.weap1_chance = StringVar()
-        self.weap1_chance.trace('w', partial(limit, self.weap1_chance, 100))
+        self.guards.limit(self.weap1_chance, 100)
         self.weap2_chance = StringVar()
-        self.weap2_chance.trace('w', partial(limit, self.weap2_chance, 100))
+        self.guards.limit(self.weap2_chance, 100)
         self.weap3_chance = StringVar()
-        self.weap3_chance.trace('w', partial(limit, self.weap3_chance, 100))
+        self.guards.limit(self.weap3_chance, 100)
         self.reagent_chance = StringVar()
-        self.reagent_chance.trace('w', partial(limit, self.reagent_chance, 100))
+        self.guards.limit(self.reagent_chance, 100)
         self.reagent_min = StringVar()
-        self.reagent_min.trace('w', partial(limit, self.reagent_min, 99))
+        self.guards.limit(self.reagent_min, 99)
         self.reagent_max = StringVar()
-        self.reagent_max.trace('w', partial(limit, self.reagent_max, 99))
+        self.guards.limit(self.reagent_max, 99)
 
         self.item, self.item_chance, self.item_min, self.item_max = ([] for _ in range(4))
         for _ in range(2):
             i = StringVar()
             self.item.append(i)
             c = StringVar()
-            c.trace('w', partial(limit, c, 100))
+            self.guards.limit(c, 100)
             self.item_chance.append(c)
             mi = StringVar()
-            mi.trace('w', partial(limit, mi, 99))
+            self.guards.limit(mi, 99)
             self.item_min.append(mi)
             mx = StringVar()
-            mx.trace('w', partial(limit, mx, 99))
+            self.guards.limit(mx, 99)
             self.item_max.append(mx)
 
         self.other_items, self.other_items_chance = ([] for _ in range(2))
@@ -520,7 +459,7 @@ class EnemyEdit(Characters):
             i = StringVar()
             self.other_items.append(i)
             c = StringVar()
-            c.trace('w', partial(limit, c, 100))
+            self.guards.limit(c, 100)
             self.other_items_chance.append(c)
 
         # build items
@@ -533,245 +472,105 @@ class EnemyEdit(Characters):
         self.build()
         self.character.set(self.character_list[0])
 
+    # Show 75 x EXP; bound to the entry's keystrokes and called once per loaded record.
     def update_exp(self, *args):
-        if self.exp.get() == '':
+        # runs before the field is validated
+        exp = clamp_digits(self.exp.get(), 255)
+        if exp == '':
             self.exp_total.configure(text=' = ')
         else:
-            xp = 75 * int(self.exp.get())
-            if xp > 19125:
-                xp = 19125
-            self.exp_total.configure(text=' = ' + str(xp))
-
-    def reset_loot_list(self):
-        self.loot_name_list[:] = []
-        self.loot_code_list[:] = []
-        self.loot_address_list[:] = []
-        self.loot_name_list, self.loot_code_list, self.loot_address_list = \
-            get_major_loot_lists(self.filename, DROP_CAT, self.loot_name_length)
-        self.drop_box['values'] = self.loot_name_list
-        self.enemy_drop_cat_box['values'] = self.loot_name_list
-
-    # Load current character bytes and populate all bound Tk variables.
-    def set_defaults(self, *args):
-        super().set_defaults()
-        with open(self.filename, 'rb') as f:
-            address = self.character_addresses[self.default_name_menu.current()] + 134
-            f.seek(address)
-            d = f.read(2).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-            # StringVar
-            self.exp.set(str(int(d[0:2], 16)))
-            # StringVar
-            self.drop_cat.set(self.loot_name_list[self.loot_code_list.index(d[2:4].upper())])
-            self.enemy_drop_cat.set(self.drop_cat.get())
-
-    # Serialize Tk values back to bytes and write to ROM; clamps/normalizes empty cases.
-    def write(self):
-        try:
-            with open(self.filename, 'rb+') as f:
-                address = self.character_addresses[self.default_name_menu.current()]
-                new_name = bytearray(self.name.get(), 'utf-8')
-                if len(new_name) < self.name_length:
-                    while len(new_name) < self.name_length:
-                        new_name.append(0x00)
-                f.seek(address)
-                f.write(new_name)
-
-                f.seek(address + self.data_seek)
-                d = f.read(self.data_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-
-                towrite = [self.aspect.get(), (d[2] + d[3]), (d[4] + d[5])]
-
-                for i in self.skills:
-                    j = i.get()
-                    if j == '':
-                        j = 255 if self.char_type == 0 else 0
-                    towrite.append(j)
-
-                for i in self.atts:
-                    towrite.append(i.get())
-
-                towrite.append(d[64] + d[65])
-                towrite.append(self.level.get())
-                towrite.append(d[68] + d[69])
-
-                for i in self.weapons:
-                    w = i.get()
-                    if w == 'NONE':
-                        towrite.append(int((self.inv_major_dic[w])[:2], 16))
-                        towrite.append(int((self.inv_major_dic[w])[2:], 16))
-                    else:
-                        towrite.append(int((self.inv_major_dic['(weapon) ' + w])[:2], 16))
-                        towrite.append(int((self.inv_major_dic['(weapon) ' + w])[2:], 16))
-
-                towrite.append(d[82] + d[83])
-                towrite.append(d[84] + d[85])
-
-                for i in self.spells:
-                    towrite.append(int(self.inv_spell_dic[i.get()][:2], 16))
-                    towrite.append(int(self.inv_spell_dic[i.get()][2:], 16))
-
-                towrite.append(SCHOOL[self.schools.get()])
-
-                for i in self.spell_levels:
-                    towrite.append(i.get())
-
-                for i in range(118, 136, 2):
-                    towrite.append(d[i] + d[i + 1])
-
-                a = self.armor.get()
-                if a == 'NONE':
-                    towrite.append(int((self.inv_major_dic[a])[:2], 16))
-                    towrite.append(int((self.inv_major_dic[a])[2:], 16))
-                else:
-                    towrite.append(int((self.inv_major_dic['(armor) ' + a])[:2], 16))
-                    towrite.append(int((self.inv_major_dic['(armor) ' + a])[2:], 16))
-
-                towrite.append(self.protection.get())
-
-                s = self.shield.get()
-                if s == 'NONE':
-                    towrite.append(int((self.inv_major_dic[s])[:2], 16))
-                    towrite.append(int((self.inv_major_dic[s])[2:], 16))
-                else:
-                    towrite.append(int((self.inv_major_dic['(shield) ' + s])[:2], 16))
-                    towrite.append(int((self.inv_major_dic['(shield) ' + s])[2:], 16))
-
-                shi = self.shield_skill.get()
-                if shi == '':
-                    shi = 255 if self.char_type == 0 else 0
-                towrite.append(shi)
-
-                towrite.append(int(RESIST[self.resist1a.get()], 16))
-                towrite.append(int(RESIST_AMOUNTS[self.resist1b.get()], 16))
-                towrite.append(int(RESIST[self.resist2a.get()], 16))
-                towrite.append(int(RESIST_AMOUNTS[self.resist2b.get()], 16))
-
-                for i in range(156, 179, 2):
-                    towrite.append(d[i] + d[i + 1])
-                towrite.append(self.exp.get())
-                towrite.append(int(self.loot_code_list[self.loot_name_list.index(self.enemy_drop_cat.get())], 16))
-
-                f.seek(address + self.data_seek)
-                for item in towrite:
-                    item = int_cast(item)
-                    f.write(item.to_bytes(1, byteorder='big'))  # write one unsigned byte)
-
-                self.reset_character_list()
-                self.character.set(self.character_list[self.character_list.index(self.name.get().rstrip('\x00'))])
-
-            self.set_defaults()
-            flash_saved(self.save, "Saved")
-        except (FileNotFoundError, PermissionError, OSError,
-                KeyError, ValueError, UnicodeEncodeError) as e:
-            flash_saved(self.save, "Save Failed")
+            self.exp_total.configure(text=' = ' + str(75 * int(exp)))
+
+    # Enemy records add experience and a drop category after the shared character fields.
+    def load_record(self, rec):
+        super().load_record(rec)
+        self.exp.set(str(rec['exp']))
+        self.update_exp()
+        self.drop_cat.set(self.loot_name_list[self.loot_code_list.index(f"{rec['loot']:02X}")])
+        self.enemy_drop_cat.set(self.drop_cat.get())
+
+    # Shared character fields plus experience and drop category.
+    def record_values(self):
+        values = super().record_values()
+        values['exp'] = int_cast(self.exp.get())
+        values['loot'] = int(self.loot_code_list[self.loot_name_list.index(self.enemy_drop_cat.get())], 16)
+        return values
+
+    # Loot record fields edited through a single StringVar each.
+    def loot_vars(self):
+        return {
+            'gold_min': self.gold_min,
+            'gold_max': self.gold_max,
+            'armor_chance': self.armor_chance,
+            'shield_chance': self.shield_chance,
+            'weapon1_chance': self.weap1_chance,
+            'weapon2_chance': self.weap2_chance,
+            'weapon3_chance': self.weap3_chance,
+            'reagent_chance': self.reagent_chance,
+            'reagent_min': self.reagent_min,
+            'reagent_max': self.reagent_max,
+        }
 
     def set_drop_defaults(self, *args):
-        with open(self.filename, 'rb') as f:
-            address = self.loot_address_list[self.drop_box.current()]
-
-            f.seek(address)
-            self.loot_name.set(f.read(self.loot_name_length).decode("utf-8"))
-
-            f.seek(address + 22)
-            d = f.read(self.drop_data_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-
-            # StringVars - cast to str
-            self.gold_min.set(str(int(d[2:4] + d[0:2], 16)))
-            self.gold_max.set(str(int(d[6:8] + d[4:6], 16)))
-            self.armor_chance.set(str(int(d[8:10], 16)))
-            self.shield_chance.set(str(int(d[10:12], 16)))
-            self.weap1_chance.set(str(int(d[12:14], 16)))
-            self.weap2_chance.set(str(int(d[14:16], 16)))
-            self.weap3_chance.set(str(int(d[16:18], 16)))
-            self.reagent_chance.set(str(int(d[18:20], 16)))
-            self.reagent_min.set(str(int(d[20:22], 16)))
-            self.reagent_max.set(str(int(d[22:24], 16)))
-
-            # items 1–2 using enumerate, no .index()
-            for idx, (i_var, c_var, mi_var, mx_var) in enumerate(
-                    zip(self.item, self.item_chance, self.item_min, self.item_max)):
-                base = 24 + idx * 10
-                code = d[base:base + 4].upper()
-                if code == '0B10':
-                    code = '0000'
-                i_var.set(self.major_dic[code])
-                c_var.set(str(int(d[base + 4:base + 6], 16)))
-                mi_var.set(str(int(d[base + 6:base + 8], 16)))
-                mx_var.set(str(int(d[base + 8:base + 10], 16)))
-
-            # other items 3–6 using enumerate
-            for idx, (i_var, c_var) in enumerate(zip(self.other_items, self.other_items_chance)):
-                base = 44 + idx * 6
-                code = d[base:base + 4].upper()
-                i_var.set(self.major_dic[code])
-                c_var.set(str(int(d[base + 4:base + 6], 16)))
+        address = self.loot_address_list[self.drop_box.current()]
+        self.loot_name.set(self.rom.text(address, self.loot_name_length))
+
+        rec = LOOT_CODEC.decode(self.rom.read(address + 22, self.drop_data_read))
+
+        # StringVars - cast to str
+        for field, var in self.loot_vars().items():
+            var.set(str(rec[field]))
+
+        # items 1–2 carry a chance and a min/max count
+        for idx, (i_var, c_var, mi_var, mx_var) in enumerate(
+                zip(self.item, self.item_chance, self.item_min, self.item_max), 1):
+            code = rec[f'item{idx}']
+            if code == '0B10':
+                code = '0000'
+            i_var.set(self.major_dic[code])
+            c_var.set(str(rec[f'item{idx}_chance']))
+            mi_var.set(str(rec[f'item{idx}_min']))
+            mx_var.set(str(rec[f'item{idx}_max']))
+
+        # other items 3–6 only carry a chance
+        for idx, (i_var, c_var) in enumerate(zip(self.other_items, self.other_items_chance), 3):
+            i_var.set(self.major_dic[rec[f'item{idx}']])
+            c_var.set(str(rec[f'item{idx}_chance']))
 
     def write_drop(self):
+        self.guards.check()
         try:
-            with open(self.filename, 'rb+') as f:
-                address = self.loot_address_list[self.drop_box.current()]
-
-                new_loot_name = bytearray(self.loot_name.get(), 'utf-8')
-                if len(new_loot_name) < self.loot_name_length:
-                    while len(new_loot_name) < self.loot_name_length:
-                        new_loot_name.append(0x00)
-                f.seek(address)
-                f.write(new_loot_name)
-
-                new_value = self.gold_min.get()
-                min_v2, min_v1 = divmod(int(new_value), 256)  # split value → (high, low) bytes for little-endian storage
-                if min_v2 == 256:
-                    min_v2 = 255
-                    min_v1 = 255
-
-                new_value = self.gold_max.get()
-                max_v2, max_v1 = divmod(int(new_value), 256)  # split value → (high, low) bytes for little-endian storage
-                if max_v2 == 256:
-                    max_v2 = 255
-                    max_v1 = 255
-
-                towrite = [
-                    min_v1, min_v2,
-                    max_v1, max_v2,
-                    self.armor_chance.get(),
-                    self.shield_chance.get(),
-                    self.weap1_chance.get(),
-                    self.weap2_chance.get(),
-                    self.weap3_chance.get(),
-                    self.reagent_chance.get(),
-                    self.reagent_min.get(),
-                    self.reagent_max.get()
-                ]
-
-                # items 1–2 with enumerate
-                for idx, i_var in enumerate(self.item):
-                    code = self.inv_major_dic[i_var.get()]
-                    towrite.append(int(code[:2], 16))
-                    towrite.append(int(code[2:], 16))
-                    towrite.append(self.item_chance[idx].get())
-                    towrite.append(self.item_min[idx].get())
-                    towrite.append(self.item_max[idx].get())
-
-                # other items 3–6 with enumerate
-                for idx, i_var in enumerate(self.other_items):
-                    code = self.inv_major_dic[i_var.get()]
-                    towrite.append(int(code[:2], 16))
-                    towrite.append(int(code[2:], 16))
-                    towrite.append(self.other_items_chance[idx].get())
-
-                f.seek(address + 22)
-                for t in towrite:
-                    t = int_cast(t)
-                    f.write(t.to_bytes(1, byteorder='big'))  # write one unsigned byte)
-
-                self.reset_loot_list()
-                if self.drop_cat.get() == self.enemy_drop_cat.get():
-                    self.drop_cat.set(
-                        self.loot_name_list[self.loot_name_list.index(self.loot_name.get().rstrip('\x00'))])
-                    self.enemy_drop_cat.set(self.drop_cat.get())
-                else:
-                    self.drop_cat.set(
-                        self.loot_name_list[self.loot_name_list.index(self.loot_name.get().rstrip('\x00'))])
+            address = self.loot_address_list[self.drop_box.current()]
+
+            new_loot_name = bytearray(self.loot_name.get(), 'utf-8')
+            if len(new_loot_name) < self.loot_name_length:
+                while len(new_loot_name) < self.loot_name_length:
+                    new_loot_name.append(0x00)
+
+            values = {field: int_cast(var.get()) for field, var in self.loot_vars().items()}
+            values['gold_min'] = min(values['gold_min'], 65535)
+            values['gold_max'] = min(values['gold_max'], 65535)
+
+            # items 1–6 in slot order; only the first two have a min/max count
+            for idx, (i_var, c_var) in enumerate(
+                    zip(self.item + self.other_items, self.item_chance + self.other_items_chance), 1):
+                values[f'item{idx}'] = self.inv_major_dic[i_var.get()]
+                values[f'item{idx}_chance'] = int_cast(c_var.get())
+            for idx, (mi_var, mx_var) in enumerate(zip(self.item_min, self.item_max), 1):
+                values[f'item{idx}_min'] = int_cast(mi_var.get())
+                values[f'item{idx}_max'] = int_cast(mx_var.get())
+
+            self.rom.stage(address, new_loot_name)
+            self.rom.stage(address + 22, LOOT_CODEC.encode(values))
+            self.rom.commit()
+
+            if self.drop_cat.get() == self.enemy_drop_cat.get():
+                self.drop_cat.set(
+                    self.loot_name_list[self.loot_name_list.index(self.loot_name.get().rstrip('\x00'))])
+                self.enemy_drop_cat.set(self.drop_cat.get())
+            else:
+                self.drop_cat.set(
+                    self.loot_name_list[self.loot_name_list.index(self.loot_name.get().rstrip('\x00'))])
 
             self.set_drop_defaults()
             flash_saved(self.save_loot, "Saved")
@@ -792,15 +591,16 @@ class EnemyEdit(Characters):
         exp_label.grid(column=0, row=0, sticky='e')
         exp_entry = Entry(exp_frame, textvariable=self.exp, width=4)
         exp_entry.grid(column=1, row=0, sticky='w')
+        exp_entry.bind('<KeyRelease>', self.update_exp)
+        exp_entry.bind('<FocusOut>', self.update_exp)
         self.exp_total = Label(exp_frame, text=(' = ' + str(75 * int(self.exp.get()))), width=9)
         self.exp_total.grid(column=2, row=0, sticky='w')
 
         enemy_drop_cat_label = LabelFrame(self.not_loot_frame, text='Current Enemy Loot Type')
         enemy_drop_cat_label.grid(column=0, row=7, columnspan=2)
         self.enemy_drop_cat_box = Combobox(enemy_drop_cat_label, state='readonly',
-                                           textvariable=self.enemy_drop_cat,
-                                           values=self.loot_name_list,
-                                           postcommand=self.reset_loot_list)
+                                           textvariable=self.enemy_drop_cat)
+        self.loot_names.subscribe(self.enemy_drop_cat_box)
         self.enemy_drop_cat_box.grid(column=0, row=0)
 
         drop_frame = LabelFrame(self.box, text='Loot Editing:', bd=4)
@@ -809,9 +609,8 @@ class EnemyEdit(Characters):
         drop_box_label = Label(drop_frame, text='Loot Category:')
         drop_box_label.grid(column=0, row=0, sticky='e')
         self.drop_box = Combobox(drop_frame, state='readonly', width=19,
-                                 textvariable=self.drop_cat,
-                                 values=self.loot_name_list,
-                                 postcommand=self.reset_loot_list)
+                                 textvariable=self.drop_cat)
+        self.loot_names.subscribe(self.drop_box)
         self.drop_box.grid(column=1, row=0, sticky='w')
 
         new_loot_name_frame = LabelFrame(drop_frame, text="Change Loot Name")
@@ -876,8 +675,7 @@ class EnemyEdit(Characters):
         for i in self.item:
             item_frame = LabelFrame(drop_stats, text=('Item ' + str(self.item.index(i) + 1)))
             item_frame.grid(column=0, row=(5 + self.item.index(i)), columnspan=3)
-            item_box = Combobox(item_frame, textvariable=i, values=list(self.major_dic.values()),
-                                width=28, state='readonly')
+            item_box = Picker(item_frame, self.major_dic.values(), textvariable=i, width=28)
             item_box.grid(column=0, row=0, columnspan=3)
             item_chance_label = Label(item_frame, text='Drop Chance')
             item_chance_label.grid(column=0, row=1, sticky='e')
@@ -893,8 +691,7 @@ class EnemyEdit(Characters):
         for i in self.other_items:
             other_item_frame = LabelFrame(drop_stats, text=('Item ' + str(self.other_items.index(i) + 3)))
             other_item_frame.grid(column=0, row=(7 + self.other_items.index(i)), columnspan=3)
-            other_item_box = Combobox(other_item_frame, textvariable=i, values=list(self.major_dic.values()),
-                                      width=28, state='readonly')
+            other_item_box = Picker(other_item_frame, self.major_dic.values(), textvariable=i, width=28)
             other_item_box.grid(column=0, row=0, columnspan=2)
             other_item_chance_label = Label(other_item_frame, text='Drop Chance')
             other_item_chance_label.grid(column=0, row=1, sticky='e')
@@ -910,6 +707,7 @@ class Item:
         # GUI setup
         self.win = Toplevel()
         self.win.resizable(False, False)
+        self.guards = FieldGuards(self.win)
 
         # ROM file metadata
         self.filename = f               # path to ROM
@@ -917,42 +715,44 @@ class Item:
         self.data_seek = s              # byte offset into item structure
         self.data_read = r              # how many bytes to read
         self.name_length = n            # max name length
+        self.rom = open_rom(self.filename)  # shared memory-mapped image
+        self.codec = None               # record layout, set by subclasses
+        self.stat_fields = []           # record fields behind the stat entries, set by subclasses
 
         # dictionaries/lists used for lookups
         self.spell_dic = get_minor_dic(self.filename, SPELL_DIC, 22)
         self.inv_spell_dic = {v: k for k, v in self.spell_dic.items()}
-        self.item_list, self.address_list = get_major_name_lists(
-            self.filename, self.item_addresses, self.name_length
-        )
+        self.names = name_list(self.filename, self.item_addresses, self.name_length)
+        self.item_list, self.address_list = self.names.names, self.names.addresses
 
         # tkinter variables bound to widgets
         self.item = StringVar()   # current item selected
         self.item.trace('w', self.set_defaults)
 
         self.name = StringVar()   # editable item name
-        self.name.trace('w', partial(limit_name_size, self.name, self.name_length))
+        self.guards.name(self.name, self.name_length)
 
         self.value = StringVar()  # base value
-        self.value.trace('w', partial(limit, self.value, 65535))
+        self.guards.limit(self.value, 65535)
 
         self.aspect = IntVar()    # solar/lunar/none aspect
         self.stats = [StringVar() for i in range(5)]  # up to 5 stats
 
         self.att = StringVar()           # attribute type
         self.att_amount = StringVar()    # attribute amount
-        self.att_amount.trace('w', partial(limit_127, self.att_amount))
+        self.guards.limit_127(self.att_amount)
 
         self.skill = StringVar()         # skill type
         self.skill_amount = StringVar()  # skill amount
-        self.skill_amount.trace('w', partial(limit_127, self.skill_amount))
+        self.guards.limit_127(self.skill_amount)
 
         self.spell = StringVar()         # primary spell
         self.spell_level = StringVar()
-        self.spell_level.trace('w', partial(limit, self.spell_level, 15))
+        self.guards.limit(self.spell_level, 15)
 
         self.magic = StringVar()         # secondary spell
         self.magic_level = StringVar()
-        self.magic_level.trace('w', partial(limit, self.magic_level, 15))
+        self.guards.limit(self.magic_level, 15)
 
         self.resist = StringVar()        # resist type
         self.resist_amount = StringVar() # resist amount
@@ -961,11 +761,8 @@ class Item:
         self.box = Frame(self.win)
 
         # dropdown for selecting an item
-        self.default_item_menu = Combobox(
-            self.box, postcommand=self.reset_list,
-            state='readonly', width=21,
-            textvariable=self.item, values=self.item_list
-        )
+        self.default_item_menu = Combobox(self.box, state='readonly', width=21, textvariable=self.item)
+        self.names.subscribe(self.default_item_menu)
 
         # rename item
         self.new_name_label = LabelFrame(self.box, text='New Name')
@@ -992,13 +789,11 @@ class Item:
         self.ski_att_amo_entry = Entry(self.ski_att_frame, textvariable=self.skill_amount, width=4)
 
         self.spell_frame = LabelFrame(self.box, text='Spell')
-        self.spell_menu = Combobox(self.spell_frame, width=16, state='readonly',
-                                   textvariable=self.spell, values=list(self.inv_spell_dic.keys()))
+        self.spell_menu = Picker(self.spell_frame, self.inv_spell_dic, textvariable=self.spell, width=16)
         self.spell_entry = Entry(self.spell_frame, textvariable=self.spell_level, width=4)
 
         self.magic_frame = LabelFrame(self.box, text='Magic')
-        self.magic_menu = Combobox(self.magic_frame, width=16, state='readonly',
-                                   textvariable=self.magic, values=list(self.inv_spell_dic.keys()))
+        self.magic_menu = Picker(self.magic_frame, self.inv_spell_dic, textvariable=self.magic, width=16)
         self.magic_entry = Entry(self.magic_frame, textvariable=self.magic_level, width=4)
 
         self.resist_frame = LabelFrame(self.box, text='Resist')
@@ -1019,15 +814,81 @@ class Item:
         self.value_entry = Entry(self.stat_frame, textvariable=self.value, width=6)
         self.value_label2 = Label(self.stat_frame, text='Max base value: 65535', font=(None, 8))
 
-    # Virtual: subclasses load the record and decode bytes here.
-    def set_defaults(self):
-        # must be overridden in subclass
-        pass
-
-    # Virtual: subclasses convert GUI back to bytes and write here.
+    # Load the selected record and decode it with the subclass codec.
+    def set_defaults(self, *args):
+        address = self.address_list[self.default_item_menu.current()]
+        self.name.set(self.rom.text(address, self.name_length))
+        self.load_record(self.codec.decode(self.rom.read(address + self.data_seek, self.data_read)))
+
+    # Push the fields every item record shares into the widgets; subclasses extend.
+    def load_record(self, rec):
+        for var, field in zip(self.stats, self.stat_fields):
+            var.set(rec[field])
+        self.value.set(rec['value'])
+        self.aspect.set(rec['aspect'])
+
+        self.att.set(inv_EQUIPMENT_STAT[f"{rec['attribute']:02X}"])
+        self.att_amount.set(rec['attribute_amount'])
+        self.skill.set(inv_SKILL_ATTRIBUTE[f"{rec['skill']:02X}"])
+        self.skill_amount.set(rec['skill_amount'])
+
+        self.spell.set(self.spell_dic[rec['spell']])
+        self.spell_level.set(rec['spell_level'])
+        self.magic.set(self.spell_dic[rec['magic']])
+        self.magic_level.set(rec['magic_level'])
+
+        self.resist.set(inv_RESIST[f"{rec['resist']:02X}"])
+        self.resist_amount.set(inv_RESIST_AMOUNTS[f"{rec['resist_amount']:02X}"])
+
+    # Collect the shared item fields; blanks count as 0 and the value caps at 65535.
+    def record_values(self):
+        values = {field: int_cast(var.get()) for var, field in zip(self.stats, self.stat_fields)}
+        values.update({
+            'value': min(int(self.value.get() or 0), 65535),
+            'aspect': self.aspect.get(),
+            'attribute': int(EQUIPMENT_STAT[self.att.get()], 16),
+            'attribute_amount': int(self.att_amount.get() or 0),
+            'skill': int(SKILL_ATTRIBUTE[self.skill.get()], 16),
+            'skill_amount': int(self.skill_amount.get() or 0),
+            'spell': self.inv_spell_dic[self.spell.get()],
+            'spell_level': int_cast(self.spell_level.get()),
+            'magic': self.inv_spell_dic[self.magic.get()],
+            'magic_level': int_cast(self.magic_level.get()),
+            'resist': int(RESIST[self.resist.get()], 16),
+            'resist_amount': int(RESIST_AMOUNTS[self.resist_amount.get()], 16),
+        })
+        return values
+
+    # Encode the widgets over the current record (unknown bytes kept) and save.
     def write(self):
-        # must be overridden in subclass
-        pass
+        self.guards.check()
+        try:
+            address = self.address_list[self.default_item_menu.current()]
+
+            # write name
+            new_name = bytearray(self.name.get(), 'utf-8')
+            if len(new_name) < self.name_length:
+                while len(new_name) < self.name_length:
+                    new_name.append(0x00)
+
+            current = self.rom.read(address + self.data_seek, self.data_read)
+            data = self.codec.encode(self.record_values(), current)
+
+            # write to ROM
+            self.rom.stage(address, new_name)
+            self.rom.stage(address + self.data_seek, data)
+            self.rom.commit()
+
+            # reselect the (possibly renamed) item
+            self.item.set(self.item_list[self.item_list.index(self.name.get().rstrip('\x00'))])
+            self.set_defaults()
+            flash_saved(self.save, "Saved")
+        except (FileNotFoundError, PermissionError, OSError,
+                KeyError, ValueError, UnicodeEncodeError) as err:
+            # save failed due to file/encoding/dict/number error
+            flash_saved(self.save, "Save Failed")
+            # optional console log for debugging
+            print(f"Save failed in {type(self).__name__}: {err}")
 
     # Grid the base item controls; shared across subclasses.
     def build(self):
@@ -1072,152 +933,30 @@ class Item:
         self.resist_menu.grid(column=0, row=0)
         self.resist_amount_menu.grid(column=1, row=0)
 
-    # Re-read item names/addresses; keep dropdown fresh after rename.
-    def reset_list(self):
-        # refresh item list from file
-        self.item_list[:] = []
-        self.address_list[:] = []
-        self.item_list, self.address_list = get_major_name_lists(
-            self.filename, self.item_addresses, self.name_length
-        )
-        self.default_item_menu['values'] = self.item_list
+    # Re-read the spell names and the shown record, e.g. when a hidden window is reopened after other saves.
+    def refresh(self):
+        spell_dic = get_minor_dic(self.filename, SPELL_DIC, 22)
+        refill_lookups((self.spell_dic, spell_dic), (self.inv_spell_dic, {v: k for k, v in spell_dic.items()}))
+        self.set_defaults()
+
 class AccessoryEdit(Item):
     # Build common item widgets (name, value, stats, aspects, resistances, spells).
     def __init__(self, f, a, s, r, n):
         super().__init__(f, a, s, r, n)
         self.win.title("Accessory Edit")
+        self.codec = ACCESSORY_CODEC
+        self.stat_fields = ['damage', 'protection', 'str_required', 'int_required']
 
         # label and validation for each stat
         stat_var = ['Damage', 'Protection', 'Strength Required', 'Intelligence Required']
         for s in stat_var:
-            self.stats[stat_var.index(s)].trace('w', partial(limit_127, self.stats[stat_var.index(s)]))
+            self.guards.limit_127(self.stats[stat_var.index(s)])
             self.stat_label[stat_var.index(s)]['text'] = s
 
         # run
         self.build()
         self.item.set(self.item_list[0])
 
-    # Virtual: subclasses load the record and decode bytes here.
-    def set_defaults(self, *args):
-        # load selected accessory from ROM
-        with open(self.filename, 'rb') as f:
-            address = self.address_list[self.default_item_menu.current()]
-            f.seek(address)
-            self.name.set(f.read(self.name_length).decode("utf-8"))
-
-            f.seek(address + self.data_seek)
-            d = f.read(self.data_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-
-            # stats
-            self.stats[0].set(int(d[0] + d[1], 16))
-            self.stats[1].set(int(d[2] + d[3], 16))
-            self.stats[2].set(int(d[4] + d[5], 16))
-            self.stats[3].set(int(d[6] + d[7], 16))
-
-            # value and aspect
-            self.value.set((int(d[10] + d[11], 16) * 256) + int(d[8] + d[9], 16))
-            self.aspect.set(d[13])
-
-            # attribute and bonus
-            self.att.set(inv_EQUIPMENT_STAT[(d[14] + d[15]).upper()])
-            at = int(d[16] + d[17], 16)
-            if at > 127:
-                at = at - 256
-            self.att_amount.set(at)
-
-            # skill and bonus
-            self.skill.set(inv_SKILL_ATTRIBUTE[(d[18] + d[19]).upper()])
-            aa = int(d[20] + d[21], 16)
-            if aa > 127:
-                aa = aa - 256
-            self.skill_amount.set(aa)
-
-            # spell data
-            self.spell.set(self.spell_dic[(d[22:26]).upper()])
-            self.spell_level.set(int(d[26] + d[27], 16))
-
-            # magic data
-            self.magic.set(self.spell_dic[(d[30:34]).upper()])
-            self.magic_level.set(int(d[34] + d[35], 16))
-
-            # resistances
-            self.resist.set(inv_RESIST[(d[36] + d[37]).upper()])
-            self.resist_amount.set(inv_RESIST_AMOUNTS[(d[38] + d[39]).upper()])
-
-    # Virtual: subclasses convert GUI back to bytes and write here.
-    def write(self):
-        # save edits back into ROM
-        try:
-            with open(self.filename, 'rb+') as f:
-                address = self.address_list[self.default_item_menu.current()]
-
-                # write name
-                new_name = bytearray(self.name.get(), 'utf-8')
-                if len(new_name) < self.name_length:
-                    while len(new_name) < self.name_length:
-                        new_name.append(0x00)
-                f.seek(address)
-                f.write(new_name)
-
-                # read existing data for preserved fields
-                f.seek(address + self.data_seek)
-                d = f.read(self.data_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-
-                # value
-                new_value = self.value.get() or '0'
-                v2, v1 = divmod(int(new_value), 256)  # split value → (high, low) bytes for little-endian storage
-                if v2 == 256:
-                    v2 = 255
-                    v1 = 255
-
-                # attribute amount
-                st = int(self.att_amount.get() or 0)
-                if st < 0:
-                    st = st + 256
-
-                # skill amount
-                sk = int(self.skill_amount.get() or 0)
-                if sk < 0:
-                    sk = sk + 256
-
-                # pack new data
-                towrite = [
-                    self.stats[0].get(),
-                    self.stats[1].get(),
-                    self.stats[2].get(),
-                    self.stats[3].get(),
-                    v1, v2,
-                    self.aspect.get(),
-                    int(EQUIPMENT_STAT[self.att.get()], 16),
-                    st,
-                    int(SKILL_ATTRIBUTE[self.skill.get()], 16),
-                    sk,
-                    int(self.inv_spell_dic[self.spell.get()][:2], 16),
-                    int(self.inv_spell_dic[self.spell.get()][2:], 16),
-                    self.spell_level.get(),
-                    (d[28] + d[29]),
-                    int(self.inv_spell_dic[self.magic.get()][:2], 16),
-                    int(self.inv_spell_dic[self.magic.get()][2:], 16),
-                    self.magic_level.get(),
-                    int(RESIST[self.resist.get()], 16),
-                    int(RESIST_AMOUNTS[self.resist_amount.get()], 16)
-                ]
-
-                # write to ROM
-                f.seek(address + self.data_seek)
-                for item in towrite:
-                    item = int_cast(item)
-                    f.write(item.to_bytes(1, byteorder='big'))  # write one unsigned byte)
-
-                # refresh UI
-                self.reset_list()
-                self.item.set(self.item_list[self.item_list.index(self.name.get().rstrip('\x00'))])
-            self.set_defaults()
-            flash_saved(self.save, "Saved")
-        except (FileNotFoundError, PermissionError, OSError,
-                KeyError, ValueError, UnicodeEncodeError):
-            # save failed due to file/encoding/dict/number error
-            flash_saved(self.save, "Save Failed")
 class ArmorShield(Item):
     # Build common item widgets (name, value, stats, aspects, resistances, spells).
     def __init__(self, f, a, s, r, n, win_type):
@@ -1227,171 +966,32 @@ class ArmorShield(Item):
             self.win.title("Armor Edit")
         elif win_type == 6:
             self.win.title("Shield Edit")
+        self.codec = ARMOR_CODEC
+        self.stat_fields = ['defense', 'protection', 'dexterity', 'stealth']
 
         # label and validation for each stat
         stat_var = ['Defense', 'Protection', 'Dexterity', 'Stealth']
         for s in stat_var:
-            self.stats[stat_var.index(s)].trace('w', partial(limit_127, self.stats[stat_var.index(s)]))
+            self.guards.limit_127(self.stats[stat_var.index(s)])
             self.stat_label[stat_var.index(s)]['text'] = s
 
         # run
         self.build()
         self.item.set(self.item_list[0])
 
-    # Virtual: subclasses load the record and decode bytes here.
-    def set_defaults(self, *args):
-        # load selected armor/shield from ROM
-        with open(self.filename, 'rb') as f:
-            address = self.address_list[self.default_item_menu.current()]
-            f.seek(address)
-            self.name.set(f.read(self.name_length).decode("utf-8"))
-
-            f.seek(address + self.data_seek)
-            d = f.read(self.data_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-
-            # stats
-            self.stats[0].set(int(d[0] + d[1], 16))
-            self.stats[1].set(int(d[2] + d[3], 16))
-
-            dx = int(d[4] + d[5], 16)
-            if dx > 127:
-                dx -= 256
-            self.stats[2].set(dx)
-
-            sneak = int(d[8] + d[9], 16)
-            if sneak > 127:
-                sneak -= 256
-            self.stats[3].set(sneak)
-
-            # value and aspect
-            self.value.set((int(d[12] + d[13], 16) * 256) + int(d[10] + d[11], 16))
-            self.aspect.set(d[17])
-
-            # attribute and bonus
-            self.att.set(inv_EQUIPMENT_STAT[(d[18] + d[19]).upper()])
-            at = int(d[20] + d[21], 16)
-            if at > 127:
-                at -= 256
-            self.att_amount.set(at)
-
-            # skill and bonus
-            self.skill.set(inv_SKILL_ATTRIBUTE[(d[22] + d[23]).upper()])
-            aa = int(d[24] + d[25], 16)
-            if aa > 127:
-                aa -= 256
-            self.skill_amount.set(aa)
-
-            # spells
-            self.spell.set(self.spell_dic[(d[26:30]).upper()])
-            self.spell_level.set(int(d[30] + d[31], 16))
-
-            self.magic.set(self.spell_dic[(d[34:38]).upper()])
-            self.magic_level.set(int(d[38] + d[39], 16))
-
-            # resistances
-            self.resist.set(inv_RESIST[(d[40] + d[41]).upper()])
-            self.resist_amount.set(inv_RESIST_AMOUNTS[(d[42] + d[43]).upper()])
-
-    # Virtual: subclasses convert GUI back to bytes and write here.
-    def write(self):
-        # save edits back into ROM
-        try:
-            with open(self.filename, 'rb+') as f:
-                address = self.address_list[self.item_list.index(self.default_item_menu.get())]
-
-                # write name
-                new_name = bytearray(self.name.get(), 'utf-8')
-                if len(new_name) < self.name_length:
-                    while len(new_name) < self.name_length:
-                        new_name.append(0x00)
-                f.seek(address)
-                f.write(new_name)
-
-                # read existing data for preserved fields
-                f.seek(address + self.data_seek)
-                d = f.read(self.data_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-
-                # value
-                new_value_raw = self.value.get()
-                new_value = int(new_value_raw) if new_value_raw != '' else 0
-                v2, v1 = divmod(new_value, 256)
-                if v2 == 256:
-                    v2 = 255
-                    v1 = 255
-
-                # signed fields to unsigned byte
-                dx = int(self.stats[2].get() or 0)
-                if dx < 0:
-                    dx += 256
-
-                sneak = int(self.stats[3].get() or 0)
-                if sneak < 0:
-                    sneak += 256
-
-                st = int(self.att_amount.get() or 0)
-                if st < 0:
-                    st += 256
-
-                sk = int(self.skill_amount.get() or 0)
-                if sk < 0:
-                    sk += 256
-
-                # pack new data
-                towrite = [
-                    self.stats[0].get(),
-                    self.stats[1].get(),
-                    dx,
-                    (d[6] + d[7]),
-                    sneak,
-                    v1, v2,
-                    (d[14] + d[15]),
-                    self.aspect.get(),
-                    int(EQUIPMENT_STAT[self.att.get()], 16),
-                    st,
-                    int(SKILL_ATTRIBUTE[self.skill.get()], 16),
-                    sk,
-                    int(self.inv_spell_dic[self.spell.get()][:2], 16),
-                    int(self.inv_spell_dic[self.spell.get()][2:], 16),
-                    self.spell_level.get(),
-                    (d[32] + d[33]),
-                    int(self.inv_spell_dic[self.magic.get()][:2], 16),
-                    int(self.inv_spell_dic[self.magic.get()][2:], 16),
-                    self.magic_level.get(),
-                    int(RESIST[self.resist.get()], 16),
-                    int(RESIST_AMOUNTS[self.resist_amount.get()], 16)
-                ]
-
-                # write to ROM
-                f.seek(address + self.data_seek)
-                for item in towrite:
-                    item = int_cast(item)
-                    f.write(item.to_bytes(1, byteorder='big'))  # write one unsigned byte)
-
-                # refresh UI
-                self.reset_list()
-                self.item.set(self.item_list[self.item_list.index(self.name.get().rstrip('\x00'))])
-
-            # reload UI and show success
-            self.set_defaults()
-            flash_saved(self.save, "Saved")
-
-        except (FileNotFoundError, PermissionError, OSError,
-                KeyError, ValueError, UnicodeEncodeError) as err:
-            # save failed due to file/encoding/dict/number error
-            flash_saved(self.save, "Save Failed")
-            # optional console log for debugging
-            print(f"Save failed in ArmorShield: {err}")
 class WeaponEdit(Item):
     # Build common item widgets (name, value, stats, aspects, resistances, spells).
     def __init__(self, f, a, s, r, n):
         # base UI + state
         super().__init__(f, a, s, r, n)
         self.win.title('Weapon Edit')
+        self.codec = WEAPON_CODEC
+        self.stat_fields = ['str_required', 'hit', 'damage', 'range']
 
         # stat labels and limits
         stat_var = ['Strength Required', 'Hit', 'Damage', 'Range']
         for s in stat_var:
-            self.stats[stat_var.index(s)].trace('w', partial(limit, self.stats[stat_var.index(s)], 255))
+            self.guards.limit(self.stats[stat_var.index(s)], 255)
             self.stat_label[stat_var.index(s)]['text'] = s
 
         # weapon-specific fields
@@ -1403,148 +1003,20 @@ class WeaponEdit(Item):
         self.build()
         self.item.set(self.item_list[0])
 
-    # Virtual: subclasses load the record and decode bytes here.
-    def set_defaults(self, *args):
-        # populate UI from ROM for the selected weapon
-        with open(self.filename, 'rb') as f:
-            address = self.address_list[self.default_item_menu.current()]
-            f.seek(address)
-            self.name.set(f.read(self.name_length).decode("utf-8"))
-
-            f.seek(address + self.data_seek)
-            d = f.read(self.data_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-
-            # weapon type byte
-            self.weapon_type.set(inv_WEAPON_TYPE[d[1].upper()])
-
-            # core stats
-            self.stats[0].set(int(d[2] + d[3], 16))
-            self.stats[1].set(int(d[4] + d[5], 16))
-            self.stats[2].set(int(d[6] + d[7], 16))
-
-            # value is little-endian v1,v2
-            self.value.set((int(d[10] + d[11], 16) * 256) + int(d[8] + d[9], 16))
-
-            self.stats[3].set(int(d[14] + d[15], 16))
-
-            # animation nibble pair
-            # fix: ensure .upper() applies to the two-char token
-            self.animation.set(inv_WEAPON_ANIMATIONS[(d[16] + d[17]).upper()])
-
-            # damage type
-            self.damage_type.set(inv_RESIST[(d[20] + d[21]).upper()])
-
-            # aspect nibble
-            self.aspect.set(d[23])
-
-            # attribute bonus
-            self.att.set(inv_EQUIPMENT_STAT[(d[24] + d[25]).upper()])
-            at = int(d[26] + d[27], 16)
-            if at > 127:
-                at -= 256
-            self.att_amount.set(at)
-
-            # skill bonus
-            self.skill.set(inv_SKILL_ATTRIBUTE[(d[28] + d[29]).upper()])
-            aa = int(d[30] + d[31], 16)
-            if aa > 127:
-                aa -= 256
-            self.skill_amount.set(aa)
-
-            # spell
-            self.spell.set(self.spell_dic[(d[32:36]).upper()])
-            self.spell_level.set(int(d[36] + d[37], 16))
-
-            # magic
-            self.magic.set(self.spell_dic[(d[40:44]).upper()])
-            self.magic_level.set(int(d[44] + d[45], 16))
-
-            # resist
-            self.resist.set(inv_RESIST[(d[46] + d[47]).upper()])
-            self.resist_amount.set(inv_RESIST_AMOUNTS[(d[48] + d[49]).upper()])
-
-    # Virtual: subclasses convert GUI back to bytes and write here.
-    def write(self):
-        # write UI values back to ROM for the selected weapon
-        try:
-            with open(self.filename, 'rb+') as f:
-                address = self.address_list[self.default_item_menu.current()]
-
-                # name field
-                new_name = bytearray(self.name.get(), 'utf-8')
-                if len(new_name) < self.name_length:
-                    while len(new_name) < self.name_length:
-                        new_name.append(0x00)
-                f.seek(address)
-                f.write(new_name)
-
-                # fetch original block to preserve untouched bytes
-                f.seek(address + self.data_seek)
-                d = f.read(self.data_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-
-                # value little-endian split
-                new_value = self.value.get()
-                v2, v1 = divmod(int(new_value), 256)  # split value → (high, low) bytes for little-endian storage
-                if v2 == 256:
-                    v2 = 255
-                    v1 = 255
-
-                # convert negative signed bytes to unsigned
-                st = int(self.att_amount.get())
-                if st < 0:
-                    st += 256
-                sk = int(self.skill_amount.get())
-                if sk < 0:
-                    sk += 256
-
-                # pack out bytes in order
-                towrite = [
-                    WEAPON_TYPE[self.weapon_type.get()],
-                    self.stats[0].get(),
-                    self.stats[1].get(),
-                    self.stats[2].get(),
-                    v1, v2,
-                    (d[12] + d[13]),                   # padding or reserved
-                    self.stats[3].get(),
-                    WEAPON_ANIMATIONS[self.animation.get()],
-                    (d[18] + d[19]),                   # padding or reserved
-                    RESIST[self.damage_type.get()],
-                    self.aspect.get(),
-                    EQUIPMENT_STAT[self.att.get()],
-                    st,
-                    SKILL_ATTRIBUTE[self.skill.get()],
-                    sk,
-                    int(self.inv_spell_dic[self.spell.get()][:2], 16),
-                    int(self.inv_spell_dic[self.spell.get()][2:], 16),
-                    self.spell_level.get(),
-                    (d[38] + d[39]),                   # padding or reserved
-                    int(self.inv_spell_dic[self.magic.get()][:2], 16),
-                    int(self.inv_spell_dic[self.magic.get()][2:], 16),
-                    self.magic_level.get(),
-                    RESIST[self.resist.get()],
-                    RESIST_AMOUNTS[self.resist_amount.get()]
-                ]
-
-                # write byte-by-byte
-                f.seek(address + self.data_seek)
-                for item in towrite:
-                    item = int_cast(item)
-                    f.write(item.to_bytes(1, byteorder='big'))  # write one unsigned byte)
-
-                # refresh dropdown values and restore selection
-                self.reset_list()
-                self.item.set(self.item_list[self.item_list.index(self.name.get().rstrip('\x00'))])
-
-            # reload UI and show success
-            self.set_defaults()
-            flash_saved(self.save, "Saved")
-
-        except (FileNotFoundError, PermissionError, OSError,
-                KeyError, ValueError, UnicodeEncodeError) as err:
-            # file missing/locked, bad dict key, bad int/hex, bad encoding
-            flash_saved(self.save, "Save Failed")
-            # optional console log for debugging
-            print(f"Save failed in WeaponEdit: {err}")
+    # Weapon type, animation and damage type on top of the shared item fields.
+    def load_record(self, rec):
+        super().load_record(rec)
+        self.weapon_type.set(inv_WEAPON_TYPE[f"{rec['weapon_type']:X}"])
+        self.animation.set(inv_WEAPON_ANIMATIONS[f"{rec['animation']:02X}"])
+        self.damage_type.set(inv_RESIST[f"{rec['damage_type']:02X}"])
+
+    # Shared item fields plus the weapon-only selectors.
+    def record_values(self):
+        values = super().record_values()
+        values['weapon_type'] = int(WEAPON_TYPE[self.weapon_type.get()], 16)
+        values['animation'] = int(WEAPON_ANIMATIONS[self.animation.get()], 16)
+        values['damage_type'] = int(RESIST[self.damage_type.get()], 16)
+        return values
 
     # Grid the base item controls; shared across subclasses.
     def build(self):
@@ -1588,19 +1060,23 @@ class WandScrollEdit:
     # Ad-hoc window with local helpers for reading/writing wands and scrolls.
     def __init__(self, filename):
         # window
-        win = Toplevel()
+        win = self.win = Toplevel()
         win.resizable(False, False)
         win.title("Wand and Scroll Edit")
+        self.guards = FieldGuards(win)
 
         # config
         filename = filename
+        rom = open_rom(filename)
         data_seek = 24
         data_read = 20
         name_length = 18
 
         # lists
-        self.scroll_list, self.scroll_addresses = get_major_name_lists(filename, SCROLL_ADDRESSES, name_length)
-        self.wand_list, self.wand_addresses = get_major_name_lists(filename, WAND_ADDRESSES, name_length)
+        scroll_names = name_list(filename, SCROLL_ADDRESSES, name_length)
+        wand_names = name_list(filename, WAND_ADDRESSES, name_length)
+        self.scroll_list, self.scroll_addresses = scroll_names.names, scroll_names.addresses
+        self.wand_list, self.wand_addresses = wand_names.names, wand_names.addresses
         self.sc_menu = Combobox()
         self.wa_menu = Combobox()
 
@@ -1610,48 +1086,40 @@ class WandScrollEdit:
 
         # load wand -> fields
         def wand_defaults(*args):
-            with open(filename, 'rb') as f:
-                address = self.wand_addresses[self.wa_menu.current()]
-                f.seek(address)
-                wa_name.set(f.read(name_length).decode("utf-8"))
-
-                f.seek(address + data_seek)
-                d = f.read(data_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-
-                wa_damage.set(int(d[0] + d[1], 16))
-                wa_protection.set(int(d[2] + d[3], 16))
-                wa_str_req.set(int(d[4] + d[5], 16))
-                wa_int_req.set(int(d[6] + d[7], 16))
-                wa_value.set((int(d[10] + d[11], 16) * 256) + int(d[8] + d[9], 16))
-                wa_aspect.set(d[13])
-                wa_skill.set(inv_SKILL_ATTRIBUTE[(d[14] + d[15]).upper()])
-                att_amount = int(d[16] + d[17], 16)
-                if att_amount > 127:
-                    att_amount = att_amount - 256
-                wa_skill_amount.set(att_amount)
-                wa_spell.set(spell_dic[(d[22:26]).upper()])
-                wa_charges.set(int(d[26] + d[27], 16))
-                wa_spell_level.set(int(d[28] + d[29], 16))
-                wa_resist.set(inv_RESIST[(d[36] + d[37]).upper()])
-                wa_resist_amount.set(inv_RESIST_AMOUNTS[(d[38] + d[39]).upper()])
+            address = self.wand_addresses[self.wa_menu.current()]
+            wa_name.set(rom.text(address, name_length))
+
+            rec = WAND_CODEC.decode(rom.read(address + data_seek, data_read))
+
+            wa_damage.set(rec['damage'])
+            wa_protection.set(rec['protection'])
+            wa_str_req.set(rec['str_required'])
+            wa_int_req.set(rec['int_required'])
+            wa_value.set(rec['value'])
+            wa_aspect.set(rec['aspect'])
+            wa_skill.set(inv_SKILL_ATTRIBUTE[f"{rec['skill']:02X}"])
+            wa_skill_amount.set(rec['skill_amount'])
+            wa_spell.set(spell_dic[rec['spell']])
+            wa_charges.set(rec['charges'])
+            wa_spell_level.set(rec['spell_level'])
+            wa_resist.set(inv_RESIST[f"{rec['resist']:02X}"])
+            wa_resist_amount.set(inv_RESIST_AMOUNTS[f"{rec['resist_amount']:02X}"])
 
         # load scroll -> fields
         def scroll_defaults(*args):
-            with open(filename, 'rb') as f:
-                address = self.scroll_addresses[self.sc_menu.current()]
-                f.seek(address)
-                sc_name.set(f.read(name_length).decode("utf-8"))
+            address = self.scroll_addresses[self.sc_menu.current()]
+            sc_name.set(rom.text(address, name_length))
 
-                f.seek(address + data_seek)
-                d = f.read(data_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
+            rec = SCROLL_CODEC.decode(rom.read(address + data_seek, data_read))
 
-                sc_value.set((int(d[10] + d[11], 16) * 256) + int(d[8] + d[9], 16))
-                sc_spell.set(spell_dic[(d[22:26]).upper()])
-                sc_cast_level.set(int(d[28] + d[29], 16))
+            sc_value.set(rec['value'])
+            sc_spell.set(spell_dic[rec['spell']])
+            sc_cast_level.set(rec['cast_level'])
 
         # write wand <- fields
         def wand_write():
-            with open(filename, 'rb+') as f:
+            self.guards.check()
+            try:
                 address = self.wand_addresses[self.wa_menu.current()]
 
                 # name
@@ -1659,61 +1127,42 @@ class WandScrollEdit:
                 if len(new_name) < name_length:
                     while len(new_name) < name_length:
                         new_name.append(0x00)
-                f.seek(address)
-                f.write(new_name)
 
+                values = {
+                    'damage': int_cast(wa_damage.get()),
+                    'protection': int_cast(wa_protection.get()),
+                    'str_required': int_cast(wa_str_req.get()),
+                    'int_required': int_cast(wa_int_req.get()),
+                    'value': min(int(wa_value.get()), 65535),
+                    'aspect': int_cast(wa_aspect.get()),
+                    'skill': int(SKILL_ATTRIBUTE[wa_skill.get()], 16),
+                    'skill_amount': int(wa_skill_amount.get()),
+                    'spell': inv_spell_dic[wa_spell.get()],
+                    'charges': int_cast(wa_charges.get()),
+                    'spell_level': int_cast(wa_spell_level.get()),
+                    'resist': int(RESIST[wa_resist.get()], 16),
+                    'resist_amount': int(RESIST_AMOUNTS[wa_resist_amount.get()], 16),
+                }
                 # read block (preserve unknowns)
-                f.seek(address + data_seek)
-                d = f.read(data_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-
-                # value split
-                new_value = wa_value.get()
-                v2, v1 = divmod(int(new_value), 256)  # split value → (high, low) bytes for little-endian storage
-                if v2 == 256:
-                    v2 = 255
-                    v1 = 255
-
-                # signed skill amount
-                sk = int(wa_skill_amount.get())
-                if sk < 0:
-                    sk = sk + 256
-
-                towrite = [
-                    wa_damage.get(),
-                    wa_protection.get(),
-                    wa_str_req.get(),
-                    wa_int_req.get(),
-                    v1, v2,
-                    wa_aspect.get(),
-                    SKILL_ATTRIBUTE[wa_skill.get()],
-                    sk,
-                    (d[18] + d[19]),
-                    (d[20] + d[21]),
-                    int(inv_spell_dic[wa_spell.get()][:2], 16),
-                    int(inv_spell_dic[wa_spell.get()][2:], 16),
-                    wa_charges.get(),
-                    wa_spell_level.get(),
-                    (d[30] + d[31]),
-                    (d[32] + d[33]),
-                    (d[34] + d[35]),
-                    RESIST[wa_resist.get()],
-                    RESIST_AMOUNTS[wa_resist_amount.get()]
-                ]
-
-                f.seek(address + data_seek)
-                for item in towrite:
-                    item = int_cast(item)
-                    f.write(item.to_bytes(1, byteorder='big'))  # write one unsigned byte)
-
-                # refresh selection
-                wand_reset_list()
+                data = WAND_CODEC.encode(values, rom.read(address + data_seek, data_read))
+
+                rom.stage(address, new_name)
+                rom.stage(address + data_seek, data)
+                rom.commit()
+
+                # reselect the (possibly renamed) wand
                 self.wand.set(self.wand_list[self.wand_list.index(wa_name.get().rstrip('\x00'))])
-            wand_defaults()
-            flash_saved(self.wa_save_btn, "Saved", ms=1200)  # flash at Save Wand button
+                wand_defaults()
+                flash_saved(self.wa_save_btn, "Saved", ms=1200)  # flash at Save Wand button
+            except (OSError, KeyError, ValueError, UnicodeEncodeError):
+                # blank/non-numeric entry, unknown name or file error: nothing stays staged
+                rom.discard()
+                flash_saved(self.wa_save_btn, "Save Failed", ms=1200)
 
         # write scroll <- fields
         def scroll_write():
-            with open(filename, 'rb+') as f:
+            self.guards.check()
+            try:
                 address = self.scroll_addresses[self.sc_menu.current()]
 
                 # name
@@ -1721,44 +1170,27 @@ class WandScrollEdit:
                 if len(new_name) < name_length:
                     while len(new_name) < name_length:
                         new_name.append(0x00)
-                f.seek(address)
-                f.write(new_name)
 
+                values = {
+                    'value': min(int(sc_value.get()), 65535),
+                    'spell': inv_spell_dic[sc_spell.get()],
+                    'cast_level': int_cast(sc_cast_level.get()),
+                }
                 # read block (preserve unknowns)
-                f.seek(address + data_seek)
-                d = f.read(data_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-
-                # value split
-                new_value = sc_value.get()
-                v2, v1 = divmod(int(new_value), 256)  # split value → (high, low) bytes for little-endian storage
-                if v2 == 256:
-                    v2 = 255
-                    v1 = 255
-
-                towrite = []
-                for i in range(0, 8, 2):
-                    towrite.append(d[i] + d[i + 1])
-                towrite.append(v1)
-                towrite.append(v2)
-                for i in range(12, 22, 2):
-                    towrite.append(d[i] + d[i + 1])
-                towrite.append(int(inv_spell_dic[sc_spell.get()][:2], 16))
-                towrite.append(int(inv_spell_dic[sc_spell.get()][2:], 16))
-                towrite.append(d[26] + d[27])
-                towrite.append(sc_cast_level.get())
-                for i in range(30, 40, 2):
-                    towrite.append(d[i] + d[i + 1])
-
-                f.seek(address + data_seek)
-                for item in towrite:
-                    item = int_cast(item)
-                    f.write(item.to_bytes(1, byteorder='big'))  # write one unsigned byte)
-
-                # refresh selection
-                scroll_reset_list()
+                data = SCROLL_CODEC.encode(values, rom.read(address + data_seek, data_read))
+
+                rom.stage(address, new_name)
+                rom.stage(address + data_seek, data)
+                rom.commit()
+
+                # reselect the (possibly renamed) scroll
                 self.scroll.set(self.scroll_list[self.scroll_list.index(sc_name.get().rstrip('\x00'))])
-            scroll_defaults()
-            flash_saved(self.sc_save_btn, "Saved", ms=1200)  # flash at Save Scroll button
+                scroll_defaults()
+                flash_saved(self.sc_save_btn, "Saved", ms=1200)  # flash at Save Scroll button
+            except (OSError, KeyError, ValueError, UnicodeEncodeError):
+                # blank/non-numeric entry, unknown name or file error: nothing stays staged
+                rom.discard()
+                flash_saved(self.sc_save_btn, "Save Failed", ms=1200)
 
         # layout
         def build():
@@ -1769,9 +1201,8 @@ class WandScrollEdit:
             sc_box = LabelFrame(box, text='Scrolls:', bd=6)
             sc_box.grid(column=0, row=0, sticky='n')
 
-            self.sc_menu = Combobox(sc_box, textvariable=self.scroll, width=20,
-                                    values=self.scroll_list,
-                                    postcommand=scroll_reset_list, state='readonly')
+            self.sc_menu = Combobox(sc_box, textvariable=self.scroll, width=20, state='readonly')
+            scroll_names.subscribe(self.sc_menu)
             self.sc_menu.grid(column=0, row=0, columnspan=2)
 
             sc_new_name_label = LabelFrame(sc_box, text='New Name')
@@ -1781,8 +1212,7 @@ class WandScrollEdit:
 
             sc_spell_label = LabelFrame(sc_box, text='Spell learned/cast')
             sc_spell_label.grid(column=0, row=2, columnspan=2)
-            sc_spell_menu = Combobox(sc_spell_label, textvariable=sc_spell, width=20,
-                                     values=list(inv_spell_dic.keys()), state='readonly')
+            sc_spell_menu = Picker(sc_spell_label, inv_spell_dic, textvariable=sc_spell, width=20)
             sc_spell_menu.grid(column=0, row=0)
 
             sc_spell_label = Label(sc_box, text='Cast Level')
@@ -1803,9 +1233,8 @@ class WandScrollEdit:
             wa_box = LabelFrame(box, text='Wands', bd=6)
             wa_box.grid(column=1, row=0)
 
-            self.wa_menu = Combobox(wa_box, textvariable=self.wand, width=20,
-                                    values=self.wand_list,
-                                    postcommand=wand_reset_list)
+            self.wa_menu = Combobox(wa_box, textvariable=self.wand, width=20)
+            wand_names.subscribe(self.wa_menu)
             self.wa_menu.grid(column=0, row=0, columnspan=2)
 
             wa_new_name_label = LabelFrame(wa_box, text='New Name')
@@ -1815,8 +1244,7 @@ class WandScrollEdit:
 
             wa_spell_label = LabelFrame(wa_box, text='Spell Cast')
             wa_spell_label.grid(column=0, row=2, columnspan=2)
-            wa_spell_menu = Combobox(wa_spell_label, textvariable=wa_spell, width=20,
-                                     values=list(inv_spell_dic.keys()), state='readonly')
+            wa_spell_menu = Picker(wa_spell_label, inv_spell_dic, textvariable=wa_spell, width=20)
             wa_spell_menu.grid(column=0, row=0)
 
             wa_level_label = Label(wa_box, text='Spell Level')
@@ -1884,43 +1312,39 @@ class WandScrollEdit:
             self.wa_save_btn = Button(wa_box, text='Save Wand Edits', command=wand_write)
             self.wa_save_btn.grid(column=0, row=13, columnspan=2)
 
-        # list refreshers
-        def scroll_reset_list():
-            self.scroll_list[:] = []
-            self.scroll_addresses[:] = []
-            self.scroll_list, self.scroll_addresses = get_major_name_lists(filename, SCROLL_ADDRESSES, name_length)
-            self.sc_menu['values'] = self.scroll_list
-
-        def wand_reset_list():
-            self.wand_list[:] = []
-            self.wand_addresses[:] = []
-            self.wand_list, self.wand_addresses = get_major_name_lists(filename, WAND_ADDRESSES, name_length)
-            self.wa_menu['values'] = self.wand_list
-
         # variables
         self.wand = StringVar()
         self.wand.trace('w', wand_defaults)
-        wa_name = StringVar(); wa_name.trace('w', partial(limit_name_size, wa_name, name_length))
-        wa_damage = StringVar(); wa_damage.trace('w', partial(limit, wa_damage, 255))
-        wa_protection = StringVar(); wa_protection.trace('w', partial(limit, wa_protection, 255))
-        wa_str_req = StringVar(); wa_str_req.trace('w', partial(limit, wa_str_req, 30))
-        wa_int_req = StringVar(); wa_int_req.trace('w', partial(limit, wa_int_req, 30))
-        wa_value = StringVar(); wa_value.trace('w', partial(limit, wa_value, 65535))
+        wa_name = StringVar(); self.guards.name(wa_name, name_length)
+        wa_damage = StringVar(); self.guards.limit(wa_damage, 255)
+        wa_protection = StringVar(); self.guards.limit(wa_protection, 255)
+        wa_str_req = StringVar(); self.guards.limit(wa_str_req, 30)
+        wa_int_req = StringVar(); self.guards.limit(wa_int_req, 30)
+        wa_value = StringVar(); self.guards.limit(wa_value, 65535)
         wa_aspect = StringVar()
         wa_skill = StringVar()
-        wa_skill_amount = StringVar(); wa_skill_amount.trace('w', partial(limit_127, wa_skill_amount))
+        wa_skill_amount = StringVar(); self.guards.limit_127(wa_skill_amount)
         wa_spell = StringVar()
-        wa_charges = StringVar(); wa_charges.trace('w', partial(limit, wa_charges, 255))
-        wa_spell_level = StringVar(); wa_spell_level.trace('w', partial(limit, wa_spell_level, 15))
+        wa_charges = StringVar(); self.guards.limit(wa_charges, 255)
+        wa_spell_level = StringVar(); self.guards.limit(wa_spell_level, 15)
         wa_resist = StringVar()
         wa_resist_amount = StringVar()
 
         self.scroll = StringVar()
         self.scroll.trace('w', scroll_defaults)
-        sc_name = StringVar(); sc_name.trace('w', partial(limit_name_size, sc_name, name_length))
-        sc_value = StringVar(); sc_value.trace('w', partial(limit, sc_value, 65535))
+        sc_name = StringVar(); self.guards.name(sc_name, name_length)
+        sc_value = StringVar(); self.guards.limit(sc_value, 65535)
         sc_spell = StringVar()
-        sc_cast_level = StringVar(); sc_cast_level.trace('w', partial(limit, sc_cast_level, 15))
+        sc_cast_level = StringVar(); self.guards.limit(sc_cast_level, 15)
+
+        # re-read the spell names and both shown records (setting a selection reloads it)
+        def refresh():
+            new_spells = get_minor_dic(filename, SPELL_DIC, 22)
+            refill_lookups((spell_dic, new_spells), (inv_spell_dic, {v: k for k, v in new_spells.items()}))
+            self.wand.set(self.wand.get())
+            self.scroll.set(self.scroll.get())
+
+        self.refresh = refresh
 
         # build UI and initialize
         build()
@@ -1934,7 +1358,9 @@ class SpellEdit:
         # window
         self.win = Toplevel()
         self.win.resizable(False, False)
+        self.guards = FieldGuards(self.win)
         self.filename = f
+        self.rom = open_rom(self.filename)
         self.win.title("Spell Edit")
 
         # config
@@ -1943,18 +1369,19 @@ class SpellEdit:
         self.name_length = 22
 
         # lists
-        self.spell_list, self.spell_addresses = get_major_name_lists(self.filename, SPELL_ADDRESSES, self.name_length)
+        self.names = name_list(self.filename, SPELL_ADDRESSES, self.name_length)
+        self.spell_list, self.spell_addresses = self.names.names, self.names.addresses
 
         # variables
         self.spell = StringVar()
         self.spell.trace('w', self.set_defaults)
         self.name = StringVar()
-        self.name.trace('w', partial(limit_name_size, self.name, self.name_length))
-        self.damage = StringVar(); self.damage.trace('w', partial(limit, self.damage, 255))
-        self.stamina = StringVar(); self.stamina.trace('w', partial(limit, self.stamina, 120))
-        self.wizard = StringVar(); self.wizard.trace('w', partial(limit, self.wizard, 10))
-        self.spell_range = StringVar(); self.spell_range.trace('w', partial(limit, self.spell_range, 255))
-        self.exp = StringVar(); self.exp.trace('w', partial(limit, self.exp, 255))
+        self.guards.name(self.name, self.name_length)
+        self.damage = StringVar(); self.guards.limit(self.damage, 255)
+        self.stamina = StringVar(); self.guards.limit(self.stamina, 120)
+        self.wizard = StringVar(); self.guards.limit(self.wizard, 10)
+        self.spell_range = StringVar(); self.guards.limit(self.spell_range, 255)
+        self.exp = StringVar(); self.guards.limit(self.exp, 255)
         self.school = StringVar()
         self.target_num = StringVar()
         self.target_type = StringVar()
@@ -1964,9 +1391,8 @@ class SpellEdit:
 
         # build widgets
         self.box = Frame(self.win)
-        self.default_spell_menu = Combobox(self.box, textvariable=self.spell, width=22,
-                                           values=self.spell_list,
-                                           postcommand=self.reset_list, state='readonly')
+        self.default_spell_menu = Combobox(self.box, textvariable=self.spell, width=22, state='readonly')
+        self.names.subscribe(self.default_spell_menu)
         self.new_name_label = LabelFrame(self.box, text='New Name')
         self.new_name_entry = Entry(self.new_name_label, textvariable=self.name, width=22)
         self.stats_frame = LabelFrame(self.box, text='Stats')
@@ -2011,76 +1437,70 @@ class SpellEdit:
         self.build()
         self.spell.set(self.spell_list[0])
 
+    # Re-read the shown record, e.g. when a hidden window is reopened after other saves or an undo.
+    def refresh(self):
+        # the only lookup is the spell NameList, which commits keep current
+        self.set_defaults()
+
     # load current selection into fields
     # Load selected spell, clamp aspect to allowed set, fill widgets.
     def set_defaults(self, *args):
-        with open(self.filename, 'rb') as f:
-            address = self.spell_addresses[self.default_spell_menu.current()]
-            f.seek(address)
-            self.name.set(f.read(self.name_length).decode("utf-8"))
-
-            f.seek(address + self.data_seek)
-            d = f.read(self.data_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-
-            self.school.set(inv_SCHOOL[(d[0] + d[1]).upper()])
-            self.damage.set(int(d[2] + d[3], 16))
-            self.stamina.set(int(d[4] + d[5], 16))
-            self.target_num.set(inv_TARGET_NUM[d[7]])
-            self.target_type.set(inv_TARGET_TYPE[d[9]])
-            self.wizard.set(int(d[12] + d[13], 16))
-
-            # aspect byte is a single value, clamp to valid range
-            asp = int(d[15], 16)
-            if asp not in (0, 3, 4):
-                asp = 0
-            self.aspect.set(asp)
-
-            self.spell_range.set(int(d[16] + d[17], 16))
-            self.ingredient.set(inv_SPELL_INGREDIENTS[d[19]])
-            self.exp.set(int(d[20] + d[21], 16))
+        address = self.spell_addresses[self.default_spell_menu.current()]
+        self.name.set(self.rom.text(address, self.name_length))
+
+        rec = SPELL_CODEC.decode(self.rom.read(address + self.data_seek, self.data_read))
+
+        self.school.set(inv_SCHOOL[f"{rec['school']:02X}"])
+        self.damage.set(rec['damage'])
+        self.stamina.set(rec['stamina'])
+        self.target_num.set(inv_TARGET_NUM[f"{rec['target_num']:X}"])
+        self.target_type.set(inv_TARGET_TYPE[f"{rec['target_type']:X}"])
+        self.wizard.set(rec['wizard'])
+
+        # aspect byte is a single value, clamp to valid range
+        asp = rec['aspect']
+        if asp not in (0, 3, 4):
+            asp = 0
+        self.aspect.set(asp)
+
+        self.spell_range.set(rec['range'])
+        self.ingredient.set(inv_SPELL_INGREDIENTS[f"{rec['ingredient']:X}"])
+        self.exp.set(rec['exp'])
 
     # write current fields back to ROM
     # Write spell fields back; preserve unknown bytes between known offsets.
     def write(self):
-        with open(self.filename, 'rb+') as f:
-            address = self.spell_addresses[self.default_spell_menu.current()]
-
-            # write name
-            new_name = bytearray(self.name.get(), 'utf-8')
-            if len(new_name) < self.name_length:
-                while len(new_name) < self.name_length:
-                    new_name.append(0x00)
-            f.seek(address)
-            f.write(new_name)
-
-            # read existing bytes to preserve unknowns
-            f.seek(address + self.data_seek)
-            d = f.read(self.data_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-
-            # assemble bytes to write
-            towrite = [
-                SCHOOL[self.school.get()],
-                self.damage.get(),
-                self.stamina.get(),
-                TARGET_NUM[self.target_num.get()],
-                TARGET_TYPE[self.target_type.get()],
-                (d[10] + d[11]),
-                self.wizard.get(),
-                self.aspect.get(),
-                self.spell_range.get(),
-                SPELL_INGREDIENTS[self.ingredient.get()],
-                self.exp.get()
-            ]
-
-            # write block
-            f.seek(address + self.data_seek)
-            for item in towrite:
-                item = int_cast(item)
-                f.write(item.to_bytes(1, byteorder='big'))  # write one unsigned byte)
-
-            # refresh list and keep selection on renamed item
-            self.reset_list()
-            self.spell.set(self.spell_list[self.spell_list.index(self.name.get().rstrip('\x00'))])
+        self.guards.check()
+        address = self.spell_addresses[self.default_spell_menu.current()]
+
+        # write name
+        new_name = bytearray(self.name.get(), 'utf-8')
+        if len(new_name) < self.name_length:
+            while len(new_name) < self.name_length:
+                new_name.append(0x00)
+
+        # encode over the existing bytes to preserve unknowns
+        values = {
+            'school': int(SCHOOL[self.school.get()], 16),
+            'damage': int_cast(self.damage.get()),
+            'stamina': int_cast(self.stamina.get()),
+            'target_num': int(TARGET_NUM[self.target_num.get()], 16),
+            'target_type': int(TARGET_TYPE[self.target_type.get()], 16),
+            'wizard': int_cast(self.wizard.get()),
+            'aspect': self.aspect.get(),
+            'range': int_cast(self.spell_range.get()),
+            'ingredient': int(SPELL_INGREDIENTS[self.ingredient.get()], 16),
+            'exp': int_cast(self.exp.get()),
+        }
+        data = SPELL_CODEC.encode(values, self.rom.read(address + self.data_seek, self.data_read))
+
+        # write block
+        self.rom.stage(address, new_name)
+        self.rom.stage(address + self.data_seek, data)
+        self.rom.commit()
+
+        # keep selection on the renamed spell
+        self.spell.set(self.spell_list[self.spell_list.index(self.name.get().rstrip('\x00'))])
         self.set_defaults()
 
     # save wrapper to show flash near the Save button
@@ -2139,13 +1559,6 @@ class SpellEdit:
         self.target_type_frame.grid(column=1, row=5)
         self.target_type_menu.grid()
 
-    # refresh dropdown values from ROM
-    # Refresh combobox values from ROM after rename.
-    def reset_list(self):
-        self.spell_list[:] = []
-        self.spell_addresses[:] = []
-        self.spell_list, self.spell_addresses = get_major_name_lists(self.filename, SPELL_ADDRESSES, self.name_length)
-        self.default_spell_menu['values'] = self.spell_list
 # --- TrainerEdit: Trainer/shop editor. Left pane teaches skills/spells; right pane manages shop inventory.
 class TrainerEdit:
     # Trainer/shop window: init data tables + left (skills/spells) and right (shop) panes.
@@ -2153,30 +1566,22 @@ class TrainerEdit:
         # window init
         self.win = Toplevel()
         self.win.resizable(False, False)
+        self.guards = FieldGuards(self.win)
         self.filename = f
+        self.rom = open_rom(self.filename)
         self.win.title("Shops and Trainer Edit")
         self.win.grid_columnconfigure(0, weight=1)
         self.win.grid_columnconfigure(1, weight=1)
 
-        # read sizes
-        self.skill_read = 23
-        self.shield_read = 1
-        self.spell_read = 16
+        # trainer skills, spells and shield skill are fields of a character record
+        self.skill_seek = CHARACTER_CODEC.offset('skills')
 
         # trainers without shops
-        self.NOT_SHOPS = [
-            "Talewok : Dryad",
-            "Talewok : Professor 1",
-            "Talewok : Professor 2",
-            "Talewok : Professor 3",
-        ]
+        self.NOT_SHOPS = NOT_SHOPS
 
         # build shops list with Becan name from rom
-        self.shops = []
-        with open(self.filename, "rb") as fobj:
-            fobj.seek(0x01FC7EA4)
-            self.becan = "Erromon : " + fobj.read(9).decode("utf-8").rstrip("\x00")
-            self.shops = [self.becan] + SHOPS
+        self.shops = get_shop_names(self.filename)
+        self.becan = self.shops[0]
 
         # dictionaries
         self.items = get_major_item_dic(self.filename)
@@ -2193,10 +1598,10 @@ class TrainerEdit:
         self.skills = []
         for _ in SKILLS:
             v = StringVar()
-            v.trace("w", partial(limit, v, 10))
+            self.guards.limit(v, 10)
             self.skills.append(v)
         self.shield_skill = StringVar()
-        self.shield_skill.trace("w", partial(limit, self.shield_skill, 10))
+        self.guards.limit(self.shield_skill, 10)
 
         # spell vars
         self.spells = []
@@ -2206,7 +1611,7 @@ class TrainerEdit:
         self.spell_levels = []
         for _ in range(5):
             v = StringVar()
-            v.trace("w", partial(limit, v, 15))
+            self.guards.limit(v, 15)
             self.spell_levels.append(v)
 
         # shop item vars
@@ -2254,15 +1659,7 @@ class TrainerEdit:
         self.spell = []
         self.spell_level = []
         for i in range(5):
-            self.spell.append(
-                Combobox(
-                    self.spell_frame,
-                    textvariable=self.spells[i],
-                    values=list(self.inv_spell_dic.keys()),
-                    state="readonly",
-                    width=16,
-                )
-            )
+            self.spell.append(Picker(self.spell_frame, self.inv_spell_dic, textvariable=self.spells[i], width=16))
             self.spell_level.append(
                 Entry(self.spell_frame, textvariable=self.spell_levels[i], width=4)
             )
@@ -2285,159 +1682,85 @@ class TrainerEdit:
         # shop item widgets
         self.item_box = []
         for i in range(23):
-            self.item_box.append(
-                Combobox(
-                    self.shop_win,
-                    width=28,
-                    state="readonly",
-                    textvariable=self.shop_item[i],
-                    values=list(self.inv_items.keys()),
-                )
-            )
+            self.item_box.append(Picker(self.shop_win, self.inv_items, textvariable=self.shop_item[i], width=28))
 
         # initial selection
         self.trainer.set(self.shops[0])
         self.build()
 
+    # Re-read Becan's name, the item/spell names and the shown trainer, e.g. when a hidden window is reopened.
+    def refresh(self):
+        shown = self.shops.index(self.trainer.get())
+        items = get_major_item_dic(self.filename)
+        spell_dic = get_minor_dic(self.filename, SPELL_DIC, 22)
+        refill_lookups((self.shops, get_shop_names(self.filename)),
+                       (self.items, items), (self.inv_items, {v: k for k, v in items.items()}),
+                       (self.spell_dic, spell_dic), (self.inv_spell_dic, {v: k for k, v in spell_dic.items()}))
+        self.becan = self.shops[0]
+        self.default_name_menu['values'] = self.shops
+        self.trainer.set(self.shops[shown])     # reloads the trainer
+
     # Populate all widgets from ROM for the selected trainer; hides shop when N/A.
     def defaults(self, *args):
         # refresh all widgets from rom for selected trainer
-        with open(self.filename, "rb") as fobj:
-            # skills
-            address = SHOP_TRAINERS[self.shops.index(self.trainer.get())]
-            fobj.seek(address)
-            d = fobj.read(self.skill_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-            for s in self.skills:
-                x = self.skills.index(s) * 2
-                sn = int(d[x] + d[x + 1], 16)
-                if sn == 255:
-                    sn = ""
-                s.set(sn)
-
-            # shield
-            address = SHOP_SHIELDS[self.shops.index(self.trainer.get())]
-            fobj.seek(address)
-            d = fobj.read(self.shield_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-            shi = int(d[0] + d[1], 16)
-            if shi == 255:
-                shi = ""
-            self.shield_skill.set(shi)
-
-            # spells and levels
-            address = SHOP_SPELLS[self.shops.index(self.trainer.get())]
-            fobj.seek(address)
-            d = fobj.read(self.spell_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-            for s in self.spells:
-                x = self.spells.index(s) * 4
-                y = x + 4
-                s.set(self.spell_dic[d[x:y].upper()])
-            for s in self.spell_levels:
-                x = (self.spell_levels.index(s) * 2) + 22
-                s.set(int(d[x] + d[x + 1], 16))
-
-            # shop inventory
-            if self.trainer.get() in self.NOT_SHOPS:
-                self.shop_win.grid_forget()
-                for item in self.shop_item:
-                    item.set("")
-            else:
-                self.shop_win.grid(column=1, row=2, pady=5, padx=(0, 5), sticky="n")
-                address = SHOP_ITEMS[self.shops.index(self.trainer.get())]
-                fobj.seek(address)
-                for item in self.shop_item:
-                    d = fobj.read(2).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-                    item.set(self.items[d[0:4].upper()])
-                    if self.shop_item.index(item) < 20:
-                        address += 5
-                        fobj.seek(address)
-                    else:
-                        address += 2
-                        fobj.seek(address)
+        address = SHOP_TRAINERS[self.shops.index(self.trainer.get())] - self.skill_seek
+        rec = CHARACTER_CODEC.decode(self.rom.read(address, CHARACTER_CODEC.size))
+
+        # skills and shield ('' when 255)
+        for s, sn in zip(self.skills, rec['skills']):
+            s.set("" if sn == 255 else sn)
+        shi = rec['shield_skill']
+        self.shield_skill.set("" if shi == 255 else shi)
+
+        # spells and levels
+        for s, code in zip(self.spells, rec['spells']):
+            s.set(self.spell_dic[code])
+        for s, lv in zip(self.spell_levels, rec['spell_levels']):
+            s.set(lv)
+
+        # shop inventory
+        if self.trainer.get() in self.NOT_SHOPS:
+            self.shop_win.grid_forget()
+            for item in self.shop_item:
+                item.set("")
+        else:
+            self.shop_win.grid(column=1, row=2, pady=5, padx=(0, 5), sticky="n")
+            address = SHOP_ITEMS[self.shops.index(self.trainer.get())]
+            rec = SHOP_CODEC.decode(self.rom.read(address, SHOP_CODEC.size))
+            for idx, item in enumerate(self.shop_item):
+                item.set(self.items[rec[f'item{idx}']])
 
-    # Write skills, shield, spells, and inventory back to ROM; preserve delimiters.
+    # Write skills, shield, spells, and inventory back to ROM; other record bytes are kept.
     def write(self):
         # write current values to rom for selected trainer
-        with open(self.filename, "rb+") as fobj:
-            # skills
-            address = SHOP_TRAINERS[self.shops.index(self.trainer.get())]
-            fobj.seek(address)
-            towrite = []
-            for v in self.skills:
-                j = v.get()
-                if j == "":
-                    j = "255"
-                towrite.append(j)
-            fobj.seek(address)
-            if self.trainer.get() == self.becan:
-                for b in towrite:
-                    b = int_cast(b)
-                    fobj.write(b.to_bytes(1, byteorder="big"))
-            else:
-                for b in towrite:
-                    if b == "255":
-                        b = "0"
-                    b = int_cast(b)
-                    fobj.write(b.to_bytes(1, byteorder="big"))
-
-            # shield
-            towrite[:] = []
-            address = SHOP_SHIELDS[self.shops.index(self.trainer.get())]
-            fobj.seek(address)
-            shi = self.shield_skill.get()
-            if shi == "":
-                shi = 255
-            towrite.append(shi)
-            if self.trainer.get() == self.becan:
-                for b in towrite:
-                    b = int_cast(b)
-                    fobj.write(b.to_bytes(1, byteorder="big"))
-            else:
-                for b in towrite:
-                    if b == "255":
-                        b = "0"
-                    b = int_cast(b)
-                    fobj.write(b.to_bytes(1, byteorder="big"))
-
-            # spells
-            towrite[:] = []
-            address = SHOP_SPELLS[self.shops.index(self.trainer.get())]
-            fobj.seek(address)
-            d = fobj.read(self.spell_read).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-            for v in self.spells:
-                towrite.append(int(self.inv_spell_dic[v.get()][:2], 16))
-                towrite.append(int(self.inv_spell_dic[v.get()][2:], 16))
-            towrite.append(d[9] + d[10])  # preserve delimiter
-            for v in self.spell_levels:
-                towrite.append(v.get())
-            fobj.seek(address)
-            for b in towrite:
-                b = int_cast(b)
-                fobj.write(b.to_bytes(1, byteorder="big"))
+        self.guards.check()
+        try:
+            # skills, shield and spells; blanks are 255 for Becan, 0 for everyone else
+            blank = 255 if self.trainer.get() == self.becan else 0
+            address = SHOP_TRAINERS[self.shops.index(self.trainer.get())] - self.skill_seek
+            values = {
+                'skills': [blank if v.get() == "" else int_cast(v.get()) for v in self.skills],
+                'shield_skill': blank if self.shield_skill.get() == "" else int_cast(self.shield_skill.get()),
+                'spells': [self.inv_spell_dic[v.get()] for v in self.spells],
+                'spell_levels': [int_cast(v.get()) for v in self.spell_levels],
+            }
+            data = CHARACTER_CODEC.encode(values, self.rom.read(address, CHARACTER_CODEC.size))
+            self.rom.stage(address, data)
 
             # shop inventory
-            towrite[:] = []
             if self.trainer.get() not in self.NOT_SHOPS:
                 address = SHOP_ITEMS[self.shops.index(self.trainer.get())]
-                fobj.seek(address)
-                d = fobj.read(106).hex()  # hex-encoded bytes from ROM; indexes below use big-endian pairs
-                for item in self.shop_item:
-                    towrite.append(int((self.inv_items[item.get()])[:2], 16))
-                    towrite.append(int((self.inv_items[item.get()])[2:4], 16))
-                    if self.shop_item.index(item) < 20:
-                        for x in range(5, 11, 2):
-                            towrite.append(
-                                int(
-                                    d[((self.shop_item.index(item) * 10) + (x - 1))]
-                                    + d[((self.shop_item.index(item) * 10) + x)],
-                                    16,
-                                )
-                            )
-                fobj.seek(address)
-                for b in towrite:
-                    fobj.write(b.to_bytes(1, byteorder="big"))
-
-        self.defaults()
-        flash_saved(self.save)  # toast at save button
+                values = {f'item{idx}': self.inv_items[item.get()] for idx, item in enumerate(self.shop_item)}
+                self.rom.stage(address, SHOP_CODEC.encode(values, self.rom.read(address, SHOP_CODEC.size)))
+
+            # trainer record and shop inventory: one write each
+            self.rom.commit()
+            self.defaults()
+            flash_saved(self.save)  # toast at save button
+        except (OSError, KeyError, ValueError, UnicodeEncodeError):
+            # drop the parts already staged so a later save cannot flush them
+            self.rom.discard()
+            flash_saved(self.save, "Save Failed")
 
     # Grid banner + panes; create rows of skill entries and shop items.
     def build(self):
@@ -2494,35 +1817,1070 @@ class TrainerEdit:
             self.becan_warning.grid_remove()
             self.becan_warning2.grid_remove()
 
+# picker.py
+# --- NameIndex: Word-prefix and trigram lookup over one list of menu names.
+class NameIndex:
+    """
+    Every word start of every name is kept in one sorted list, so a prefix
+    query ('broad' finds '(weapon) Broadsword') is two bisects. Longer queries
+    fall back to a trigram map for matches inside words, and then for near
+    misses ('brodsword'). Results keep the order of the original list.
+    """
+    def __init__(self, names):
+        self.names = list(names)
+        self.position = {name: i for i, name in enumerate(self.names)}
+        tails = []
+        self.trigrams = {}
+        for i, name in enumerate(self.names):
+            key = name.lower()
+            tails += [(key[p:], i) for p in range(len(key))
+                      if p == 0 or (key[p].isalnum() and not key[p - 1].isalnum())]
+            for gram in {key[p:p + 3] for p in range(len(key) - 2)}:
+                self.trigrams.setdefault(gram, set()).add(i)
+        tails.sort()
+        self._tails = [tail for tail, _ in tails]
+        self._tail_ids = [i for _, i in tails]
+
+    # Up to `limit` names for a typed query: word-prefix hits, then substring hits, then near misses.
+    def search(self, query, limit=30):
+        query = query.strip().lower()
+        if not query:
+            return self.names[:limit]
+        lo = bisect_left(self._tails, query)
+        hi = bisect_left(self._tails, query + '\uffff')
+        found = sorted(set(self._tail_ids[lo:hi]))
+        if len(found) < limit and len(query) >= 3:
+            grams = [self.trigrams.get(query[p:p + 3], set()) for p in range(len(query) - 2)]
+            seen = set(found)
+            inside = sorted(i for i in set.intersection(*grams) - seen if query in self.names[i].lower())
+            found += inside
+            if not found:
+                # near misses: names sharing at least half of the query's trigrams, best first
+                counts = {}
+                for ids in grams:
+                    for i in ids:
+                        counts[i] = counts.get(i, 0) + 1
+                need = max(1, len(grams) // 2)
+                found = sorted((i for i, n in counts.items() if n >= need), key=lambda i: (-counts[i], i))
+        return [self.names[i] for i in found[:limit]]
+
+    # The `limit` names around `name` in list order, so an opened menu shows the current pick in context.
+    def around(self, name, limit=30):
+        i = self.position.get(name, 0)
+        start = max(0, min(i - limit // 2, len(self.names) - limit))
+        return self.names[start:start + limit]
+
+
+_NAME_INDEXES = {}
+
+
+# Shared index for a name list; editors showing the same items or spells reuse one index.
+def name_index(names):
+    key = tuple(names)
+    return _keep_index(key, _NAME_INDEXES.pop(key, None) or NameIndex(key))
+
+
+def _keep_index(key, index):
+    _NAME_INDEXES.pop(key, None)
+    _NAME_INDEXES[key] = index      # most recently used last
+    while len(_NAME_INDEXES) > 32:
+        del _NAME_INDEXES[next(iter(_NAME_INDEXES))]
+    return index
+
+
+# --- Picker: Type-to-filter Combobox over a NameIndex; lists only the current matches.
+class Picker(Combobox):
+    """
+    Drop-in for the read-only item and spell Comboboxes. Typing narrows the
+    list to at most `limit` matches instead of handing Tk hundreds of entries.
+    Enter or leaving the field settles the text on the first match. If nothing
+    matches, the last valid pick comes back, so the variable only ever holds
+    a name from the list. `names` is kept, not copied: editors refill their
+    lookups in place on refresh(), and the index follows.
+    """
+    NAV_KEYS = {'Up', 'Down', 'Return', 'KP_Enter', 'Escape', 'Tab', 'ISO_Left_Tab'}
+
+    def __init__(self, master, names, textvariable, limit=30, **kw):
+        self.names = names
+        self.limit = limit
+        self.variable = textvariable
+        self.last = textvariable.get()
+        super().__init__(master, textvariable=textvariable, postcommand=self.refill, **kw)
+        self.bind('<FocusIn>', self.remember)
+        self.bind('<KeyRelease>', self.on_key)
+        self.bind('<Return>', self.settle)
+        self.bind('<FocusOut>', self.settle)
+
+    # Index of the current names (name_index() caches it until they change).
+    @property
+    def index(self):
+        return name_index(self.names)
+
+    # Note the current pick when editing starts; settle() falls back to it.
+    def remember(self, *args):
+        value = self.variable.get()
+        if value in self.index.position:
+            self.last = value
+
+    # Refill the dropdown for the current text (or around the current pick) before it opens.
+    def refill(self):
+        text = self.get()
+        if text in self.index.position:
+            self['values'] = self.index.around(text, self.limit)
+        else:
+            self['values'] = self.index.search(text, self.limit)
+
+    def on_key(self, event):
+        if event.keysym not in self.NAV_KEYS:
+            self['values'] = self.index.search(self.get(), self.limit)
+
+    # Snap free text to the first match, or back to the last valid pick.
+    def settle(self, *args):
+        text = self.get()
+        if text in self.index.position:
+            return
+        matches = self.index.search(text, 1)
+        self.variable.set(matches[0] if matches else self.last)
+
+
+# rom.py
+# --- RomImage: One read-only memory map of the ROM, shared by every editor for the session.
+class RomImage:
+    # staged runs closer than this are written as one run, the gap refilled from the mapping
+    coalesce_gap = 64
+    # commits go through a fsynced write-ahead log; off only for throwaway copies
+    durable = True
+    # commits touching the boot code or checksummed words also update CRC1/CRC2
+    fix_crc = True
+
+    # Map the whole file once; reads become slices of the mapping instead of open/seek/read.
+    def __init__(self, path):
+        """
+        z64 dumps are mapped as-is. v64/n64 dumps (detected from the first word)
+        are swapped into z64 order in memory, so every offset stays the same;
+        commit() swaps the written runs back to the file's own order.
+        """
+        self.path = Path(path)
+        self.recovered = replay_wal(self.path)  # finish a save that was cut off
+        self._file = open(self.path, 'rb')
+        try:
+            self.byte_order, self.word_size = ROM_FORMATS.get(self._file.read(4), ('z64', 1))
+            if self.word_size == 1:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                self._map = bytearray(os.fstat(self._file.fileno()).st_size)
+                if len(self._map) % self.word_size:
+                    raise ValueError(f"{self.byte_order} dump size is not a multiple of {self.word_size}")
+                self._file.seek(0)
+                self._file.readinto(self._map)
+                if np is not None:
+                    np.frombuffer(self._map, dtype=f'u{self.word_size}').byteswap(inplace=True)
+                else:
+                    self._map[:] = swap_words(self._map, self.word_size)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        self._view = memoryview(self._map)
+        self._pending = []  # staged (address, bytes) in stage order
+        self._cache = {}    # key -> (value, range starts, range ends) for cached()
+        self._index = {}    # key -> (value, starts, ends, digest) read from the on-disk index
+        self._index_trusted = False
+        self._index_dirty = False
+        self._index_file = None     # index file loaded for the tables as opened
+        self._local = threading.local()     # prefetch() state of the calling thread
+        self.generation = 0  # bumped whenever staged or written bytes change; see adopt()
+        self.journal = WriteJournal()
+        self.observers = []  # called with the changed [start, end) spans after each commit
+        self.load_index()
+
+    def __len__(self):
+        return len(self._map)
+
+    # Zero-copy slice of the mapping; staged-but-unwritten bytes are overlaid on a copy.
+    def read(self, address, length):
+        """Return a memoryview of `length` bytes starting at `address`."""
+        view = self._view[address:address + length]
+        if not self._pending:
+            return view
+        end = address + length
+        buf = None
+        for a, data in self._pending:
+            lo, hi = max(a, address), min(a + len(data), end)
+            if lo < hi:
+                if buf is None:
+                    buf = bytearray(view)
+                buf[lo - address:hi - address] = data[lo - a:hi - a]
+        return view if buf is None else memoryview(buf)
+
+    # Decode a fixed-length text field exactly as stored (NUL padding included).
+    def text(self, address, length):
+        """Return the UTF-8 text of a fixed-length field at `address`."""
+        return str(self.read(address, length), 'utf-8')
+
+    # Queue bytes for `address`; the file is not touched until commit().
+    def stage(self, address, data):
+        if address < 0 or address + len(data) > len(self):
+            raise ValueError(f"write outside ROM: {address:#x}+{len(data)}")
+        self._pending.append((address, bytes(data)))
+        self.generation += 1
+
+    # Forget staged bytes without writing them.
+    def discard(self):
+        self._pending = []
+        self.generation += 1
+
+    # Sorted [start, end) runs covering everything staged, with near neighbours merged.
+    def dirty_ranges(self):
+        runs = []
+        w = self.word_size  # swapped dumps are written in whole words
+        for start, end in sorted((a - a % w, a + len(d) + -(a + len(d)) % w) for a, d in self._pending):
+            if runs and start <= runs[-1][1] + self.coalesce_gap:
+                runs[-1][1] = max(runs[-1][1], end)
+            else:
+                runs.append([start, end])
+        return [tuple(r) for r in runs]
+
+    # Memoized lookup built from ROM bytes, dropped once a commit changes any of `ranges`.
+    def cached(self, key, ranges, build):
+        """
+        Return the value cached under `key`, calling `build()` on a miss.
+        `ranges` are the [start, end) byte spans the value was read from.
+        Inside prefetch() the session caches are only read; misses are kept
+        in the prefetch's own dict.
+        """
+        built = getattr(self._local, 'built', None)
+        hit = self._cache.get(key) or (built or {}).get(key)
+        if hit is None:
+            starts, ends = _merge_ranges(ranges)
+            stored = self._index.get(key)
+            fresh = stored is None or not (self._index_trusted or stored[3] == self._digest(starts, ends))
+            value = build() if fresh else stored[0]
+            if built is not None:
+                built[key] = (value, starts, ends, fresh)
+                return value
+            self._index.pop(key, None)
+            self._index_dirty |= fresh
+            hit = self._cache[key] = (value, starts, ends)
+        return hit[0]
+
+    # Run `func` on a worker thread without touching the session caches; see adopt().
+    def prefetch(self, func):
+        """
+        Returns (generation, built, func()). `built` holds the lookups cached()
+        built or read from the index meanwhile; only the owning thread may
+        install them, with adopt().
+        """
+        generation = self.generation
+        self._local.built = built = {}
+        try:
+            result = func()
+        finally:
+            del self._local.built
+        return generation, built, result
+
+    # Install lookups from prefetch(); False (and nothing installed) if bytes were staged or written since.
+    def adopt(self, generation, built):
+        if generation != self.generation:
+            return False
+        for key, (value, starts, ends, fresh) in built.items():
+            if key not in self._cache:
+                self._cache[key] = (value, starts, ends)
+                self._index.pop(key, None)
+                self._index_dirty |= fresh
+        return True
+
+    # Drop cached lookups (in memory and from the index) that read from any of the spans.
+    def invalidate(self, spans):
+        for store in (self._cache, self._index):
+            for key, entry in list(store.items()):
+                starts, ends = entry[1], entry[2]
+                for start, end in spans:
+                    i = bisect_right(starts, end - 1) - 1
+                    if i >= 0 and ends[i] > start:
+                        del store[key]
+                        self._index_dirty = True
+                        break
+
+    # SHA-1 of the bytes in merged [start, end) spans.
+    def _digest(self, starts, ends):
+        h = hashlib.sha1()
+        for start, end in zip(starts, ends):
+            h.update(self._view[start:end])
+        return h.digest()
+
+    # Cheap content fingerprint: the header plus 64 evenly spaced 64-byte samples.
+    def sample_hash(self):
+        h = hashlib.sha1(self._view[:0x1000])
+        for i in range(64):
+            at = len(self) * i // 64
+            h.update(self._view[at:at + 64])
+        return h.hexdigest()
+
+    # One index file per ROM size + header and record-table hash in the user cache directory.
+    def index_path(self):
+        """
+        The header alone does not tell apart ROMs that differ only in their
+        tables (randomize/batch output), so the tables are hashed too.
+        """
+        h = hashlib.sha1(self._view[:0x40])
+        h.update(self._view[TABLE_REGION[0]:TABLE_REGION[1]])
+        return user_cache_dir() / f"{len(self):x}-{h.hexdigest()[:16]}.idx"
+
+    # Load persisted lookups; trusted outright while mtime and samples are unchanged.
+    def load_index(self):
+        """
+        Untrusted entries are kept and checked one by one against the digest of
+        the bytes they were built from, so only changed name tables are rebuilt.
+        """
+        self._index_file = self.index_path()
+        try:
+            with open(self._index_file, 'rb') as fh:
+                data = marshal.load(fh)
+            if data['format'] != INDEX_FORMAT or data['size'] != len(self):
+                return
+            self._index = data['entries']
+            self._index_trusted = (data['mtime'] == os.stat(self.path).st_mtime_ns
+                                   and data['sample'] == self.sample_hash())
+        except (OSError, EOFError, ValueError, TypeError, KeyError):
+            self._index = {}
+
+    # Write the index back if anything was rebuilt, invalidated or the ROM changed on disk.
+    def save_index(self):
+        path = self.index_path()
+        if not self._index_dirty and self._index_trusted and path == self._index_file:
+            return
+        entries = dict(self._index)
+        for key, (value, starts, ends) in self._cache.items():
+            entries[key] = (value, starts, ends, self._digest(starts, ends))
+        data = {'format': INDEX_FORMAT, 'size': len(self), 'mtime': os.stat(self.path).st_mtime_ns,
+                'sample': self.sample_hash(), 'entries': entries}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'wb') as fh:
+            marshal.dump(data, fh)
+        os.replace(tmp, path)
+        if self._index_file is not None and self._index_file != path:
+            self._index_file.unlink(missing_ok=True)    # edited tables: the old name no longer matches
+        self._index_file = path
+        self._index_dirty = False
+        self._index_trusted = True
+
+    # Flush staged bytes as one positioned write per merged run.
+    def commit(self, record=True):
+        """
+        Write all staged bytes to the file. Later stages win where they overlap.
+        Cached lookups over bytes that actually changed are invalidated, and the
+        before/after bytes go to the undo journal unless `record` is False.
+        When `durable`, the runs are first fsynced to '<rom>.wal', so a crash
+        leaves either the old bytes or a log the next open replays; the log is
+        deleted once the ROM itself is fsynced.
+        Returns the number of writes issued.
+        """
+        if self.fix_crc and any(a < CRC_END and a + len(d) > 0x40 for a, d in self._pending):
+            self._stage_crc()
+        runs = self.dirty_ranges()
+        pending, self._pending = self._pending, []
+        if not runs:
+            return 0
+        # a save rewrites names it did not change; only real changes invalidate
+        changed = [(a, a + len(d)) for a, d in pending if self._view[a:a + len(d)] != d]
+        starts = [start for start, _ in runs]
+        bufs = [bytearray(self._view[start:end]) for start, end in runs]
+        for address, data in pending:
+            i = bisect_right(starts, address) - 1
+            offset = address - starts[i]
+            bufs[i][offset:offset + len(data)] = data
+        if record:
+            entry = [(start, bytes(self._view[start:start + len(buf)]), bytes(buf))
+                     for start, buf in zip(starts, bufs)]
+            entry = [run for run in entry if run[1] != run[2]]
+            if entry:
+                self.journal.record(entry)
+        file_bufs = [self.file_order(buf) for buf in bufs]
+        wal = write_wal(self.path, zip(starts, file_bufs)) if self.durable else None
+        fd = os.open(self.path, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+        try:
+            for start, buf in zip(starts, file_bufs):
+                _pwrite(fd, buf, start)
+            if wal is not None:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        if wal is not None:
+            os.unlink(wal)
+        if self.word_size > 1:
+            # the in-memory copy is not a mapping, so it does not see the write
+            for start, buf in zip(starts, bufs):
+                self._map[start:start + len(buf)] = buf
+        self.generation += 1     # a prefetch that read while this commit ran is stale too
+        self.invalidate(changed)
+        if changed:
+            for observer in list(self.observers):
+                observer(changed)
+        return len(bufs)
+
+    # z64-order bytes as the file stores them (v64/n64 swap every word; the swap is its own inverse).
+    def file_order(self, data):
+        return data if self.word_size == 1 else swap_words(data, self.word_size)
+
+    # Stage the header CRCs for the bytes as they will be after the pending writes.
+    def _stage_crc(self):
+        cic = detect_cic(self.read(0, 0x1000))
+        if cic is None:
+            return  # unknown boot code: leave the header alone
+        crc = struct.pack('>II', *n64_crc(self.read(0, CRC_END), cic))
+        if self.read(0x10, 8) != crc:
+            self.stage(0x10, crc)
+
+    # Write back the bytes from before the newest journaled commit; False if there is none.
+    def undo(self):
+        entry = self.journal.undo()
+        if entry is None:
+            return False
+        for address, before, _ in entry:
+            self.stage(address, before)
+        self.commit(record=False)
+        return True
+
+    # Re-apply the newest undone commit; False if there is none.
+    def redo(self):
+        entry = self.journal.redo()
+        if entry is None:
+            return False
+        for address, _, after in entry:
+            self.stage(address, after)
+        self.commit(record=False)
+        return True
+
+    # Release the mapping and the file handle.
+    def close(self):
+        """
+        Slices from read() may outlive the session; the mapping they point
+        into is then unmapped when the last of them is freed, not here.
+        """
+        if self._view is None:
+            return
+        try:
+            self.journal.close()
+            self.observers.clear()
+            try:
+                self.save_index()
+            except (OSError, ValueError):
+                pass  # the index is only a cache; the next launch rebuilds it
+            self._cache.clear()
+        finally:
+            self._view.release()
+            self._view = None
+            if self.word_size == 1:
+                try:
+                    self._map.close()
+                except BufferError:
+                    pass  # read() slices still alive; unmapped once the last reference is freed
+            self._file.close()
+
+
+# --- WriteJournal: Before/after bytes of each commit, for undo and redo.
+class WriteJournal:
+    """
+    An entry is the list of (address, before, after) runs of one commit.
+    Recording is an O(1) append that clears the redo stack. Undo and redo pop
+    one entry each. Entries held in memory are limited to `memory_budget` bytes.
+    Past that, the oldest entries are marshalled to an anonymous spill file and
+    read back only if undo gets that far. The oldest entries past `max_entries`
+    are dropped.
+    """
+    memory_budget = 8 << 20
+    max_entries = 10000
+
+    def __init__(self):
+        self._undo = deque()     # in-memory entries, oldest first
+        self._spilled = deque()  # (offset, length) in the spill file, all older than _undo
+        self._redo = []
+        self._size = 0           # bytes held by _undo
+        self._spill = None
+
+    def __len__(self):
+        return len(self._spilled) + len(self._undo)
+
+    @property
+    def can_undo(self):
+        return bool(self._undo or self._spilled)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    @staticmethod
+    def _weight(entry):
+        return sum(len(before) + len(after) for _, before, after in entry)
+
+    def _push(self, entry):
+        self._undo.append(entry)
+        self._size += self._weight(entry)
+        while self._size > self.memory_budget and len(self._undo) > 1:
+            old = self._undo.popleft()
+            self._size -= self._weight(old)
+            if self._spill is None:
+                self._spill = tempfile.TemporaryFile(prefix='aidyn-journal-')
+            data = marshal.dumps(old)
+            offset = self._spill.seek(0, os.SEEK_END)
+            self._spill.write(data)
+            self._spilled.append((offset, len(data)))
+        if len(self) > self.max_entries:
+            if self._spilled:
+                self._spilled.popleft()
+            else:
+                self._size -= self._weight(self._undo.popleft())
+
+    # Add one commit's runs; a new edit makes the undone ones unreachable.
+    def record(self, entry):
+        self._redo.clear()
+        self._push(entry)
+
+    # Newest entry, moved to the redo stack; None when there is nothing to undo.
+    def undo(self):
+        if self._undo:
+            entry = self._undo.pop()
+            self._size -= self._weight(entry)
+        elif self._spilled:
+            offset, length = self._spilled.pop()
+            self._spill.seek(offset)
+            entry = marshal.loads(self._spill.read(length))
+            self._spill.truncate(offset)  # it was the last record in the file
+        else:
+            return None
+        self._redo.append(entry)
+        return entry
+
+    # Newest undone entry, moved back to the undo stack; None when there is nothing to redo.
+    def redo(self):
+        if not self._redo:
+            return None
+        entry = self._redo.pop()
+        self._push(entry)
+        return entry
+
+    def close(self):
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+        self._undo.clear()
+        self._spilled.clear()
+        self._redo.clear()
+        self._size = 0
+
+
+# first word of each dump format -> (name, swapped word size); z64 is the console's own order
+ROM_FORMATS = {b'\x80\x37\x12\x40': ('z64', 1), b'\x37\x80\x40\x12': ('v64', 2), b'\x40\x12\x37\x80': ('n64', 4)}
+
+
+# Reverse the bytes of every `width`-byte word: v64 (2) and n64 (4) to z64 and back.
+def swap_words(data, width):
+    if width == 1:
+        return bytes(data)
+    if np is not None:
+        return np.frombuffer(data, dtype=f'u{width}').byteswap().tobytes()
+    words = array.array('H' if width == 2 else 'I', bytes(data))
+    words.byteswap()
+    return words.tobytes()
+
+
+# N64 boot checksum: CRC1/CRC2 at 0x10 cover the words in [CRC_START, CRC_END)
+CRC_START, CRC_END = 0x1000, 0x101000
+# CRC32 of the boot code (0x40-0x1000) -> CIC chip, and each chip's checksum seed
+CIC_BOOT_CRC32 = {0x6170A4A1: 6101, 0x90BB6CB5: 6102, 0x0B050EE0: 6103, 0x98BC2C86: 6105, 0xACC8580A: 6106}
+CIC_SEEDS = {6101: 0xF8CA4DDC, 6102: 0xF8CA4DDC, 6103: 0xA3886759, 6105: 0xDF26F436, 6106: 0x1FEA617A}
+
+
+# CIC chip a z64 image boots with, from its boot code; None for unknown boot code.
+def detect_cic(rom):
+    return CIC_BOOT_CRC32.get(zlib.crc32(rom[0x40:0x1000]))
+
+
+# (CRC1, CRC2) the header should hold for a z64 image booting with `cic`.
+def n64_crc(rom, cic):
+    """
+    The running sum, carry count, XOR and rotate sums are NumPy reductions over
+    the 256Ki big-endian words. Only t2, whose update depends on its own value,
+    is a loop, and it runs over precomputed lists. Without NumPy the whole
+    checksum is one plain loop.
+    """
+    seed = CIC_SEEDS[cic]
+    mask = 0xFFFFFFFF
+    if len(rom) < CRC_END:
+        raise ValueError(f"ROM is too short for a boot checksum ({len(rom)} bytes)")
+    if np is None:
+        return _n64_crc_loop(rom, cic)
+    d = np.frombuffer(rom, dtype='>u4', count=(CRC_END - CRC_START) // 4, offset=CRC_START).astype(np.uint64)
+    sums = seed + np.cumsum(d)                          # t6 before wrapping, per step
+    t6 = sums & mask
+    t4 = (seed + int(sums[-1] >> 32)) & mask            # one carry per 2**32 wrap
+    t3 = seed ^ int(np.bitwise_xor.reduce(d))
+    shift = d & 0x1F
+    r = ((d << shift) | (d >> ((32 - shift) & 0x1F))) & mask    # rotate left by d & 31
+    t5_steps = (seed + np.cumsum(r)) & mask
+    t5 = int(t5_steps[-1])
+    if cic == 6105:
+        table = np.frombuffer(rom, dtype='>u4', count=0x40, offset=0x750).astype(np.uint64)
+        t1 = (seed + int(np.sum(table[np.arange(len(d)) & 0x3F] ^ d))) & mask     # word at 0x750 + (offset & 0xFF)
+    else:
+        t1 = (seed + int(np.sum(t5_steps ^ d))) & mask
+    t2 = seed
+    for word, rotated, other in zip(d.tolist(), r.tolist(), (t6 ^ d).tolist()):
+        t2 ^= rotated if t2 > word else other
+    return _n64_crc_finish(cic, t1, t2, t3, t4, t5, int(t6[-1]))
+
+
+# Reference loop (n64crc.c), used when NumPy is missing.
+def _n64_crc_loop(rom, cic):
+    mask = 0xFFFFFFFF
+    t1 = t2 = t3 = t4 = t5 = t6 = CIC_SEEDS[cic]
+    words = struct.unpack_from(f'>{(CRC_END - CRC_START) // 4}I', rom, CRC_START)
+    table = struct.unpack_from('>64I', rom, 0x750)
+    for i, d in enumerate(words):
+        t6 = (t6 + d) & mask
+        if t6 < d:
+            t4 = (t4 + 1) & mask
+        t3 ^= d
+        r = ((d << (d & 0x1F)) | (d >> (32 - (d & 0x1F)))) & mask
+        t5 = (t5 + r) & mask
+        t2 ^= r if t2 > d else t6 ^ d
+        t1 = (t1 + ((table[i & 0x3F] if cic == 6105 else t5) ^ d)) & mask
+    return _n64_crc_finish(cic, t1, t2, t3, t4, t5, t6)
+
+
+def _n64_crc_finish(cic, t1, t2, t3, t4, t5, t6):
+    mask = 0xFFFFFFFF
+    if cic == 6103:
+        return ((t6 ^ t4) + t3) & mask, ((t5 ^ t2) + t1) & mask
+    if cic == 6106:
+        return (t6 * t4 + t3) & mask, (t5 * t2 + t1) & mask
+    return t6 ^ t4 ^ t3, t5 ^ t2 ^ t1
+
+
+# write-ahead log header: magic, payload length, then marshalled runs and their SHA-1
+WAL_MAGIC = b'AIDYNWAL1'
+
+
+# Write-ahead log for a ROM: the runs about to be written, fsynced before the ROM is touched.
+def write_wal(path, runs):
+    """Returns the log path; the caller deletes it after the ROM is fsynced."""
+    wal = Path(f'{path}.wal')
+    payload = marshal.dumps([(start, bytes(buf)) for start, buf in runs])
+    fd = os.open(wal, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        _pwrite(fd, WAL_MAGIC + struct.pack('<Q', len(payload)) + payload + hashlib.sha1(payload).digest(), 0)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    _fsync_dir(wal.parent)
+    return wal
+
+
+# Re-apply a complete write-ahead log left by an interrupted commit; True if one was replayed.
+def replay_wal(path):
+    """
+    A log that is cut short or fails its checksum was never followed by ROM
+    writes (they start after its fsync), so it is discarded.
+    """
+    wal = Path(f'{path}.wal')
+    try:
+        data = wal.read_bytes()
+    except FileNotFoundError:
+        return False
+    head = len(WAL_MAGIC) + 8
+    runs = None
+    if data.startswith(WAL_MAGIC) and len(data) >= head:
+        (length,) = struct.unpack('<Q', data[len(WAL_MAGIC):head])
+        payload, digest = data[head:head + length], data[head + length:]
+        if len(payload) == length and hashlib.sha1(payload).digest() == digest:
+            runs = marshal.loads(payload)
+    if runs:
+        fd = os.open(path, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+        try:
+            for start, buf in runs:
+                _pwrite(fd, buf, start)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    os.unlink(wal)
+    return bool(runs)
+
+
+# Make a new directory entry durable (POSIX); Windows has no directory handles to sync.
+def _fsync_dir(path):
+    if sys.platform == 'win32':
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+# Positioned write of the whole buffer; Windows has no os.pwrite, so seek + write there.
+def _pwrite(fd, data, offset):
+    view = memoryview(data)
+    while view:
+        if hasattr(os, 'pwrite'):
+            n = os.pwrite(fd, view, offset)
+        else:
+            os.lseek(fd, offset, os.SEEK_SET)
+            n = os.write(fd, view)
+        view = view[n:]
+        offset += n
+
+
+# on-disk index layout version; marshal's own version is part of it
+INDEX_FORMAT = (2, marshal.version)
+# [start, end) of the record tables (shops/trainers up to the loot tables and shop stock)
+TABLE_REGION = (0x1FC0000, 0x1FD6000)
+
+
+# Per-user cache directory (AIDYN_CACHE_DIR overrides the platform default).
+def user_cache_dir():
+    override = os.environ.get('AIDYN_CACHE_DIR')
+    if override:
+        return Path(override)
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local'
+    elif sys.platform == 'darwin':
+        base = Path.home() / 'Library' / 'Caches'
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'AidynEditor'
+
+
+# Sort and merge [start, end) spans into parallel start/end lists for bisect lookups.
+def _merge_ranges(ranges):
+    starts, ends = [], []
+    for start, end in sorted(ranges):
+        if ends and start <= ends[-1]:
+            ends[-1] = max(ends[-1], end)
+        else:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+
+# open ROM sessions keyed by resolved path
+_ROM_SESSIONS = {}
+
+
+# Return the shared RomImage for a path, mapping the file on first use.
+def open_rom(filename):
+    """
+    Look up (or create) the session RomImage for `filename`.
+    Accepts a RomImage and returns it unchanged, so helpers take either.
+    """
+    if isinstance(filename, RomImage):
+        return filename
+    key = str(Path(filename).resolve())
+    rom = _ROM_SESSIONS.get(key)
+    if rom is None:
+        rom = _ROM_SESSIONS[key] = RomImage(key)
+    return rom
+
+
+# Close every mapped ROM (e.g. before switching to a different file).
+def close_roms():
+    sessions = list(_ROM_SESSIONS.values())
+    _ROM_SESSIONS.clear()   # open_rom() maps afresh even if a close below fails
+    for rom in sessions:
+        rom.close()
+
+
+# codecs.py
+# --- RecordCodec: Declarative record layout compiled into one struct.Struct.
+class RecordCodec:
+    """
+    Decode/encode one fixed-size record from a list of (name, kind[, count]) fields.
+
+    Kinds:
+      'u8'    unsigned byte
+      's8'    signed byte (-5 is stored as 251)
+      'u16le' 16-bit value, low byte first (item values, gold)
+      'n4'    byte whose low nibble is the value (aspect, weapon type, spell targets)
+      'code'  2-byte big-endian item/spell id, as upper-case hex ('0707')
+      'raw'   `count` bytes kept as-is
+    Names starting with '_' are bytes nobody has mapped yet; encode() copies them
+    from the current record so a save never disturbs them.
+    """
+    KINDS = {'u8': 'B', 's8': 'b', 'u16le': 'H', 'n4': 'B', 'code': '2s'}
+    # NumPy equivalents for table views; codes stay integers there, nibbles stay whole bytes
+    NUMPY_KINDS = {'u8': 'u1', 's8': 'i1', 'u16le': '<u2', 'n4': 'u1', 'code': '>u2'}
+
+    def __init__(self, layout):
+        self.layout = list(layout)
+        self.fields = []       # (name, kind, values in the struct tuple, is a list)
+        self.offsets = {}
+        fmt = '<'
+        for field in self.layout:
+            name, kind = field[0], field[1]
+            count = field[2] if len(field) > 2 else 1
+            self.offsets[name] = struct.calcsize(fmt)
+            if kind == 'raw':
+                fmt += f'{count}s'
+                self.fields.append((name, kind, 1, False))
+            else:
+                fmt += self.KINDS[kind] * count
+                self.fields.append((name, kind, count, count > 1))
+        self.struct = struct.Struct(fmt)
+        self.size = self.struct.size
+
+    # Byte offset of a field inside the record.
+    def offset(self, name):
+        return self.offsets[name]
+
+    # Unpack the record at the start of `data` into {name: value}.
+    def decode(self, data):
+        raw = self.struct.unpack_from(data)
+        rec = {}
+        i = 0
+        for name, kind, width, many in self.fields:
+            vals = raw[i:i + width]
+            i += width
+            if kind == 'code':
+                vals = [v.hex().upper() for v in vals]
+            elif kind == 'n4':
+                vals = [v & 0x0F for v in vals]
+            rec[name] = list(vals) if many else vals[0]
+        return rec
+
+    # Pack `values` into record bytes; fields left out are taken from `current`.
+    def encode(self, values, current=None):
+        rec = self.decode(current) if current is not None else {}
+        rec.update(values)
+        args = []
+        for name, kind, width, many in self.fields:
+            vals = rec[name] if many else [rec[name]]
+            if kind == 'code':
+                vals = [bytes.fromhex(v) for v in vals]
+            args.extend(vals)
+        try:
+            return self.struct.pack(*args)
+        except struct.error as e:
+            # out-of-range numbers surface like any other bad input
+            raise ValueError(str(e)) from e
+
+    # (name, format, offset) triples for a NumPy dtype, shifted by `base` bytes.
+    def numpy_fields(self, base=0):
+        out = []
+        for field in self.layout:
+            name, kind = field[0], field[1]
+            count = field[2] if len(field) > 2 else 1
+            if kind == 'raw':
+                fmt = f'V{count}'
+            elif count > 1:
+                fmt = (self.NUMPY_KINDS[kind], (count,))
+            else:
+                fmt = self.NUMPY_KINDS[kind]
+            out.append((name, fmt, base + self.offsets[name]))
+        return out
+
+
+# record layouts; offsets start at each editor's data_seek
+# party characters; trainers teach from the skill/spell/shield fields of the same record
+CHARACTER_CODEC = RecordCodec([
+    ('aspect', 'u8'), ('_unknown1', 'raw', 2),
+    ('skills', 'u8', 23), ('attributes', 'u8', 6),
+    ('_unknown2', 'raw', 1), ('level', 'u8'), ('_unknown3', 'raw', 1),
+    ('weapons', 'code', 3), ('_unknown4', 'raw', 2),
+    ('spells', 'code', 5), ('school', 'u8'), ('spell_levels', 'u8', 5),
+    ('_unknown5', 'raw', 9),
+    ('armor', 'code'), ('protection', 'u8'), ('shield', 'code'), ('shield_skill', 'u8'),
+    ('resist1', 'u8'), ('resist1_amount', 'u8'), ('resist2', 'u8'), ('resist2_amount', 'u8'),
+])
+
+# enemies: a character record plus experience and drop category
+ENEMY_CODEC = RecordCodec(CHARACTER_CODEC.layout + [
+    ('_unknown6', 'raw', 12), ('exp', 'u8'), ('loot', 'u8'),
+])
+
+# loot tables: gold range, drop chances, then six item slots (only the first two have counts)
+LOOT_CODEC = RecordCodec([
+    ('gold_min', 'u16le'), ('gold_max', 'u16le'),
+    ('armor_chance', 'u8'), ('shield_chance', 'u8'),
+    ('weapon1_chance', 'u8'), ('weapon2_chance', 'u8'), ('weapon3_chance', 'u8'),
+    ('reagent_chance', 'u8'), ('reagent_min', 'u8'), ('reagent_max', 'u8'),
+    *[f for i in (1, 2) for f in ((f'item{i}', 'code'), (f'item{i}_chance', 'u8'),
+                                  (f'item{i}_min', 'u8'), (f'item{i}_max', 'u8'))],
+    *[f for i in (3, 4, 5, 6) for f in ((f'item{i}', 'code'), (f'item{i}_chance', 'u8'))],
+])
+
+ACCESSORY_CODEC = RecordCodec([
+    ('damage', 'u8'), ('protection', 'u8'), ('str_required', 'u8'), ('int_required', 'u8'),
+    ('value', 'u16le'), ('aspect', 'n4'),
+    ('attribute', 'u8'), ('attribute_amount', 's8'), ('skill', 'u8'), ('skill_amount', 's8'),
+    ('spell', 'code'), ('spell_level', 'u8'), ('_unknown1', 'raw', 1),
+    ('magic', 'code'), ('magic_level', 'u8'),
+    ('resist', 'u8'), ('resist_amount', 'u8'),
+])
+
+# armor and shields share one layout
+ARMOR_CODEC = RecordCodec([
+    ('defense', 'u8'), ('protection', 'u8'), ('dexterity', 's8'), ('_unknown1', 'raw', 1),
+    ('stealth', 's8'), ('value', 'u16le'), ('_unknown2', 'raw', 1), ('aspect', 'n4'),
+    ('attribute', 'u8'), ('attribute_amount', 's8'), ('skill', 'u8'), ('skill_amount', 's8'),
+    ('spell', 'code'), ('spell_level', 'u8'), ('_unknown3', 'raw', 1),
+    ('magic', 'code'), ('magic_level', 'u8'),
+    ('resist', 'u8'), ('resist_amount', 'u8'),
+])
+
+WEAPON_CODEC = RecordCodec([
+    ('weapon_type', 'n4'), ('str_required', 'u8'), ('hit', 'u8'), ('damage', 'u8'),
+    ('value', 'u16le'), ('_unknown1', 'raw', 1), ('range', 'u8'),
+    ('animation', 'u8'), ('_unknown2', 'raw', 1), ('damage_type', 'u8'), ('aspect', 'n4'),
+    ('attribute', 'u8'), ('attribute_amount', 's8'), ('skill', 'u8'), ('skill_amount', 's8'),
+    ('spell', 'code'), ('spell_level', 'u8'), ('_unknown3', 'raw', 1),
+    ('magic', 'code'), ('magic_level', 'u8'),
+    ('resist', 'u8'), ('resist_amount', 'u8'),
+])
+
+WAND_CODEC = RecordCodec([
+    ('damage', 'u8'), ('protection', 'u8'), ('str_required', 'u8'), ('int_required', 'u8'),
+    ('value', 'u16le'), ('aspect', 'n4'), ('skill', 'u8'), ('skill_amount', 's8'),
+    ('_unknown1', 'raw', 2), ('spell', 'code'), ('charges', 'u8'), ('spell_level', 'u8'),
+    ('_unknown2', 'raw', 3), ('resist', 'u8'), ('resist_amount', 'u8'),
+])
+
+# scrolls use the wand layout but only value, spell and cast level mean anything
+SCROLL_CODEC = RecordCodec([
+    ('_unknown1', 'raw', 4), ('value', 'u16le'), ('_unknown2', 'raw', 5),
+    ('spell', 'code'), ('_unknown3', 'raw', 1), ('cast_level', 'u8'), ('_unknown4', 'raw', 5),
+])
+
+SPELL_CODEC = RecordCodec([
+    ('school', 'u8'), ('damage', 'u8'), ('stamina', 'u8'),
+    ('target_num', 'n4'), ('target_type', 'n4'), ('_unknown1', 'raw', 1),
+    ('wizard', 'u8'), ('aspect', 'n4'), ('range', 'u8'), ('ingredient', 'n4'), ('exp', 'u8'),
+])
+
+# shop inventory: 20 slots with 3 trailing bytes each, then 3 bare slots
+SHOP_CODEC = RecordCodec([
+    *[f for i in range(20) for f in ((f'item{i}', 'code'), (f'_slot{i}', 'raw', 3))],
+    *[(f'item{i}', 'code') for i in range(20, 23)],
+])
+
+
+# tables.py
+# --- TableSpec: Where one record table lives and how its records are laid out.
+class TableSpec:
+    """
+    A table is a list of record addresses; each record is a fixed-length name
+    at the address and a codec-described block `data_seek` bytes later.
+    """
+    def __init__(self, addresses, name_length, data_seek, codec):
+        self.addresses = list(addresses)
+        self.name_length = name_length
+        self.data_seek = data_seek
+        self.codec = codec
+        self.itemsize = data_seek + codec.size
+
+    # Structured dtype for one record: 'name' plus every codec field at its ROM offset.
+    def dtype(self):
+        if np is None:
+            raise RuntimeError("NumPy is required for table views (pip install numpy)")
+        fields = [('name', f'S{self.name_length}', 0)] + self.codec.numpy_fields(self.data_seek)
+        names, formats, offsets = zip(*fields)
+        return np.dtype({'names': list(names), 'formats': list(formats),
+                         'offsets': list(offsets), 'itemsize': self.itemsize})
+
+
+# Raw (records, itemsize) byte matrix for a table, gathered with one fancy index.
+def _gather(rom, spec):
+    buf = np.frombuffer(rom.read(0, len(rom)), dtype=np.uint8)
+    index = np.asarray(spec.addresses, dtype=np.int64)[:, None] + np.arange(spec.itemsize)
+    rows = buf[index]
+    del buf
+    return rows
+
+
+# Return every record of a table as one NumPy structured array.
+def read_table(filename, table):
+    """
+    `table` is a TABLES key ('enemy', 'weapon', ...) or a TableSpec.
+    Fields mirror the codec names; item/spell codes are integers (f'{code:04X}'
+    gives the editor's hex form) and 'n4' fields are whole bytes (mask with 0x0F).
+    The array is a copy: edit it, then hand it to write_table().
+    """
+    spec = TABLES[table] if isinstance(table, str) else table
+    dtype = spec.dtype()
+    return _gather(open_rom(filename), spec).view(dtype)[:, 0]
+
+
+# Stage the bytes that differ between `records` and the ROM, then commit once.
+def write_table(filename, table, records):
+    """
+    Scatter an edited read_table() array back into the ROM.
+    Only changed byte spans are written, so neighbouring records that share
+    bytes with a row are never overwritten with stale data.
+    Returns the number of records that changed.
+    """
+    spec = TABLES[table] if isinstance(table, str) else table
+    rom = open_rom(filename)
+    records = np.ascontiguousarray(records, dtype=spec.dtype())
+    if len(records) != len(spec.addresses):
+        raise ValueError(f"expected {len(spec.addresses)} records, got {len(records)}")
+    new = records.view(np.uint8).reshape(len(records), spec.itemsize)
+    changed = new != _gather(rom, spec)
+    rows = np.flatnonzero(changed.any(axis=1))
+    for row in rows:
+        cols = np.flatnonzero(changed[row])
+        lo, hi = int(cols[0]), int(cols[-1]) + 1
+        rom.stage(spec.addresses[row] + lo, new[row, lo:hi].tobytes())
+    rom.commit()
+    return len(rows)
+
+
+# Yield one dict per record: table, index, address, name, then every codec field.
+def iter_records(filename, table, spec=None):
+    """
+    Stream a table in ROM-list order without materializing it.
+    'shop' walks SHOP_ITEMS (trainers in NOT_SHOPS have no inventory);
+    every other name is a TABLES key, whose layout `spec` can replace
+    (e.g. a synth_tables() table).
+    """
+    rom = open_rom(filename)
+    if table == 'shop':
+        for index, (name, address) in enumerate(zip(get_shop_names(rom), SHOP_ITEMS)):
+            if name not in NOT_SHOPS:
+                yield {'table': table, 'index': index, 'address': f'{address:#010x}', 'name': name,
+                       **SHOP_CODEC.decode(rom.read(address, SHOP_CODEC.size))}
+        return
+    spec = spec or TABLES[table]
+    for index, address in enumerate(spec.addresses):
+        yield {'table': table, 'index': index, 'address': f'{address:#010x}',
+               'name': rom.text(address, spec.name_length).rstrip('\x00'),
+               **spec.codec.decode(rom.read(address + spec.data_seek, spec.codec.size))}
+
+
 # functions.py
 # Read a sequence of fixed-length names from the ROM and return a Python list.
 def build_lst(filename, addresses, name_length):
     """Build a list of decoded strings read from `filename` at each address in `addresses`."""
-    lst = []
-    with open(filename, 'rb') as f:
-        for a in addresses:
-            f.seek(a)
-            lst.append(f.read(name_length).decode("utf-8").rstrip('\x00'))
-    return lst
+    rom = open_rom(filename)
+    return [rom.text(a, name_length).rstrip('\x00') for a in addresses]
 
 
 # Build an ID→name mapping for minor tables (e.g., spells). Injects '0000'→'NONE'.
 def get_minor_dic(filename, dic, name_length):
     """
     Create an ID/Name dictionary using ROM addresses as keys.
+    Cached per ROM until one of the names changes; callers get their own copy.
 
     Returns: {'0000': 'NONE', <hex_code>: <name>, ...}
     """
-    name = []
-    code = []
-    with open(filename, 'rb') as f:
-        for a in dic.keys():
-            f.seek(a)
-            name.append(f.read(name_length).decode("utf-8").rstrip('\x00'))
-        for b in dic.values():
-            code.append(b)
+    rom = open_rom(filename)
+
+    def build():
+        name = [rom.text(a, name_length).rstrip('\x00') for a in dic.keys()]
+        code = list(dic.values())
         name, code = (list(t) for t in zip(*sorted(zip(name, code))))
-    return {**{'0000': 'NONE'}, **dict(zip(code, name))}
+        return {**{'0000': 'NONE'}, **dict(zip(code, name))}
+
+    return dict(rom.cached(('minor', tuple(dic.items()), name_length),
+                           [(a, a + name_length) for a in dic], build))
 
 
 # Build an ID→'(type) name' dict for items; handles potion endian quirk.
@@ -2530,11 +2888,14 @@ def get_major_item_dic(filename):
     """
     Build an ID/Name dictionary for items with a (type) prefix.
     Potions are handled via INV_POTIONS because their id/type bytes are stored in reversed order.
+    Cached per ROM until an item name changes; callers get their own copy.
     """
-    lst = []
-    val = []
+    rom = open_rom(filename)
+
+    def build():
+        lst = []
+        val = []
 
-    with open(filename, 'rb') as f:
         for code in ITEM_DIC.values():
             suffix = code[2:]           # last 2 hex chars = type
             addr = inv_ITEM_DIC.get(code)
@@ -2565,43 +2926,216 @@ def get_major_item_dic(filename):
             elif suffix == '13': label = '(amulet)'
 
             if label:
-                f.seek(addr)
-                word = f.read(18).decode("utf-8").rstrip('\x00')
+                word = rom.text(addr, 18).rstrip('\x00')
                 lst.append(f"{label} {word}")
                 val.append(code)
 
-    lst, val = (list(t) for t in zip(*sorted(zip(lst, val))))
-    return {**{'0000': 'NONE'}, **dict(zip(val, lst))}
+        lst, val = (list(t) for t in zip(*sorted(zip(lst, val))))
+        return {**{'0000': 'NONE'}, **dict(zip(val, lst))}
+
+    return dict(rom.cached(('items',), item_name_ranges(), build))
+
+
+# [start, end) spans of the item names in ROM order.
+def item_name_ranges():
+    """
+    Potions are left out: their ITEM_DIC keys are placeholder addresses over
+    the header (CRC words included) and their names come from POTIONS.
+    """
+    return [(a, a + 18) for a, code in ITEM_DIC.items() if code[2:] != '10']
+
+
+# Return the armor, shield and weapon menu lists ('NONE' first, type prefix removed).
+def get_equipment_lists(filename):
+    """Return (armor_lst, shield_lst, weapon_lst), cached alongside the item dictionary."""
+    rom = open_rom(filename)
+
+    def build():
+        items = get_major_item_dic(rom).values()
+        return tuple(['NONE'] + [item[len(prefix):] for item in items if item.startswith(prefix)]
+                     for prefix in ('(armor) ', '(shield) ', '(weapon) '))
+
+    lists = rom.cached(('equipment',), item_name_ranges(), build)
+    return tuple(list(t) for t in lists)
+
+
+# Overwrite lookup dicts and lists in place, so the Pickers and closures holding them see the new names.
+def refill_lookups(*pairs):
+    for target, source in pairs:
+        if isinstance(target, dict):
+            target.clear()
+            target.update(source)
+        else:
+            target[:] = source
+
+
+# Build everything an editor window looks up off the Tk thread; returns the function that installs it.
+def prefetch_lookups(filename, *name_tables):
+    """
+    Meant for a worker thread, so nothing shared is changed here: the item and
+    spell dictionaries, the equipment menus and their picker indexes, plus the
+    NameList of each (addresses, name_length) in `name_tables`, are built on
+    the side. The returned function, called on the Tk thread, installs them
+    into the session caches and observers, or drops them if the ROM was
+    written meanwhile (the editor then reads its lookups afresh).
+    """
+    rom = open_rom(filename)
+
+    def build():
+        items = get_major_item_dic(rom)
+        spells = get_minor_dic(rom, SPELL_DIC, 22)
+        indexes = {}
+        for names in (*get_equipment_lists(rom), items.values(), {v: k for k, v in items.items()},
+                      {v: k for k, v in spells.items()}):
+            key = tuple(names)
+            if key not in _NAME_INDEXES:
+                indexes[key] = NameIndex(key)
+        lists = [NameList(rom, addresses, name_length) for addresses, name_length in name_tables
+                 if _live_name_list(rom, _names_key(addresses, name_length)) is None]
+        return indexes, lists
+
+    generation, built, (indexes, lists) = rom.prefetch(build)
+
+    def install():
+        if not rom.adopt(generation, built):
+            return
+        for key, index in indexes.items():
+            _keep_index(key, index)
+        for names in lists:
+            if _live_name_list(rom, names.key) is None:
+                rom.observers.append(names)
+
+    return install
 
 
 # Return parallel lists of names, codes, and addresses for loot tables (sorted by name).
 def get_major_loot_lists(filename, addresses, name_length):
     """Return parallel lists of (names, codes, addresses) for loot drop tables."""
-    name = []
-    code = []
-    address = []
-    with open(filename, 'rb') as f:
-        for a in addresses:
-            f.seek(a)
-            name.append(f.read(name_length).decode("utf-8").rstrip('\x00'))
-            code.append(addresses.get(a))
-            address.append(a)
-    name, code, address = (list(t) for t in zip(*sorted(zip(name, code, address))))
-    return name, code, address
+    rom = open_rom(filename)
+
+    def build():
+        name = [rom.text(a, name_length).rstrip('\x00') for a in addresses]
+        code = list(addresses.values())
+        address = list(addresses)
+        return tuple(list(t) for t in zip(*sorted(zip(name, code, address))))
+
+    lists = rom.cached(('loot', tuple(addresses.items()), name_length),
+                       [(a, a + name_length) for a in addresses], build)
+    return tuple(list(t) for t in lists)
 
 
 # Return parallel lists of (name, address) for a set of records (sorted by name).
 def get_major_name_lists(filename, addresses, name_length):
     """Return parallel lists of (names, addresses), sorted by name."""
-    name = []
-    address = []
-    with open(filename, 'rb') as f:
+    rom = open_rom(filename)
+
+    def build():
+        name = [rom.text(a, name_length).rstrip('\x00') for a in addresses]
+        address = list(addresses)
+        return tuple(list(t) for t in zip(*sorted(zip(name, address))))
+
+    lists = rom.cached(('names', tuple(addresses), name_length),
+                       [(a, a + name_length) for a in addresses], build)
+    return tuple(list(t) for t in lists)
+
+
+# --- NameList: Sorted record names kept current by commits and pushed to the Comboboxes showing them.
+class NameList:
+    """
+    The live counterpart of get_major_name_lists()/get_major_loot_lists():
+    `names`, `addresses` (and `codes` for loot tables) are parallel lists
+    sorted the same way. As a RomImage observer it re-reads only the names
+    inside a commit's changed spans, moves each renamed entry with a bisect
+    remove/insert, and then sets the values of every subscribed Combobox.
+    The lists are updated in place, so editors can hold on to them.
+    """
+    def __init__(self, rom, addresses, name_length):
+        self.rom = rom
+        self.name_length = name_length
+        codes = addresses if isinstance(addresses, dict) else None
+        self.key = _names_key(addresses, name_length)
+        self._entry = {}        # address -> its sort tuple: (name, address) or (name, code, address)
         for a in addresses:
-            f.seek(a)
-            name.append(f.read(name_length).decode("utf-8").rstrip('\x00'))
-            address.append(a)
-    name, address = (list(t) for t in zip(*sorted(zip(name, address))))
-    return name, address
+            name = rom.text(a, name_length).rstrip('\x00')
+            self._entry[a] = (name, codes[a], a) if codes else (name, a)
+        # one entry per listed address; a few tables list the same record twice
+        self.entries = sorted(self._entry[a] for a in addresses)
+        self._copies = {a: list(addresses).count(a) for a in self._entry}
+        self.names = [e[0] for e in self.entries]
+        self.addresses = [e[-1] for e in self.entries]
+        self.codes = [e[1] for e in self.entries] if codes else None
+        self._columns = [(self.names, 0), (self.addresses, -1)] + ([(self.codes, 1)] if codes else [])
+        self._starts = sorted(self._entry)
+        self.widgets = []
+
+    # Observer hook: re-read the names overlapping the changed spans; publish if any moved.
+    def __call__(self, spans):
+        moved = False
+        for start, end in spans:
+            lo = bisect_right(self._starts, start - self.name_length)
+            for address in self._starts[lo:bisect_left(self._starts, end)]:
+                moved |= self._rename(address)
+        if moved:
+            self.publish()
+
+    def _rename(self, address):
+        old = self._entry[address]
+        name = self.rom.text(address, self.name_length).rstrip('\x00')
+        if name == old[0]:
+            return False
+        new = self._entry[address] = (name,) + old[1:]
+        copies = self._copies[address]
+        i = bisect_left(self.entries, old)
+        del self.entries[i:i + copies]
+        for column, _ in self._columns:
+            del column[i:i + copies]
+        i = bisect_left(self.entries, new)
+        self.entries[i:i] = [new] * copies
+        for column, field in self._columns:
+            column[i:i] = [new[field]] * copies
+        return True
+
+    # Keep `widget`'s dropdown values equal to `names`.
+    def subscribe(self, widget):
+        widget['values'] = self.names
+        self.widgets.append(widget)
+
+    def publish(self):
+        for widget in list(self.widgets):
+            try:
+                if widget.winfo_exists():
+                    widget['values'] = self.names
+                    continue
+            except tk.TclError:
+                pass
+            self.widgets.remove(widget)      # window (or the whole app) is gone
+
+
+def _names_key(addresses, name_length):
+    return tuple(addresses.items()) if isinstance(addresses, dict) else tuple(addresses), name_length
+
+
+def _live_name_list(rom, key):
+    for observer in list(rom.observers):
+        if isinstance(observer, NameList) and observer.key == key:
+            return observer
+    return None
+
+
+# The session's NameList for a table of names, built on first use.
+def name_list(filename, addresses, name_length):
+    rom = open_rom(filename)
+    names = _live_name_list(rom, _names_key(addresses, name_length))
+    if names is None:
+        names = NameList(rom, addresses, name_length)
+        rom.observers.append(names)
+    return names
+
+
+# Shop/trainer names in SHOP_* order: Becan (named from the ROM) first, then SHOPS.
+def get_shop_names(filename):
+    rom = open_rom(filename)
+    return ["Erromon : " + rom.text(BECAN_ADDRESS, 9).rstrip("\x00")] + SHOPS
 
 
 # Best-effort cast of GUI strings to int (supports decimal and hex); blanks → 0.
@@ -2620,64 +3154,67 @@ def int_cast(val):
         return 0
 
 
-# Tk helper: limit text to the ROM’s fixed-length field.
-def limit_name_size(name, name_length, *args):
-    """Tk variable helper: trim text to `name_length` characters."""
-    n = name.get()
-    if len(n) > name_length:
-        name.set(n[:name_length])
+# Entry text clamped to [0, top]: non-digits dropped; blank stays blank (e.g. "cannot learn").
+def clamp_digits(text, top):
+    digits = ''.join(filter(str.isdecimal, text))
+    return digits and str(min(int(digits), top))
 
 
-# Tk helper: clamp numeric string to [0, max]; strips non-digits, normalizes '00'→'0'.
-def limit(i, x, *args):
-    """
-    Tk variable helper: constrain numeric value to [0, x].
-    - Strips non-digits
-    - Converts '00' to '0'
-    """
-    if i.get() == '00':
-        i.set('0')
-    if not i.get().isnumeric():
-        val = ''.join(filter(str.isnumeric, i.get()))
-        i.set(val)
-    elif i.get().isnumeric():
-        if int(i.get()) > x:
-            i.set(x)
-        else:
-            i.set(i.get())
+# Entry text clamped to a signed byte [-128, 127] (or [-top - 1, top]); a leading '-' is kept.
+def clamp_signed(text, top=127):
+    digits = ''.join(filter(str.isdecimal, text))
+    if not digits:
+        return '0' if text.startswith('-') else ''
+    if text.startswith('-'):
+        return str(-min(int(digits), top + 1))
+    return str(min(int(digits), top))
+
+
+# Entry text cut to the ROM's fixed-length name field.
+def clip_name(text, name_length):
+    return text[:name_length]
 
 
-# Tk helper: clamp to signed byte [-128, 127]; keeps a leading '-'.
-def limit_127(i, *args):
+# --- FieldGuards: Bounds of a window's Entry fields, applied on focus-out and before each save.
+class FieldGuards:
     """
-    Tk variable helper: constrain value to a signed byte range [-128, 127].
-    Accepts leading '-'. Strips non-digits.
+    Replaces per-variable write traces: typing and loading a record run no
+    validation at all. A field is normalized when it loses focus, and
+    check() normalizes every field in one pass at the start of a save.
+    Only fields whose text actually changes are set.
     """
-    if i.get() == '00':
-        i.set('0')
-    val = i.get()
-    if len(val) > 0 and val[0] == '-':
-        if val == '-':
+    def __init__(self, win):
+        self.fields = {}        # Tk variable name -> (variable, normalizer, bound)
+        win.bind('<FocusOut>', self.on_focus_out, add='+')
+
+    def limit(self, var, top):
+        self.fields[str(var)] = (var, clamp_digits, top)
+
+    def limit_127(self, var):
+        self.fields[str(var)] = (var, clamp_signed, 127)
+
+    def name(self, var, name_length):
+        self.fields[str(var)] = (var, clip_name, name_length)
+
+    # FocusOut reaches the Toplevel binding from every child; normalize just the field that was left.
+    def on_focus_out(self, event):
+        try:
+            field = self.fields.get(str(event.widget.cget('textvariable')))
+        except (AttributeError, tk.TclError):
             return
-        else:
-            val = val[1:]
-        if not val.isnumeric():
-            val = ''.join(filter(str.isnumeric, val))
-            i.set(int(val) * -1)
-        elif val.isnumeric():
-            if int(val) > 127:
-                i.set('-128')
-            else:
-                i.set(int(val) * -1)
-    else:
-        if not val.isnumeric():
-            val = ''.join(filter(str.isnumeric, val))
-            i.set(val)
-        elif val.isnumeric():
-            if int(val) > 127:
-                i.set(127)
-            else:
-                i.set(val)
+        if field is not None:
+            self.apply([field])
+
+    def check(self):
+        self.apply(self.fields.values())
+
+    @staticmethod
+    def apply(fields):
+        for var, normalize, bound in fields:
+            text = var.get()
+            fixed = normalize(text, bound)
+            if fixed != text:
+                var.set(fixed)
 
 # views/notifications.py
 # Tiny anchored toast near the triggering widget; used after saves/backups.
@@ -2719,7 +3256,7 @@ def choose_rom(parent: tk.Tk) -> Path | None:
         parent=parent,
         initialdir=str(Path.cwd()),
         title="Select A File",
-        filetypes=[("z64", "*.z64")]
+        filetypes=[("N64 ROM", "*.z64 *.v64 *.n64")]
     )
     if not f:
         return None
@@ -2727,8 +3264,8 @@ def choose_rom(parent: tk.Tk) -> Path | None:
     if not p.exists() or not p.is_file():
         messagebox.showerror(APP_TITLE, "File not found or not a regular file.")
         return None
-    if p.suffix.lower() != ".z64":
-        messagebox.showerror(APP_TITLE, "Only .z64 files are supported.")
+    if p.suffix.lower() not in (".z64", ".v64", ".n64"):
+        messagebox.showerror(APP_TITLE, "Only .z64, .v64 and .n64 files are supported.")
         return None
     if p.stat().st_size == 0:
         messagebox.showerror(APP_TITLE, "File is empty.")
@@ -2742,18 +3279,112 @@ def choose_rom(parent: tk.Tk) -> Path | None:
     return p
 
 
-# Create a sibling '(backup).z64' file next to the ROM; show error on failure.
-def make_backup(rom: Path) -> Path | None:
-    # create side-by-side backup file next to the selected ROM
-    target = rom.with_name(f"{rom.stem} (backup){rom.suffix}")
+# Where older versions put their single full copy of `rom`.
+def backup_path(rom: Path) -> Path:
+    return rom.with_name(f"{rom.stem} (backup){rom.suffix}")
+
+
+# Snapshot the ROM into its '(snapshots)' store; show error on failure.
+def make_backup(rom: Path) -> str | None:
+    # only chunks that changed since the last snapshot are written
     try:
-        shutil.copy2(rom, target)
-        return target
+        return SnapshotStore(rom).take()
     except OSError as e:
         messagebox.showerror(APP_TITLE, f"Backup failed:\n{e}")
         return None
 
 
+# --- EditorWindows: One instance per editor type; closing hides it, reopening reshows it.
+class EditorWindows:
+    """
+    An editor is hundreds of widgets and traced variables, so it is built on
+    first use and then only hidden and reshown (with its record re-read).
+    At most `keep` editors stay alive; opening another destroys the least
+    recently used hidden one. Visible windows are never torn down.
+    """
+    def __init__(self, keep=4):
+        self.keep = keep
+        self.editors = {}       # key -> editor, least recently used first
+        self.hidden = set()
+        self.loading = {}       # key -> placeholder window while its lookups load
+        self.pool = None
+
+    # Show the editor for `key`, building it with `factory()` if it is not alive.
+    def show(self, key, factory, preload=None):
+        """
+        With `preload`, a new editor is not built right away: see load().
+        Returns the editor, or None while it is still loading.
+        """
+        if key in self.loading and self.loading[key].winfo_exists():
+            self.loading[key].lift()
+            return None
+        editor = self.editors.pop(key, None)
+        if editor is not None and not editor.win.winfo_exists():
+            editor = None
+        if editor is None and preload is not None:
+            self.load(key, factory, preload)
+            return None
+        if editor is None:
+            editor = factory()
+            editor.win.protocol("WM_DELETE_WINDOW", partial(self.hide, key))
+        elif key in self.hidden:
+            editor.refresh()
+            editor.win.deiconify()
+        editor.win.lift()
+        editor.win.focus_force()
+        self.hidden.discard(key)
+        self.editors[key] = editor
+        self.trim()
+        return editor
+
+    # Placeholder window with a progress bar at once; `preload()` runs on a worker thread, polled via after().
+    def load(self, key, factory, preload):
+        """
+        `preload()` must leave shared state alone and return a function that
+        installs what it loaded; poll() calls that here on the Tk thread.
+        """
+        win = self.loading[key] = Toplevel()
+        win.title(key)
+        win.resizable(False, False)
+        win.protocol("WM_DELETE_WINDOW", lambda: None)    # the editor replaces it shortly
+        Label(win, text=f"Loading {key}...").grid(column=0, row=0, padx=16, pady=(12, 4))
+        bar = Progressbar(win, mode='indeterminate', length=180)
+        bar.grid(column=0, row=1, padx=16, pady=(0, 12))
+        bar.start(15)
+        if self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='editor-load')
+        future = self.pool.submit(preload)
+
+        def poll():
+            if not future.done():
+                win.after(25, poll)
+                return
+            if self.loading.get(key) is win:
+                del self.loading[key]       # on every path, or later clicks would lift a dead window
+            if not win.winfo_exists():
+                return      # the launcher was rebuilt for another ROM meanwhile
+            bar.stop()
+            win.destroy()
+            if future.exception() is not None:
+                messagebox.showerror(APP_TITLE, f"Cannot load {key}:\n{future.exception()}")
+            else:
+                future.result()()           # install the lookups (Tk thread only)
+                self.show(key, factory)     # lookups are warm now, so this builds quickly
+
+        win.after(25, poll)
+
+    def hide(self, key):
+        self.editors[key].win.withdraw()
+        self.hidden.add(key)
+        self.trim()
+
+    # Destroy hidden editors, oldest first, until at most `keep` are alive.
+    def trim(self):
+        for key in [k for k in self.editors if k in self.hidden][:max(0, len(self.editors) - self.keep)]:
+            self.editors.pop(key).win.destroy()
+            self.hidden.discard(key)
+
+
 # Build the main launcher: logo + buttons that open each editor window.
 def launchers(root: tk.Tk, rom_path: Path) -> None:
     # main launcher UI (left: logo, right: section buttons)
@@ -2771,17 +3402,1680 @@ def launchers(root: tk.Tk, rom_path: Path) -> None:
     btn_w = 16
     add = lambda r, txt, cmd: Button(right, text=txt, width=btn_w, command=cmd).grid(column=0, row=r, pady=2, sticky="ew")
 
-    # route to editors (pass ROM filename)
+    # route to editors (pass ROM filename); one window per editor, reshown on later clicks
     filename = str(rom_path)
-    add(0, "Party", lambda: PartyEdit(filename, PARTY_ADDRESSES, 9, 78, 0))
-    add(1, "Enemy", lambda: EnemyEdit(filename, ENEMY_ADDRESSES, 17, 92, 1))
-    add(2, "Shop / Trainer", lambda: TrainerEdit(filename))
-    add(3, "Accessory", lambda: AccessoryEdit(filename, ACCESSORY_ADDRESSES, 24, 20, 20))
-    add(4, "Armor", lambda: ArmorShield(filename, ARMOR_ADDRESSES, 26, 25, 22, 5))
-    add(5, "Shield", lambda: ArmorShield(filename, SHIELD_ADDRESSES, 26, 25, 22, 6))
-    add(6, "Spell", lambda: SpellEdit(filename))
-    add(7, "Wand / Scroll", lambda: WandScrollEdit(filename))
-    add(8, "Weapon", lambda: WeaponEdit(filename, WEAPON_ADDRESSES, 23, 25, 21))
+    # the ROM lookups each editor needs are loaded off the Tk thread first (name tables listed per editor)
+    windows = EditorWindows()
+    editor = lambda r, txt, factory, *tables: add(
+        r, txt, lambda: windows.show(txt, factory, partial(prefetch_lookups, open_rom(filename), *tables)))
+    editor(0, "Party", lambda: PartyEdit(filename, PARTY_ADDRESSES, 9, 78, 0), (PARTY_ADDRESSES, 9))
+    editor(1, "Enemy", lambda: EnemyEdit(filename, ENEMY_ADDRESSES, 17, 92, 1), (ENEMY_ADDRESSES, 17), (DROP_CAT, 19))
+    editor(2, "Shop / Trainer", lambda: TrainerEdit(filename))
+    editor(3, "Accessory", lambda: AccessoryEdit(filename, ACCESSORY_ADDRESSES, 24, 20, 20), (ACCESSORY_ADDRESSES, 20))
+    editor(4, "Armor", lambda: ArmorShield(filename, ARMOR_ADDRESSES, 26, 25, 22, 5), (ARMOR_ADDRESSES, 22))
+    editor(5, "Shield", lambda: ArmorShield(filename, SHIELD_ADDRESSES, 26, 25, 22, 6), (SHIELD_ADDRESSES, 22))
+    editor(6, "Spell", lambda: SpellEdit(filename), (SPELL_ADDRESSES, 22))
+    editor(7, "Wand / Scroll", lambda: WandScrollEdit(filename), (SCROLL_ADDRESSES, 18), (WAND_ADDRESSES, 18))
+    editor(8, "Weapon", lambda: WeaponEdit(filename, WEAPON_ADDRESSES, 23, 25, 21), (WEAPON_ADDRESSES, 21))
+    add(9, "Save Patch", lambda: save_patch(root, rom_path))
+    add(10, "Restore Backup", lambda: restore_window(root, rom_path))
+    add(12, "Where Used", lambda: xref_window(root, rom_path))
+
+    # undo/redo any editor's saves (Ctrl+Z / Ctrl+Y anywhere in the app)
+    history = Frame(right)
+    history.grid(column=0, row=11, pady=2, sticky="ew")
+    undo_btn = Button(history, text="Undo", width=btn_w // 2 - 1)
+    undo_btn.grid(column=0, row=0, sticky="w")
+    redo_btn = Button(history, text="Redo", width=btn_w // 2 - 1)
+    redo_btn.grid(column=1, row=0, sticky="e")
+
+    def step(button, undo):
+        rom = open_rom(filename)
+        done = rom.undo() if undo else rom.redo()
+        if done:
+            flash_saved(button, "Undone" if undo else "Redone")
+        else:
+            flash_saved(button, "Nothing to undo" if undo else "Nothing to redo")
+
+    undo_btn.configure(command=lambda: step(undo_btn, True))
+    redo_btn.configure(command=lambda: step(redo_btn, False))
+    root.bind_all("<Control-z>", lambda e: step(undo_btn, True))
+    root.bind_all("<Control-y>", lambda e: step(redo_btn, False))
+
+
+# Pick an item or spell and list every shop, loot table, character and item that uses it.
+def xref_window(root: tk.Tk, rom_path: Path) -> None:
+    filename = str(rom_path)
+    labels = xref_labels(filename)
+    win = Toplevel(root)
+    win.title("Where Used")
+    win.resizable(False, False)
+    choice = Combobox(win, values=sorted(labels), state='readonly', width=36)
+    choice.grid(column=0, row=0, padx=8, pady=(8, 4), sticky="ew")
+    results = tk.Listbox(win, width=60, height=16)
+    results.grid(column=0, row=1, padx=8, pady=(0, 8))
+
+    def show(*args):
+        # re-queried on every pick, so saves made meanwhile are reflected
+        results.delete(0, tk.END)
+        uses = cross_reference(filename).uses(*labels[choice.get()])
+        for use in uses:
+            results.insert(tk.END, f"{use['kind']:<10} {use['name']}  ({use['field']})")
+        if not uses:
+            results.insert(tk.END, "not used anywhere")
+
+    choice.bind("<<ComboboxSelected>>", show)
+
+
+# Pick a snapshot and write it back over the ROM.
+def restore_window(root: tk.Tk, rom_path: Path) -> None:
+    store = SnapshotStore(rom_path)
+    snaps = store.snapshots()
+    if not snaps:
+        messagebox.showerror(APP_TITLE, "No snapshots yet; reopen the ROM with Backup on.")
+        return
+    win = Toplevel(root)
+    win.title("Restore Backup")
+    win.resizable(False, False)
+    labels = [m['created'].replace('T', ' ') for m in snaps]
+    choice = Combobox(win, values=labels, state='readonly', width=22)
+    choice.current(0)
+    choice.grid(column=0, row=0, padx=8, pady=8)
+
+    def restore():
+        label = labels[choice.current()]
+        if not messagebox.askyesno(APP_TITLE, f"Replace the ROM with the backup from {label}?\n"
+                                              "Reselect records in open editor windows afterwards.", parent=win):
+            return
+        try:
+            store.restore(snaps[choice.current()]['id'])
+        except (OSError, ValueError) as e:
+            messagebox.showerror(APP_TITLE, f"Restore failed:\n{e}", parent=win)
+            return
+        flash_saved(button, "Restored")
+
+    button = Button(win, text="Restore", width=12, command=restore)
+    button.grid(column=1, row=0, padx=(0, 8), pady=8)
+
+
+# Write the edits made since the last snapshot as a BPS/IPS patch chosen in a save dialog.
+def save_patch(root: tk.Tk, rom_path: Path) -> None:
+    store = SnapshotStore(rom_path)
+    legacy = backup_path(rom_path)
+    if not store.snapshots() and not legacy.is_file():
+        messagebox.showerror(APP_TITLE, "No backup to compare against; reopen the ROM with Backup on.")
+        return
+    f = filedialog.asksaveasfilename(
+        parent=root,
+        initialdir=str(rom_path.parent),
+        initialfile=f"{rom_path.stem}.bps",
+        title="Save Patch",
+        filetypes=[("BPS patch", "*.bps"), ("IPS patch", "*.ips")]
+    )
+    if not f:
+        return
+    fmt = 'ips' if f.lower().endswith('.ips') else 'bps'
+    try:
+        rom = open_rom(rom_path)
+        source = store.read() if store.snapshots() else legacy.read_bytes()
+        patch = make_patch(rom.file_order(source), rom.read(0, len(rom)), fmt)
+        Path(f).write_bytes(patch)
+    except (OSError, ValueError) as e:
+        messagebox.showerror(APP_TITLE, f"Patch failed:\n{e}")
+        return
+    messagebox.showinfo(APP_TITLE, f"Saved {len(patch):,} byte patch:\n{f}")
+
+
+# Item/spell/loot names of one ROM, both ways, for turning codes into labels and back.
+def _lookups(rom):
+    items = get_major_item_dic(rom)
+    spells = get_minor_dic(rom, SPELL_DIC, 22)
+    loot_names, loot_codes, _ = get_major_loot_lists(rom, DROP_CAT, 19)
+    return {'items': items, 'inv_items': {v: k for k, v in items.items()},
+            'spells': spells, 'inv_spells': {v: k for k, v in spells.items()},
+            'loot': dict(zip(loot_names, loot_codes))}
+
+
+# Indices of the records whose bytes differ between two ROMs: one array compare per table.
+def _changed_rows(a, b, spec):
+    if np is not None:
+        return np.flatnonzero((_gather(a, spec) != _gather(b, spec)).any(axis=1)).tolist()
+    size = spec.itemsize
+    return [i for i, address in enumerate(spec.addresses) if a.read(address, size) != b.read(address, size)]
+
+
+# Yield one dict per changed field between two ROMs: table, index, address, name, field, label, old, new.
+def diff_roms(old, new, tables=None):
+    """
+    Every table is compared as a (records, bytes) matrix, so only records that
+    actually changed are decoded. List fields are split per element
+    ('attributes.4', labelled 'Strength'); old/new are display values, with item,
+    spell and loot codes and combobox fields shown by name.
+    Bytes outside the known tables are not reported.
+    """
+    a, b = open_rom(old), open_rom(new)
+    if len(a) != len(b):
+        raise ValueError(f"ROM sizes differ ({len(a)} vs {len(b)} bytes)")
+    lookups = None
+    for table in tables or EXPORT_TABLES:
+        if table == 'shop':
+            names = get_shop_names(b)
+            index = [i for i, n in enumerate(names[:len(SHOP_ITEMS)]) if n not in NOT_SHOPS]
+            spec = TableSpec([SHOP_ITEMS[i] for i in index], 0, 0, SHOP_CODEC)
+        else:
+            spec = TABLES[table]
+            index = range(len(spec.addresses))
+        for row in _changed_rows(a, b, spec):
+            if lookups is None:
+                lookups = (_lookups(a), _lookups(b))
+            address = spec.addresses[row]
+            before = spec.codec.decode(a.read(address + spec.data_seek, spec.codec.size))
+            after = spec.codec.decode(b.read(address + spec.data_seek, spec.codec.size))
+            if spec.name_length:
+                before['name'] = a.text(address, spec.name_length).rstrip('\x00')
+                after['name'] = name = b.text(address, spec.name_length).rstrip('\x00')
+            else:
+                name = names[index[row]]
+            for field, old_value, new_value in _field_changes(before, after):
+                base, _, element = field.partition('.')
+                yield {'table': table, 'index': index[row], 'address': f'{address:#010x}', 'name': name,
+                       'field': field, 'label': _field_label(base, element),
+                       'old': _display_value(base, old_value, lookups[0]),
+                       'new': _display_value(base, new_value, lookups[1])}
+
+
+# (field, old, new) for each differing codec field, list fields per element.
+def _field_changes(before, after):
+    for field, old_value in before.items():
+        new_value = after[field]
+        if isinstance(old_value, list):
+            yield from ((f'{field}.{i}', x, y) for i, (x, y) in enumerate(zip(old_value, new_value)) if x != y)
+        elif old_value != new_value:
+            yield field, old_value, new_value
+
+
+# Readable name for a field or list element: skills and attributes by name, else 'weapons 2'.
+def _field_label(field, element):
+    if not element:
+        return field
+    if field == 'skills':
+        return SKILLS[int(element)]
+    if field == 'attributes':
+        return ATTRIBUTES[int(element)]
+    return f'{field} {int(element) + 1}'
+
+
+# Display form of one decoded value: names for codes and combobox fields, hex for raw bytes.
+def _display_value(field, value, lookups):
+    if isinstance(value, bytes):
+        return value.hex().upper()
+    if field == 'name':
+        return value
+    if isinstance(value, str):
+        dic = lookups['spells'] if field in ('spells', 'spell', 'magic') else lookups['items']
+        return dic.get(value, value)
+    choices = {v: k for k, v in lookups['loot'].items()} if field == 'loot' else FIELD_LABELS.get(field, {})
+    return choices.get(f'{value:02X}', value)
+
+
+# Index of one table for imports: address -> (name address, data address, codec, name length).
+def _import_targets(rom, table):
+    if table == 'shop':
+        names = [n for n in get_shop_names(rom) if n not in NOT_SHOPS]
+        addresses = [a for n, a in zip(get_shop_names(rom), SHOP_ITEMS) if n not in NOT_SHOPS]
+        records = {a: (None, a, SHOP_CODEC, 0) for a in addresses}
+    else:
+        spec = TABLES[table]
+        names = [rom.text(a, spec.name_length).rstrip('\x00') for a in spec.addresses]
+        addresses = spec.addresses
+        records = {a: (a, a + spec.data_seek, spec.codec, spec.name_length) for a in spec.addresses}
+    by_name = {}
+    for name, address in zip(names, addresses):
+        by_name.setdefault(name, []).append(address)
+    return records, by_name
+
+
+# Turn one cell into a field value; labels (combobox text, item/spell names) are resolved.
+def _import_value(field, kind, raw, lookups):
+    if kind == 'raw':
+        return bytes.fromhex(raw)
+    if kind == 'code':
+        dic = lookups['spells'] if field in ('spells', 'spell', 'magic') else lookups['items']
+        code = str(raw).strip()
+        if code.upper() in dic:
+            return code.upper()
+        inverse = lookups['inv_spells'] if dic is lookups['spells'] else lookups['inv_items']
+        if code not in inverse:
+            raise ValueError(f"{field}: unknown {'spell' if dic is lookups['spells'] else 'item'} {code!r}")
+        return inverse[code]
+    if isinstance(raw, str):
+        raw = raw.strip()
+        choices = lookups['loot'] if field == 'loot' else FIELD_CHOICES.get(field)
+        if choices and raw in choices:
+            return int(choices[raw], 16)
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field}: expected a number or a known label, got {raw!r}") from None
+
+
+# Validate and apply export-shaped rows (keyed by address or name) in one staged commit.
+def import_records(filename, rows, table=None, dry_run=False):
+    """
+    Each row names its table ('table' column or `table`) and its record ('address',
+    else a unique 'name'); other columns are codec fields, list elements as 'skills.3'.
+    Empty cells leave a field alone. Changed values are checked against FIELD_RULES
+    (the editors' FieldGuards bounds) and names against the field length.
+    Returns (records changed, fields changed, errors); if there are errors nothing is written.
+    """
+    rom = open_rom(filename)
+    lookups = _lookups(rom)
+    targets = {}
+    edits = {}      # (table, address) -> [current record, edited record, new name or None]
+    errors = []
+    fields_changed = 0
+
+    for line, row in enumerate(rows, 1):
+        try:
+            name = row.get('table') or table
+            if name not in EXPORT_TABLES:
+                raise ValueError(f"unknown table {name!r}")
+            if name not in targets:
+                targets[name] = _import_targets(rom, name)
+            records, by_name = targets[name]
+
+            if row.get('address') not in (None, ''):
+                address = int(str(row['address']), 0)
+                if address not in records:
+                    raise ValueError(f"no {name} record at {address:#x}")
+            elif row.get('name') in (None, ''):
+                raise ValueError("row has neither an address nor a name")
+            else:
+                matches = by_name.get(row.get('name'), [])
+                if len(matches) != 1:
+                    raise ValueError(f"{len(matches)} {name} records named {row.get('name')!r}")
+                address = matches[0]
+            name_address, data_address, codec, name_length = records[address]
+
+            if (name, address) not in edits:
+                current = codec.decode(rom.read(data_address, codec.size))
+                edits[name, address] = [current, {k: list(v) if isinstance(v, list) else v
+                                                  for k, v in current.items()}, None]
+            current, edited, _ = edits[name, address]
+            kinds = {f[0]: f[1] for f in codec.fields}
+            rules = FIELD_RULES.get(name, {})
+
+            for column, raw in row.items():
+                if raw in (None, '') or column in ('table', 'index', 'address'):
+                    continue
+                if column == 'name':
+                    if name_address is None:
+                        continue  # shop names come from SHOPS, not the ROM
+                    new_name = str(raw)
+                    if len(new_name.encode('utf-8')) > name_length:
+                        raise ValueError(f"name {new_name!r} is longer than {name_length} bytes")
+                    if new_name != rom.text(name_address, name_length).rstrip('\x00'):
+                        edits[name, address][2] = new_name
+                        fields_changed += 1
+                    continue
+                field, _, element = column.partition('.')
+                if field not in kinds:
+                    raise ValueError(f"{name} has no field {column!r}")
+                values = raw if isinstance(raw, list) else [raw]
+                slots = range(len(values)) if not element else [int(element)]
+                for slot, value in zip(slots, values):
+                    value = _import_value(field, kinds[field], value, lookups)
+                    old = current[field][slot] if isinstance(current[field], list) else current[field]
+                    if value == old:
+                        continue
+                    rule = rules.get(field)
+                    if rule is not None and value not in rule:
+                        raise ValueError(f"{column}={value} outside {_describe_rule(rule)}")
+                    if isinstance(edited[field], list):
+                        edited[field][slot] = value
+                    else:
+                        edited[field] = value
+                    fields_changed += 1
+        except (KeyError, ValueError, IndexError) as e:
+            errors.append(f"row {line}: {e}")
+
+    changed = [(key, edit) for key, edit in edits.items() if edit[0] != edit[1] or edit[2] is not None]
+    if errors or dry_run:
+        return len(changed), fields_changed, errors
+    for (name, address), (current, edited, new_name) in changed:
+        name_address, data_address, codec, name_length = targets[name][0][address]
+        if new_name is not None:
+            rom.stage(name_address, new_name.encode('utf-8').ljust(name_length, b'\x00'))
+        if edited != current:
+            rom.stage(data_address, codec.encode(edited, rom.read(data_address, codec.size)))
+    rom.commit()
+    return len(changed), fields_changed, errors
+
+
+# Human-readable bounds for an import error.
+def _describe_rule(rule):
+    if isinstance(rule, range):
+        return f"{rule.start}..{rule.stop - 1}"
+    return ', '.join(str(v) for v in sorted(rule))
+
+
+# patches.py
+# Changed (start, end) runs of `target` against `source`; runs closer than `gap` bytes are merged.
+def changed_runs(source, target, gap=0):
+    """
+    Compares the common length with one vectorized `!=` (NumPy), or 64 KiB block
+    compares with a byte scan only inside differing blocks. Bytes past the end of
+    `source` form a final run.
+    """
+    n = min(len(source), len(target))
+    runs = []
+    if np is not None:
+        pos = np.flatnonzero(np.frombuffer(source, np.uint8, n) != np.frombuffer(target, np.uint8, n))
+        if len(pos):
+            cut = np.flatnonzero(np.diff(pos) > gap + 1)
+            starts = pos[np.r_[0, cut + 1]]
+            ends = pos[np.r_[cut, len(pos) - 1]] + 1
+            runs = [list(run) for run in zip(starts.tolist(), ends.tolist())]
+    else:
+        source, target = memoryview(source), memoryview(target)
+        for lo in range(0, n, 1 << 16):
+            hi = min(lo + (1 << 16), n)
+            if source[lo:hi] == target[lo:hi]:
+                continue
+            for i in range(lo, hi):
+                if source[i] != target[i]:
+                    if runs and i - runs[-1][1] <= gap:
+                        runs[-1][1] = i + 1
+                    else:
+                        runs.append([i, i + 1])
+    if len(target) > n:
+        if runs and n - runs[-1][1] <= gap:
+            runs[-1][1] = len(target)
+        else:
+            runs.append([n, len(target)])
+    return [tuple(run) for run in runs]
+
+
+# BPS variable-length integer.
+def _bps_number(n):
+    out = bytearray()
+    while True:
+        low, n = n & 0x7F, n >> 7
+        if n == 0:
+            out.append(0x80 | low)
+            return bytes(out)
+        out.append(low)
+        n -= 1
+
+
+# Read a BPS number at `pos`; returns (value, next position).
+def _bps_read_number(patch, pos):
+    value, shift = 0, 1
+    while True:
+        byte = patch[pos]
+        pos += 1
+        value += (byte & 0x7F) * shift
+        if byte & 0x80:
+            return value, pos
+        shift <<= 7
+        value += shift
+
+
+# Build a patch turning `source` into `target`: 'bps', or 'ips' (IPS32 when offsets pass 16 MiB).
+def make_patch(source, target, fmt='bps'):
+    """
+    BPS patches copy unchanged spans from the source and carry only the changed
+    bytes, with CRC32s of source, target and patch. Classic IPS addresses 24 bits,
+    which does not reach most record tables of a 32 MiB ROM, so those patches are
+    written as IPS32 (4-byte offsets, 'IPS32' ... 'EEOF').
+    """
+    if fmt == 'bps':
+        out = bytearray(b'BPS1')
+        out += _bps_number(len(source)) + _bps_number(len(target)) + _bps_number(0)
+        done = 0
+        for start, end in changed_runs(source, target, gap=2):
+            if start > done:
+                out += _bps_number((start - done - 1) << 2)             # SourceRead
+            out += _bps_number((end - start - 1) << 2 | 1) + target[start:end]  # TargetRead
+            done = end
+        if len(target) > done:
+            out += _bps_number((len(target) - done - 1) << 2)
+        out += struct.pack('<II', zlib.crc32(source), zlib.crc32(target))
+        return bytes(out + struct.pack('<I', zlib.crc32(out)))
+    if fmt != 'ips':
+        raise ValueError(f"unknown patch format {fmt!r}")
+
+    runs = changed_runs(source, target, gap=5)
+    wide = max(len(target), len(source)) > 0xFFFFFF
+    width, head, tail = (4, b'IPS32', b'EEOF') if wide else (3, b'PATCH', b'EOF')
+    eof = int.from_bytes(tail, 'big')
+    out = bytearray(head)
+    for start, end in runs:
+        if start == eof:
+            start -= 1  # an offset spelling 'EOF' would end the patch early
+        for lo in range(start, end, 0xFFFF):
+            hi = min(lo + 0xFFFF, end)
+            out += lo.to_bytes(width, 'big') + (hi - lo).to_bytes(2, 'big') + target[lo:hi]
+    out += tail
+    if len(target) < len(source):
+        out += len(target).to_bytes(width, 'big')  # truncation extension
+    return bytes(out)
+
+
+# Apply an IPS, IPS32 or BPS patch to `source`; returns the patched bytes.
+def apply_patch(source, patch):
+    """
+    The format is taken from the patch header. BPS CRCs are checked, so a patch
+    made for a different ROM (or a damaged patch) raises ValueError.
+    """
+    patch = bytes(patch)
+    try:
+        if patch.startswith(b'BPS1'):
+            return _apply_bps(source, patch)
+        if patch.startswith(b'IPS32'):
+            return _apply_ips(source, patch, 5, 4, b'EEOF')
+        if patch.startswith(b'PATCH'):
+            return _apply_ips(source, patch, 5, 3, b'EOF')
+    except (IndexError, struct.error):
+        raise ValueError("patch is truncated") from None
+    raise ValueError("not an IPS, IPS32 or BPS patch")
+
+
+# IPS/IPS32 records, including RLE records and the truncation extension.
+def _apply_ips(source, patch, pos, width, tail):
+    out = bytearray(source)
+    while patch[pos:pos + len(tail)] != tail:
+        offset = int.from_bytes(patch[pos:pos + width], 'big')
+        size = int.from_bytes(patch[pos + width:pos + width + 2], 'big')
+        pos += width + 2
+        if size:
+            data = patch[pos:pos + size]
+            pos += size
+        else:
+            count = int.from_bytes(patch[pos:pos + 2], 'big')
+            data = patch[pos + 2:pos + 3] * count
+            pos += 3
+        if len(data) != (size or count) or pos > len(patch):
+            raise IndexError
+        if offset > len(out):
+            out.extend(bytes(offset - len(out)))
+        out[offset:offset + len(data)] = data
+    pos += len(tail)
+    if len(patch) >= pos + width:
+        del out[int.from_bytes(patch[pos:pos + width], 'big'):]
+    return bytes(out)
+
+
+# BPS actions: SourceRead, TargetRead, SourceCopy, TargetCopy.
+def _apply_bps(source, patch):
+    if zlib.crc32(patch[:-4]) != struct.unpack('<I', patch[-4:])[0]:
+        raise ValueError("BPS patch checksum mismatch (damaged patch)")
+    source_crc, target_crc = struct.unpack('<II', patch[-12:-4])
+    if zlib.crc32(source) != source_crc:
+        raise ValueError("patch was made for a different ROM (source CRC32 mismatch)")
+    source_size, pos = _bps_read_number(patch, 4)
+    target_size, pos = _bps_read_number(patch, pos)
+    metadata_size, pos = _bps_read_number(patch, pos)
+    pos += metadata_size
+    if len(source) != source_size:
+        raise ValueError(f"patch expects a {source_size}-byte ROM, got {len(source)} bytes")
+    out = bytearray()
+    source_rel = target_rel = 0
+    while pos < len(patch) - 12:
+        data, pos = _bps_read_number(patch, pos)
+        action, length = data & 3, (data >> 2) + 1
+        if action == 0:
+            out += source[len(out):len(out) + length]
+        elif action == 1:
+            out += patch[pos:pos + length]
+            pos += length
+        else:
+            delta, pos = _bps_read_number(patch, pos)
+            delta = -(delta >> 1) if delta & 1 else delta >> 1
+            if action == 2:
+                source_rel += delta
+                out += source[source_rel:source_rel + length]
+                source_rel += length
+            else:
+                target_rel += delta
+                for _ in range(length):  # may overlap the bytes it is producing
+                    out.append(out[target_rel])
+                    target_rel += 1
+    if len(out) != target_size or zlib.crc32(out) != target_crc:
+        raise ValueError("patched ROM does not match the patch's target CRC32")
+    return bytes(out)
+
+
+# snapshots.py
+# --- SnapshotStore: Deduplicated, timestamped restore points of one ROM, kept next to it.
+class SnapshotStore:
+    """
+    '<stem> (snapshots)/' holds the ROM cut into fixed 64 KiB chunks, each stored
+    once under its SHA-1 in chunks/, and one JSON manifest per snapshot listing
+    its chunk hashes. Edits never move bytes, so a snapshot after a session adds
+    only the chunks that changed.
+    """
+    chunk_size = 1 << 16
+    keep = 10           # newest snapshots always kept
+    keep_daily = 30     # plus the newest snapshot of each of this many days
+
+    def __init__(self, rom):
+        self.rom = Path(rom)
+        self.root = self.rom.with_name(f"{self.rom.stem} (snapshots)")
+        self.chunks = self.root / 'chunks'
+
+    def _chunk_path(self, digest):
+        return self.chunks / digest[:2] / digest
+
+    # Snapshot manifests, newest first.
+    def snapshots(self):
+        manifests = []
+        for path in self.root.glob('*.json'):
+            try:
+                manifests.append(json.loads(path.read_text(encoding='utf-8')))
+            except (OSError, ValueError):
+                continue
+        return sorted(manifests, key=lambda m: m['id'], reverse=True)
+
+    # Manifest for an id (the newest when None).
+    def manifest(self, snap_id=None):
+        snaps = self.snapshots()
+        if not snaps:
+            raise ValueError(f"no snapshots of {self.rom.name}")
+        if snap_id is None:
+            return snaps[0]
+        for m in snaps:
+            if m['id'] == snap_id:
+                return m
+        raise ValueError(f"no snapshot {snap_id!r} of {self.rom.name}")
+
+    # Record the ROM's current bytes, then apply the retention policy.
+    def take(self):
+        """
+        Returns the snapshot id ('20261017-142501'). A ROM identical to the
+        newest snapshot reuses it instead of adding another.
+        """
+        digests = []
+        replay_wal(self.rom)  # snapshot a whole save, never half of one
+        self.chunks.mkdir(parents=True, exist_ok=True)
+        with open(self.rom, 'rb') as fh:
+            while chunk := fh.read(self.chunk_size):
+                digest = hashlib.sha1(chunk).hexdigest()
+                digests.append(digest)
+                path = self._chunk_path(digest)
+                if not path.exists():
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = path.with_suffix('.tmp')
+                    tmp.write_bytes(chunk)
+                    os.replace(tmp, path)
+        snaps = self.snapshots()
+        if snaps and snaps[0]['chunks'] == digests:
+            return snaps[0]['id']
+        now = datetime.now()
+        snap_id = now.strftime('%Y%m%d-%H%M%S')
+        taken = {m['id'] for m in snaps}
+        n = 2
+        while snap_id in taken:
+            snap_id = f"{now:%Y%m%d-%H%M%S}-{n}"
+            n += 1
+        manifest = {'id': snap_id, 'created': now.isoformat(timespec='seconds'),
+                    'size': os.path.getsize(self.rom), 'chunk_size': self.chunk_size, 'chunks': digests}
+        tmp = self.root / f'{snap_id}.tmp'
+        tmp.write_text(json.dumps(manifest), encoding='utf-8')
+        os.replace(tmp, self.root / f'{snap_id}.json')
+        self.prune()
+        return snap_id
+
+    # Stored chunks of a snapshot, each checked against its hash.
+    def _iter_chunks(self, manifest):
+        for digest in manifest['chunks']:
+            chunk = self._chunk_path(digest).read_bytes()
+            if hashlib.sha1(chunk).hexdigest() != digest:
+                raise ValueError(f"snapshot chunk {digest} is damaged")
+            yield digest, chunk
+
+    # Whole ROM bytes of a snapshot (e.g. as a patch source).
+    def read(self, snap_id=None):
+        return b''.join(chunk for _, chunk in self._iter_chunks(self.manifest(snap_id)))
+
+    # Put a snapshot back; only chunks that differ from the ROM are written.
+    def restore(self, snap_id=None, target=None):
+        """
+        In place, the differing chunks are staged on the ROM session and
+        committed, so open editor windows keep a valid image. With `target`,
+        a new file is written instead. Returns the number of chunks written.
+        """
+        manifest = self.manifest(snap_id)
+        if target is not None:
+            target = Path(target)
+            tmp = target.with_name(target.name + '.tmp')
+            with open(tmp, 'wb') as fh:
+                for _, chunk in self._iter_chunks(manifest):
+                    fh.write(chunk)
+            os.replace(tmp, target)
+            return len(manifest['chunks'])
+        rom = open_rom(self.rom)
+        if len(rom) != manifest['size']:
+            raise ValueError(f"ROM is {len(rom)} bytes but the snapshot is {manifest['size']}; "
+                             f"restore it to a new file")
+        written = 0
+        size = manifest['chunk_size']
+        for i, digest in enumerate(manifest['chunks']):
+            if hashlib.sha1(rom.file_order(rom.read(i * size, size))).hexdigest() != digest:
+                chunk = self._chunk_path(digest).read_bytes()
+                if hashlib.sha1(chunk).hexdigest() != digest:
+                    raise ValueError(f"snapshot chunk {digest} is damaged")
+                rom.stage(i * size, rom.file_order(chunk))  # chunks hold the file's own byte order
+                written += 1
+        rom.commit()
+        return written
+
+    # Drop snapshots outside the retention policy, then chunks no snapshot uses.
+    def prune(self, keep=None, keep_daily=None):
+        """
+        Keeps the `keep` newest snapshots plus the newest of each of the last
+        `keep_daily` days that have one. Returns the ids removed.
+        """
+        keep = self.keep if keep is None else keep
+        keep_daily = self.keep_daily if keep_daily is None else keep_daily
+        snaps = self.snapshots()
+        kept = {m['id'] for m in snaps[:keep]}
+        days = []
+        for m in snaps:
+            if m['id'][:8] not in days:
+                days.append(m['id'][:8])
+                if len(days) <= keep_daily:
+                    kept.add(m['id'])
+        removed = [m['id'] for m in snaps if m['id'] not in kept]
+        for snap_id in removed:
+            (self.root / f'{snap_id}.json').unlink()
+        used = {digest for m in snaps if m['id'] in kept for digest in m['chunks']}
+        for path in self.chunks.glob('*/*'):
+            if path.name not in used:
+                path.unlink()
+        return removed
+
+
+# randomizer.py
+# shuffles randomize_image() can apply; each draws from its own seeded stream
+RANDOMIZE_SHUFFLES = ['shops', 'loot', 'enemy-equipment', 'spell-schools', 'trainer-spells']
+
+
+# ROM facts a randomizer needs, computed once and handed (pickled) to worker processes.
+def randomizer_context(filename):
+    """
+    'categories' maps item codes to their get_major_item_dic() type prefix
+    ('(weapon)', '(armor)', ...; potions are 'potion'), so shuffles only swap
+    like for like. Becan is left out of the trainers: he is a party member too.
+    """
+    rom = open_rom(filename)
+    names = get_shop_names(rom)
+    return {
+        'categories': {code: label.split(' ', 1)[0] if label.startswith('(') else 'potion'
+                       for code, label in get_major_item_dic(rom).items() if code != '0000'},
+        'shops': [a for n, a in zip(names, SHOP_ITEMS) if n not in NOT_SHOPS],
+        'trainers': [a - CHARACTER_CODEC.offset('skills') for a in SHOP_TRAINERS[1:len(names)]],
+    }
+
+
+# Permute values among cells that share a group; cells are (record, field, list index or None).
+def _shuffle_cells(rnd, cells, group):
+    groups = {}
+    for cell in cells:
+        rec, field, i = cell
+        value = rec[field] if i is None else rec[field][i]
+        key = group(value)
+        if key is not None:
+            groups.setdefault(key, []).append((cell, value))
+    for key in sorted(groups):
+        members = groups[key]
+        values = [value for _, value in members]
+        rnd.shuffle(values)
+        for ((rec, field, i), _), value in zip(members, values):
+            if i is None:
+                rec[field] = value
+            else:
+                rec[field][i] = value
+
+
+# Shuffle tables of a z64-order bytearray in place; the same seed always gives the same bytes.
+def randomize_image(image, seed, shuffles=RANDOMIZE_SHUFFLES, context=None):
+    """
+    Item codes only trade places with items of the same category, and empty
+    ('0000') or unknown codes stay put. Chances, levels and counts stay with
+    their slot. `context` comes from randomizer_context().
+    """
+    categories = context['categories']
+    item = categories.get
+    records = []    # (address, codec, decoded) to encode back at the end
+
+    def load(addresses, codec):
+        recs = [codec.decode(image[a:a + codec.size]) for a in addresses]
+        records.extend(zip(addresses, [codec] * len(recs), recs))
+        return recs
+
+    for name in RANDOMIZE_SHUFFLES:
+        if name not in shuffles:
+            continue
+        rnd = random.Random(f'{seed}:{name}')
+        if name == 'shops':
+            recs = load(context['shops'], SHOP_CODEC)
+            _shuffle_cells(rnd, [(r, f'item{i}', None) for r in recs for i in range(23)], item)
+        elif name == 'loot':
+            recs = load([a + 22 for a in DROP_CAT], LOOT_CODEC)
+            _shuffle_cells(rnd, [(r, f'item{i}', None) for r in recs for i in range(1, 7)], item)
+        elif name == 'enemy-equipment':
+            spec = TABLES['enemy']
+            recs = load([a + spec.data_seek for a in spec.addresses], spec.codec)
+            cells = [(r, 'weapons', i) for r in recs for i in range(3)]
+            cells += [(r, field, None) for r in recs for field in ('armor', 'shield')]
+            _shuffle_cells(rnd, cells, item)
+        elif name == 'spell-schools':
+            spec = TABLES['spell']
+            recs = load([a + spec.data_seek for a in spec.addresses], spec.codec)
+            _shuffle_cells(rnd, [(r, 'school', None) for r in recs], lambda v: 'school')
+        else:
+            recs = load(context['trainers'], CHARACTER_CODEC)
+            _shuffle_cells(rnd, [(r, 'spells', i) for r in recs for i in range(5)],
+                           lambda code: None if code == '0000' else 'spell')
+        # a later shuffle decodes its own copy; flush this one first
+        for address, codec, rec in records:
+            image[address:address + codec.size] = codec.encode(rec, image[address:address + codec.size])
+        records.clear()
+    return image
+
+
+# Worker: randomize one seed and write its BPS patch; returns the patch path.
+def _randomize_seed(filename, seed, shuffles, context, out_dir):
+    rom = open_rom(filename)
+    source = rom.read(0, len(rom))
+    image = randomize_image(bytearray(source), seed, shuffles, context)
+    path = Path(out_dir) / f'seed-{seed}.bps'
+    path.write_bytes(make_patch(source, image, 'bps'))
+    return path
+
+
+# Generate one patch per seed, fanned out over a process pool.
+def randomize_batch(filename, seeds, out_dir, shuffles=RANDOMIZE_SHUFFLES, jobs=None):
+    """
+    Each worker maps the ROM once and reuses it for every seed it gets.
+    Yields (seed, patch path) in seed order.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    context = randomizer_context(filename)
+    filename = str(open_rom(filename).path)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_randomize_seed, filename, seed, shuffles, context, out_dir) for seed in seeds]
+        for seed, future in zip(seeds, futures):
+            yield seed, future.result()
+
+
+# xref.py
+# slots that hold item ('item') or spell ('spell') codes, per kind of record
+_EQUIPMENT_SLOTS = ([('weapons', i, 'item') for i in range(3)] + [('armor', None, 'item'), ('shield', None, 'item')]
+                    + [('spells', i, 'spell') for i in range(5)])
+XREF_SLOTS = {
+    'party': _EQUIPMENT_SLOTS,
+    'enemy': _EQUIPMENT_SLOTS,
+    'trainer': [('spells', i, 'spell') for i in range(5)],
+    'shop': [(f'item{i}', None, 'item') for i in range(23)],
+    'loot': [(f'item{i}', None, 'item') for i in range(1, 7)],
+    'accessory': [('spell', None, 'spell'), ('magic', None, 'spell')],
+    'armor': [('spell', None, 'spell'), ('magic', None, 'spell')],
+    'shield': [('spell', None, 'spell'), ('magic', None, 'spell')],
+    'weapon': [('spell', None, 'spell'), ('magic', None, 'spell')],
+    'wand': [('spell', None, 'spell')],
+    'scroll': [('spell', None, 'spell')],
+}
+
+
+# --- CrossReference: Inverted index from item/spell codes to the record slots that hold them.
+class CrossReference:
+    """
+    Built in one pass over shops, loot blocks, party/enemy equipment and spells,
+    trainer spells, and the spell slots of items, wands and scrolls. It registers
+    as a RomImage observer, so each commit re-decodes only the records whose
+    bytes changed. Keys are ('item', code) or ('spell', code); codes share no
+    namespace between the two.
+    """
+    def __init__(self, rom):
+        self.rom = rom
+        # (kind, name, data address, codec); name is a str or (prefix, address, length) read on demand
+        self.sources = []
+        names = get_shop_names(rom)
+        becan = ('Erromon : ', BECAN_ADDRESS, 9)
+        for table in ('party', 'enemy', 'loot', 'accessory', 'armor', 'shield', 'weapon', 'wand', 'scroll'):
+            spec = TABLES[table]
+            self.sources += [(table, ('', a, spec.name_length), a + spec.data_seek, spec.codec)
+                             for a in spec.addresses]
+        self.sources += [('shop', becan if i == 0 else name, a, SHOP_CODEC)
+                         for i, (name, a) in enumerate(zip(names, SHOP_ITEMS)) if name not in NOT_SHOPS]
+        skills = CHARACTER_CODEC.offset('skills')
+        self.sources += [('trainer', becan if i == 0 else name, a - skills, CHARACTER_CODEC)
+                         for i, (name, a) in enumerate(zip(names, SHOP_TRAINERS))]
+        order = sorted(range(len(self.sources)), key=lambda i: self.sources[i][2])
+        self._starts = [self.sources[i][2] for i in order]
+        self._order = order
+        self._longest = max(codec.size for *_, codec in self.sources)
+        self._uses = {}     # (namespace, code) -> set of (source id, field label)
+        self._refs = {}     # source id -> [(namespace, code, field label)]
+        for sid in range(len(self.sources)):
+            self._index(sid)
+
+    # (Re)decode one source record and move its references in the inverted map.
+    def _index(self, sid):
+        kind, _, address, codec = self.sources[sid]
+        for namespace, code, label in self._refs.pop(sid, ()):
+            uses = self._uses[namespace, code]
+            uses.discard((sid, label))
+            if not uses:
+                del self._uses[namespace, code]
+        rec = codec.decode(self.rom.read(address, codec.size))
+        refs = []
+        for field, i, namespace in XREF_SLOTS[kind]:
+            code = rec[field] if i is None else rec[field][i]
+            if code != '0000':
+                label = field if i is None else f'{field} {i + 1}'
+                refs.append((namespace, code, label))
+                self._uses.setdefault((namespace, code), set()).add((sid, label))
+        self._refs[sid] = refs
+
+    # Observer hook: re-index the records overlapping the changed spans.
+    def __call__(self, spans):
+        for start, end in spans:
+            lo = bisect_right(self._starts, start - self._longest)
+            hi = bisect_right(self._starts, end - 1)
+            for k in range(lo, hi):
+                sid = self._order[k]
+                _, _, address, codec = self.sources[sid]
+                if address + codec.size > start:
+                    self._index(sid)
+
+    def _name(self, sid):
+        name = self.sources[sid][1]
+        if isinstance(name, str):
+            return name
+        prefix, address, length = name
+        return prefix + self.rom.text(address, length).rstrip('\x00')
+
+    # Every slot holding a code, as dicts (kind, name, field, address), sorted by kind and name.
+    def uses(self, namespace, code):
+        rows = [{'kind': self.sources[sid][0], 'name': self._name(sid), 'field': label,
+                 'address': f'{self.sources[sid][2]:#010x}'}
+                for sid, label in self._uses.get((namespace, code), ())]
+        return sorted(rows, key=lambda r: (list(XREF_SLOTS).index(r['kind']), r['name'], r['field']))
+
+
+# The session's cross-reference index, built on first use and kept current by commits.
+def cross_reference(filename):
+    rom = open_rom(filename)
+    for observer in rom.observers:
+        if isinstance(observer, CrossReference):
+            return observer
+    xref = CrossReference(rom)
+    rom.observers.append(xref)
+    return xref
+
+
+# Item and spell names for lookups: {label: (namespace, code)}; spells are labelled '(spell) Name'.
+def xref_labels(filename):
+    labels = {label: ('item', code) for code, label in get_major_item_dic(filename).items() if code != '0000'}
+    labels.update((f'(spell) {name}', ('spell', code))
+                  for code, name in get_minor_dic(filename, SPELL_DIC, 22).items() if code != '0000')
+    return labels
+
+
+# Resolve a query (hex code, full label, or case-insensitive name fragment) to its uses.
+def find_uses(filename, query):
+    """Returns [(label, uses)] for each matching item or spell."""
+    xref = cross_reference(filename)
+    labels = xref_labels(filename)
+    if query.upper() in {code for _, code in labels.values()}:
+        matches = [label for label, (_, code) in labels.items() if code == query.upper()]
+    elif query in labels:
+        matches = [query]
+    else:
+        matches = [label for label in labels if query.lower() in label.lower()]
+    return [(label, xref.uses(*labels[label])) for label in sorted(matches)]
+
+
+# batch.py
+# ROM files named directly or found (non-recursively) in the given directories.
+def find_roms(paths):
+    roms = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            roms.extend(sorted(p for p in path.iterdir() if p.suffix.lower() in ('.z64', '.v64', '.n64')))
+        else:
+            roms.append(path)
+    return roms
+
+
+# Worker: apply the rows to one ROM and unmap it; returns a report dict.
+def _import_one(path, rows, table, dry_run):
+    report = {'rom': str(path), 'records': 0, 'fields': 0, 'errors': []}
+    try:
+        report['records'], report['fields'], report['errors'] = import_records(path, rows, table, dry_run)
+    except (OSError, ValueError) as e:
+        report['errors'] = [str(e)]
+    finally:
+        close_roms()
+    return report
+
+
+# Apply one edit script to many ROMs over a process pool; yields a report per ROM, in order.
+def batch_import(roms, rows, table=None, dry_run=False, jobs=None):
+    """
+    `rows` are import_records() rows (read once, sent to every worker). Each ROM
+    is validated and written on its own: a variant whose names or values do not
+    fit gets its errors reported and is left unchanged; the others still apply.
+    """
+    rows = list(rows)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_import_one, rom, rows, table, dry_run) for rom in roms]
+        for future in futures:
+            yield future.result()
+
+
+# synth.py
+# synthetic images are a full 32 MiB cartridge; scaled tables continue past it
+SYNTH_ROM_SIZE = 0x2000000
+
+
+# Flip bits of the word at `at` so crc32(buf[lo:hi]) == target; CRC32 is affine over GF(2).
+def _forge_crc32(buf, lo, hi, target, at):
+    base = zlib.crc32(buf[lo:hi])
+    basis = {}  # top bit -> (crc change, bit flips producing it)
+    for bit in range(32):
+        buf[at + bit // 8] ^= 1 << bit % 8
+        change, flips = zlib.crc32(buf[lo:hi]) ^ base, 1 << bit
+        buf[at + bit // 8] ^= 1 << bit % 8
+        while change:
+            top = change.bit_length() - 1
+            if top not in basis:
+                basis[top] = (change, flips)
+                break
+            change, flips = change ^ basis[top][0], flips ^ basis[top][1]
+    # any 32 consecutive bits span every CRC32 change, so this always resolves
+    want, flips = base ^ target, 0
+    while want:
+        change, f = basis[want.bit_length() - 1]
+        want, flips = want ^ change, flips ^ f
+    for bit in range(32):
+        if flips >> bit & 1:
+            buf[at + bit // 8] ^= 1 << bit % 8
+
+
+# TABLES with every table repeated `scale` times; the copies sit back to back after SYNTH_ROM_SIZE.
+def synth_tables(scale=1):
+    """
+    Depends only on `scale`, so a benchmark can rebuild the layout of a ROM
+    that `synth` wrote earlier. With scale 1 the addresses are exactly TABLES'.
+    """
+    tables = {}
+    address = SYNTH_ROM_SIZE
+    for table, spec in TABLES.items():
+        extra = []
+        for _ in range(len(spec.addresses) * (scale - 1)):
+            extra.append(address)
+            address += -(-spec.itemsize // 4) * 4  # word aligned, so v64/n64 copies stay whole
+        tables[table] = TableSpec(spec.addresses + extra, spec.name_length, spec.data_seek, spec.codec)
+    return tables
+
+
+# One name per field length from the SYNTH_NAMES word lists, numbered once the combinations run out.
+def synth_names(rnd, kind, lengths):
+    joiner, *parts = SYNTH_NAMES[kind]
+    pool = [joiner.join(words) for words in itertools.product(*parts)]
+    rnd.shuffle(pool)
+    names = []
+    for i, length in enumerate(lengths):
+        name, suffix = pool[i % len(pool)], f' {i // len(pool) + 1}' if i >= len(pool) else ''
+        names.append(name[:length - len(suffix)].rstrip() + suffix)
+    return names
+
+
+# One random value for a codec field: SYNTH_RANGES, then the table's FIELD_RULES, then FIELD_CHOICES.
+def _synth_value(rnd, field, kind, rules, codes):
+    if kind == 'code':
+        pool = codes.get(field, codes['item'])
+        return '0000' if rnd.random() < 0.25 else rnd.choice(pool)
+    if field in SYNTH_RANGES:
+        values = SYNTH_RANGES[field]
+    elif field in rules:
+        values = rules[field]
+    elif field in FIELD_CHOICES:
+        values = sorted(int(v, 16) for v in FIELD_CHOICES[field].values())
+    else:
+        values = {'u8': range(256), 's8': range(-128, 128), 'u16le': range(65536), 'n4': range(16)}[kind]
+    return rnd.choice(values if isinstance(values, (range, list)) else sorted(values))
+
+
+# Encoded bytes of one plausible record; unmapped bytes are random and min/max pairs are ordered.
+def synth_record(rnd, codec, rules, codes):
+    rec = {}
+    for field in codec.layout:
+        name, kind = field[0], field[1]
+        count = field[2] if len(field) > 2 else 1
+        if kind == 'raw':
+            rec[name] = rnd.randbytes(count)
+        elif count > 1:
+            rec[name] = [_synth_value(rnd, name, kind, rules, codes) for _ in range(count)]
+        else:
+            rec[name] = _synth_value(rnd, name, kind, rules, codes)
+    for name in rec:
+        top = name[:-4] + '_max'
+        if name.endswith('_min') and rec[name] > rec.get(top, rec[name]):
+            rec[name], rec[top] = rec[top], rec[name]
+    return codec.encode(rec)
+
+
+# Write a synthetic z64 with a record at every address the editors read; returns the table layout.
+def synthesize_rom(path, seed=0, scale=1):
+    """
+    Names come from SYNTH_NAMES; field values stay inside each editor's bounds and
+    every item, spell and drop-category reference is a key of the lookup dicts,
+    so all editors, exports and the cross-reference load it cleanly. The boot
+    code is random but forged to CIC-6102's CRC32, and the header CRCs match.
+    `scale` appends scale-1 extra copies of every table (see synth_tables()).
+    """
+    rnd = random.Random(seed)
+    tables = synth_tables(scale)
+    end = max(a + spec.itemsize for spec in tables.values() for a in spec.addresses)
+    image = bytearray(max(SYNTH_ROM_SIZE, end + -end % 4))
+    image[0:4] = bytes.fromhex('80371240')
+    image[0x20:0x34] = b'AIDYN SYNTHETIC'.ljust(20)
+    image[0x40:0x1000] = rnd.randbytes(0x1000 - 0x40)
+    _forge_crc32(image, 0x40, 0x1000, next(k for k, v in CIC_BOOT_CRC32.items() if v == 6102), 0xFFC)
+
+    items = list(ITEM_DIC.values())
+    spells = list(SPELL_DIC.values())
+    codes = {'item': items, 'spells': spells, 'spell': spells, 'magic': spells,
+             'weapons': [c for c in items if c[2:] == '07'],
+             'armor': [c for c in items if c[2:] == '05'],
+             'shield': [c for c in items if c[2:] == '06']}
+
+    def put(address, data):
+        image[address:address + len(data)] = data
+
+    def put_name(address, name, length):
+        put(address, name.encode()[:length].ljust(length, b'\x00'))
+
+    # only party members store an unlearnable skill as 255; enemies and trainers use 0
+    unlearned = {'skills': range(11), 'shield_skill': range(11)}
+
+    # trainers are character records, and party/enemy records may overlap them, so they go first
+    skills = CHARACTER_CODEC.offset('skills')
+    for address in SHOP_TRAINERS:
+        put(address - skills, synth_record(rnd, CHARACTER_CODEC, {**FIELD_RULES['party'], **unlearned}, codes))
+    for name, address in zip([None] + SHOPS, SHOP_ITEMS):
+        if name not in NOT_SHOPS:
+            put(address, synth_record(rnd, SHOP_CODEC, {}, codes))
+
+    # names: items by their type (keys and misc items have no table), the scaled copies by table;
+    # potions are named by POTIONS, not the ROM
+    fields = {}
+    for table, spec in tables.items():
+        for address in spec.addresses:
+            fields.setdefault(address, (SYNTH_ITEM_KINDS.get(ITEM_DIC.get(address, '')[2:], table),
+                                        spec.name_length))
+    for address, code in ITEM_DIC.items():
+        if code[2:] != '10':
+            fields.setdefault(address, (SYNTH_ITEM_KINDS[code[2:]], 18))
+    by_kind = {}
+    for address, (kind, length) in fields.items():
+        by_kind.setdefault(kind, []).append((address, length))
+    for kind, group in by_kind.items():
+        for (address, length), name in zip(group, synth_names(rnd, kind, [n for _, n in group])):
+            put_name(address, name, length)
+
+    for table, spec in tables.items():
+        rules = {**FIELD_RULES.get(table, {}), **(unlearned if table == 'enemy' else {})}
+        for address in spec.addresses:
+            put(address + spec.data_seek, synth_record(rnd, spec.codec, rules, codes))
+
+    image[0x10:0x18] = struct.pack('>II', *n64_crc(image[:CRC_END], 6102))
+    Path(path).write_bytes(image)
+    return tables
+
+
+# bench.py
+# Seconds per call of `func`: best and median of `repeat` timeit runs; `setup` runs before each run.
+def time_call(func, setup=None, repeat=7, number=None):
+    """
+    Each run makes `number` calls, autoranged to at least 0.2 s unless given.
+    Benchmarks that must start cold pass number=1 and drop the caches in `setup`;
+    a single call is far noisier than a batch, so those get five times the runs.
+    """
+    repeat = repeat * 5 if number == 1 else repeat
+    timer = timeit.Timer(func, setup or 'pass')
+    number = number or timer.autorange()[0]
+    runs = [t / number for t in timer.repeat(repeat, number)]
+    return {'best': min(runs), 'median': statistics.median(runs), 'number': number, 'repeat': repeat}
+
+
+# Every EXPORT_TABLES table through one of the `export` writers, into memory.
+def _export_all(rom, tables, writer):
+    out = io.StringIO()
+    for table in EXPORT_TABLES:
+        writer(iter_records(rom, table, tables.get(table)), out)
+    return out
+
+
+# (name, call, setup, number) for the lookup builders, cold and cached, and whole-table export.
+def _table_benches(rom, tables):
+    enemy = tables['enemy']
+    # SPELL_DIC-shaped, but over every (scaled) spell record
+    spells = {a: f'{i:04X}' for i, a in enumerate(tables['spell'].addresses)}
+    cold = partial(rom.invalidate, [(0, len(rom))])
+    benches = []
+    for name, call in (('get_major_item_dic', partial(get_major_item_dic, rom)),
+                       ('get_major_name_lists', partial(get_major_name_lists, rom, enemy.addresses,
+                                                        enemy.name_length)),
+                       ('get_minor_dic', partial(get_minor_dic, rom, spells, 22))):
+        benches.append((f'{name} cold', call, cold, 1))
+        benches.append((f'{name} cached', call, None, None))
+    benches.append(('export jsonl', partial(_export_all, rom, tables, write_jsonl), None, None))
+    benches.append(('export csv', partial(_export_all, rom, tables, write_csv), None, None))
+    if np is not None:
+        benches.append(('read_table', lambda: [read_table(rom, spec) for spec in tables.values()], None, None))
+    return benches
+
+
+# (name, call, setup, number) for each editor: select a record (set_defaults) and press its Save button.
+def _editor_benches(filename, root):
+    party = PartyEdit(filename, PARTY_ADDRESSES, 9, 78, 0)
+    enemy = EnemyEdit(filename, ENEMY_ADDRESSES, 17, 92, 1)
+    trainer = TrainerEdit(filename)
+    accessory = AccessoryEdit(filename, ACCESSORY_ADDRESSES, 24, 20, 20)
+    armor = ArmorShield(filename, ARMOR_ADDRESSES, 26, 25, 22, 5)
+    shield = ArmorShield(filename, SHIELD_ADDRESSES, 26, 25, 22, 6)
+    weapon = WeaponEdit(filename, WEAPON_ADDRESSES, 23, 25, 21)
+    spell = SpellEdit(filename)
+    wands = WandScrollEdit(filename)
+    for editor in (party, enemy, trainer, accessory, armor, shield, weapon, spell, wands):
+        editor.win.withdraw()
+    pairs = [('party', party.default_name_menu, party.save),
+             ('enemy', enemy.default_name_menu, enemy.save),
+             ('enemy loot', enemy.drop_box, enemy.save_loot),
+             ('trainer', trainer.default_name_menu, trainer.save),
+             ('accessory', accessory.default_item_menu, accessory.save),
+             ('armor', armor.default_item_menu, armor.save),
+             ('shield', shield.default_item_menu, shield.save),
+             ('weapon', weapon.default_item_menu, weapon.save),
+             ('spell', spell.default_spell_menu, spell.save_btn),
+             ('wand', wands.wa_menu, wands.wa_save_btn),
+             ('scroll', wands.sc_menu, wands.sc_save_btn)]
+    benches = []
+    for name, menu, button in pairs:
+        # walk the records in menu order so every run saves real, varied records
+        def call(menu=menu, button=button, rows=itertools.cycle(range(len(menu['values'])))):
+            menu.current(next(rows))
+            button.invoke()
+        # let the "Saved" toasts of the last run close between runs
+        benches.append((f'editor {name}', call, root.update, None))
+    return benches
+
+
+# Time the benchmarks on a fresh synthetic ROM; returns the JSON-ready report.
+def run_benchmarks(scale=1, seed=0, repeat=7, select=None, progress=None):
+    """
+    `select` keeps only benchmarks whose name contains it; `progress(name, result)`
+    is called as each one finishes. Editors need a display: without one their
+    benchmarks are listed under 'skipped'. Times are seconds per call.
+    """
+    results, skipped = {}, {}
+
+    def run(benches):
+        for name, call, setup, number in benches:
+            if select is None or select in name:
+                results[name] = time_call(call, setup, repeat, number)
+                if progress:
+                    progress(name, results[name])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, 'bench.z64')
+        tables = synthesize_rom(filename, seed, scale)
+        rom = open_rom(filename)
+        try:
+            run(_table_benches(rom, tables))
+            # editors last: their saves change the ROM under the lookups
+            try:
+                root = tk.Tk()
+            except tk.TclError as e:
+                skipped['editors'] = f"no display ({e})"
+            else:
+                try:
+                    root.withdraw()
+                    run(_editor_benches(filename, root))
+                finally:
+                    root.destroy()
+        finally:
+            index = rom.index_path()  # the bench ROM's lookup index has no later use
+            close_roms()
+            index.unlink(missing_ok=True)
+
+    return {'format': 1, 'created': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'numpy': np.__version__ if np is not None else None,
+            'scale': scale, 'seed': seed, 'results': results, 'skipped': skipped}
+
+
+# (name, baseline best, current best, ratio) for benchmarks present in both reports.
+def compare_benchmarks(baseline, current):
+    for name, new in current['results'].items():
+        old = baseline['results'].get(name)
+        if old:
+            yield name, old['best'], new['best'], new['best'] / old['best']
+
+
+# Seconds as a short human-readable duration.
+def format_seconds(seconds):
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds * 1e9:.3g} ns"
+
+
+# cli.py
+# Exported cell value: unknown bytes as hex, everything else as decoded.
+def _export_value(value):
+    return value.hex().upper() if isinstance(value, bytes) else value
+
+
+# Write records as JSON Lines, one object per record.
+def write_jsonl(records, out):
+    for rec in records:
+        out.write(json.dumps({k: _export_value(v) for k, v in rec.items()}, ensure_ascii=False))
+        out.write('\n')
+
+
+# Write records as CSV; list fields become one column per element ('skills.0', 'skills.1', ...).
+def write_csv(records, out):
+    writer = None
+    for rec in records:
+        row = {}
+        for k, v in rec.items():
+            if isinstance(v, list):
+                row.update((f'{k}.{i}', _export_value(x)) for i, x in enumerate(v))
+            else:
+                row[k] = _export_value(v)
+        if writer is None:
+            writer = csv.DictWriter(out, fieldnames=list(row), lineterminator='\n')
+            writer.writeheader()
+        writer.writerow(row)
+
+
+# tables `export` can stream, in dump order
+EXPORT_TABLES = ['party', 'enemy', 'loot', 'shop', 'spell', 'wand', 'scroll',
+                 'weapon', 'armor', 'shield', 'accessory']
+
+
+# `export`: stream tables to stdout or files without touching Tk.
+def export_command(args):
+    tables = args.table or EXPORT_TABLES
+    rom = open_rom(args.rom)
+    if args.format == 'jsonl':
+        out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+        try:
+            for table in tables:
+                write_jsonl(iter_records(rom, table), out)
+        finally:
+            if args.output:
+                out.close()
+        return 0
+
+    # CSV: one header per table, so several tables need a directory
+    if len(tables) == 1 and (args.output is None or not args.output.is_dir()):
+        out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+        try:
+            write_csv(iter_records(rom, tables[0]), out)
+        finally:
+            if args.output:
+                out.close()
+        return 0
+    if args.output is None:
+        raise SystemExit("export: --format csv with several tables needs -o DIRECTORY")
+    args.output.mkdir(parents=True, exist_ok=True)
+    for table in tables:
+        with open(args.output / f'{table}.csv', 'w', encoding='utf-8', newline='') as out:
+            write_csv(iter_records(rom, table), out)
+    return 0
+
+
+# Rows from a CSV (DictReader) or JSON Lines file, read lazily.
+def read_rows(path, fmt=None):
+    fmt = fmt or ('csv' if Path(path).suffix.lower() == '.csv' else 'jsonl')
+    with open(path, encoding='utf-8', newline='') as fh:
+        if fmt == 'csv':
+            yield from csv.DictReader(fh)
+        else:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+
+# `import`: validate a file of edits and apply them with a single commit.
+def import_command(args):
+    records, fields, errors = import_records(args.rom, read_rows(args.edits, args.format),
+                                             table=args.table, dry_run=args.dry_run)
+    for error in errors:
+        print(error, file=sys.stderr)
+    if errors:
+        print(f"{len(errors)} invalid rows; nothing written", file=sys.stderr)
+        return 1
+    verb = 'would change' if args.dry_run else 'changed'
+    print(f"{verb} {fields} fields in {records} records")
+    return 0
+
+
+# One diff_roms() change as a line of text.
+def format_change(change):
+    return f"{change['table']} {change['name']}: {change['label']} {change['old']} \u2192 {change['new']}"
+
+
+# `diff`: field-level changes between two ROMs, or a ROM and one of its snapshots; exit 1 when they differ.
+def diff_command(args):
+    if (len(args.roms) == 1) != (args.snapshot is not None) or len(args.roms) > 2:
+        raise ValueError("diff takes OLD NEW, or one ROM with --snapshot")
+    changes = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.snapshot is None:
+            old, new = args.roms
+        else:
+            # the snapshot is written out whole, so diff_roms() maps it like any ROM
+            new = args.roms[0]
+            old = Path(tmp) / new.name
+            SnapshotStore(new).restore(args.snapshot or None, old)
+        try:
+            for change in diff_roms(old, new, args.table):
+                changes += 1
+                if args.format == 'jsonl':
+                    print(json.dumps(change, ensure_ascii=False))
+                else:
+                    print(format_change(change))
+        finally:
+            close_roms()    # unmap the restored copy before its directory is removed
+    return 1 if changes else 0
+
+
+# `patch make` / `patch apply`: IPS and BPS patches instead of whole-ROM copies.
+def patch_command(args):
+    if args.action == 'make':
+        fmt = args.format or ('ips' if args.output.suffix.lower() == '.ips' else 'bps')
+        source, target = open_rom(args.original), open_rom(args.edited)
+        patch = make_patch(source.read(0, len(source)), target.read(0, len(target)), fmt)
+        args.output.write_bytes(patch)
+        print(f"wrote {len(patch)} bytes to {args.output}")
+        return 0
+    source = open_rom(args.rom)
+    output = args.output or args.rom.with_name(f"{args.rom.stem} (patched){args.rom.suffix}")
+    # patches are made in z64 order; the output keeps the clean ROM's own byte order
+    output.write_bytes(source.file_order(apply_patch(source.read(0, len(source)), args.patch.read_bytes())))
+    print(f"wrote {output}")
+    return 0
+
+
+# `snapshot take|list|restore|prune`: the GUI's backups from the command line.
+def snapshot_command(args):
+    store = SnapshotStore(args.rom)
+    if args.action == 'take':
+        print(store.take())
+    elif args.action == 'list':
+        for m in store.snapshots():
+            print(f"{m['id']}  {m['created']}  {len(m['chunks'])} chunks")
+    elif args.action == 'restore':
+        written = store.restore(args.id, args.output)
+        print(f"restored {store.manifest(args.id)['id']} ({written} chunks written)")
+    else:
+        for snap_id in store.prune(args.keep, args.keep_daily):
+            print(f"removed {snap_id}")
+    return 0
+
+
+# `crc`: check the header boot checksum, optionally writing the right one.
+def crc_command(args):
+    rom = open_rom(args.rom)
+    cic = detect_cic(rom.read(0, 0x1000))
+    if cic is None:
+        raise ValueError("unknown boot code (not a CIC-6101/6102/6103/6105/6106 ROM)")
+    header = struct.unpack('>II', rom.read(0x10, 8))
+    crc = n64_crc(rom.read(0, CRC_END), cic)
+    status = 'OK' if header == crc else 'MISMATCH'
+    print(f"CIC-{cic}  header {header[0]:08X} {header[1]:08X}  computed {crc[0]:08X} {crc[1]:08X}  {status}")
+    if header != crc and args.fix:
+        rom.stage(0x10, struct.pack('>II', *crc))
+        rom.commit()
+        print("header updated")
+        return 0
+    return 0 if header == crc else 1
+
+
+# `xref`: where an item or spell is used.
+def xref_command(args):
+    matches = find_uses(args.rom, args.query)
+    if not matches:
+        raise ValueError(f"no item or spell matches {args.query!r}")
+    for label, uses in matches:
+        if args.format == 'jsonl':
+            for use in uses:
+                print(json.dumps({'item': label, **use}, ensure_ascii=False))
+            continue
+        print(f"{label}: {len(uses)} uses")
+        for use in uses:
+            print(f"  {use['kind']:<10} {use['name']}  ({use['field']})")
+    return 0
+
+
+# `batch`: one edit script over many ROMs, with a per-ROM summary.
+def batch_command(args):
+    roms = find_roms(args.roms)
+    if not roms:
+        raise ValueError("no .z64/.v64/.n64 files found")
+    verb = 'would change' if args.dry_run else 'changed'
+    failed = 0
+    for report in batch_import(roms, read_rows(args.script, args.format), args.table, args.dry_run, args.jobs):
+        name = Path(report['rom']).name
+        if report['errors']:
+            failed += 1
+            print(f"{name}: {len(report['errors'])} errors; nothing written")
+            for error in report['errors']:
+                print(f"  {name}: {error}", file=sys.stderr)
+        else:
+            print(f"{name}: {verb} {report['fields']} fields in {report['records']} records")
+    print(f"{len(roms) - failed} of {len(roms)} ROMs {'valid' if args.dry_run else 'updated'}")
+    return 1 if failed else 0
+
+
+# Seed list from '7', '1-100' or '1,5,9-12'.
+def parse_seeds(text):
+    seeds = []
+    for part in text.split(','):
+        lo, _, hi = part.partition('-')
+        seeds.extend(range(int(lo), int(hi or lo) + 1))
+    return seeds
+
+
+# `randomize`: one seed's patch (or randomized ROM), or a batch of patches in parallel.
+def randomize_command(args):
+    shuffles = args.shuffle or RANDOMIZE_SHUFFLES
+    seeds = parse_seeds(args.seeds)
+    if len(seeds) == 1 and args.output.suffix.lower() in ('.z64', '.bps'):
+        rom = open_rom(args.rom)
+        source = rom.read(0, len(rom))
+        image = randomize_image(bytearray(source), seeds[0], shuffles, randomizer_context(rom))
+        args.output.write_bytes(make_patch(source, image, 'bps') if args.output.suffix.lower() == '.bps'
+                                else image)
+        print(f"seed {seeds[0]}: wrote {args.output}")
+        return 0
+    for seed, path in randomize_batch(args.rom, seeds, args.output, shuffles, args.jobs):
+        print(f"seed {seed}: wrote {path}")
+    return 0
+
+
+# `synth`: write a synthetic ROM for tests and benchmarks.
+def synth_command(args):
+    tables = synthesize_rom(args.output, args.seed, args.scale)
+    records = sum(len(spec.addresses) for spec in tables.values())
+    print(f"wrote {args.output} ({records} table records, scale {args.scale}, seed {args.seed})")
+    return 0
+
+
+# `bench`: time the hot paths on a synthetic ROM, write JSON, optionally compare with a baseline.
+def bench_command(args):
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+
+    def progress(name, result):
+        print(f"{name:<28} {format_seconds(result['best']):>10}  "
+              f"(median {format_seconds(result['median'])}, {result['repeat']} x {result['number']})",
+              file=sys.stderr)
+
+    report = run_benchmarks(args.scale, args.seed, args.repeat, args.select, progress)
+    for group, reason in report['skipped'].items():
+        print(f"skipped {group}: {reason}", file=sys.stderr)
+    text = json.dumps(report, indent=1)
+    if args.output:
+        args.output.write_text(text + '\n')
+    else:
+        print(text)
+    if baseline is None:
+        return 0
+
+    if (baseline.get('scale'), baseline.get('seed')) != (args.scale, args.seed):
+        print("warning: baseline was run with a different --scale/--seed", file=sys.stderr)
+    regressions = 0
+    for name, old, new, ratio in compare_benchmarks(baseline, report):
+        slower = ratio > 1 + args.threshold / 100
+        regressions += slower
+        print(f"{name:<28} {format_seconds(old):>10} -> {format_seconds(new):>10}  {ratio - 1:+7.1%}"
+              f"{'  REGRESSION' if slower else ''}", file=sys.stderr)
+    print(f"{regressions} regressions over {args.threshold:g}%", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+# Headless command line; main() (the GUI) runs when no arguments are given.
+def cli(argv=None):
+    parser = argparse.ArgumentParser(prog='AidynEditor', description='Aidyn Chronicles ROM tools.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help='dump record tables as JSON Lines or CSV')
+    export.add_argument('rom', type=Path, help='ROM file (.z64)')
+    export.add_argument('--format', choices=('jsonl', 'csv'), default='jsonl')
+    export.add_argument('--table', action='append', choices=EXPORT_TABLES,
+                        help='table to export (repeatable; default: all)')
+    export.add_argument('-o', '--output', type=Path,
+                        help='output file, or directory for CSV with several tables (default: stdout)')
+    export.set_defaults(func=export_command)
+
+    imp = commands.add_parser('import', help='apply field edits from a CSV or JSON Lines file')
+    imp.add_argument('rom', type=Path, help='ROM file (.z64) to edit in place')
+    imp.add_argument('edits', type=Path, help='rows shaped like `export` output (address or name + fields)')
+    imp.add_argument('--format', choices=('jsonl', 'csv'), help='default: from the file extension')
+    imp.add_argument('--table', choices=EXPORT_TABLES, help='table for rows without a table column')
+    imp.add_argument('--dry-run', action='store_true', help='validate only, write nothing')
+    imp.set_defaults(func=import_command)
+
+    diff = commands.add_parser('diff', help='field-level changes between two ROMs (exit 1 if any)')
+    diff.add_argument('roms', nargs='+', type=Path, metavar='ROM',
+                      help='OLD NEW (e.g. a clean ROM and the edited one), or one ROM with --snapshot')
+    diff.add_argument('--snapshot', nargs='?', const='', metavar='ID',
+                      help="compare the ROM with one of its snapshots (default: the newest, "
+                           "taken when the editor last opened it)")
+    diff.add_argument('--format', choices=('text', 'jsonl'), default='text')
+    diff.add_argument('--table', action='append', choices=EXPORT_TABLES,
+                      help='table to compare (repeatable; default: all)')
+    diff.set_defaults(func=diff_command)
+
+    patch = commands.add_parser('patch', help='make or apply IPS/BPS patches')
+    actions = patch.add_subparsers(dest='action', required=True)
+    make = actions.add_parser('make', help='patch turning ORIGINAL into EDITED')
+    make.add_argument('original', type=Path, help='unedited ROM, e.g. the backup')
+    make.add_argument('edited', type=Path, help='edited ROM')
+    make.add_argument('-o', '--output', type=Path, required=True, help='patch file (.bps or .ips)')
+    make.add_argument('--format', choices=('bps', 'ips'),
+                      help='default: from the output extension; IPS past 16 MiB is written as IPS32')
+    make.set_defaults(func=patch_command)
+    apply = actions.add_parser('apply', help='apply a patch to a clean ROM')
+    apply.add_argument('rom', type=Path, help='clean ROM (left unchanged)')
+    apply.add_argument('patch', type=Path, help='.bps, .ips or IPS32 patch')
+    apply.add_argument('-o', '--output', type=Path, help="patched ROM (default: '<rom> (patched).z64')")
+    apply.set_defaults(func=patch_command)
+
+    xref = commands.add_parser('xref', help='which shops, loot, characters and items use an item or spell')
+    xref.add_argument('rom', type=Path, help='ROM file')
+    xref.add_argument('query', help="hex code, exact name ('(weapon) Broadsword', '(spell) Air Fist') or fragment")
+    xref.add_argument('--format', choices=('text', 'jsonl'), default='text')
+    xref.set_defaults(func=xref_command)
+
+    batch = commands.add_parser('batch', help='apply one edit script to many ROMs in parallel')
+    batch.add_argument('script', type=Path, help='edit rows, as for `import` (CSV or JSON Lines)')
+    batch.add_argument('roms', nargs='+', type=Path, help='ROM files and/or directories of ROMs')
+    batch.add_argument('--format', choices=('jsonl', 'csv'), help='default: from the script extension')
+    batch.add_argument('--table', choices=EXPORT_TABLES, help='table for rows without a table column')
+    batch.add_argument('--dry-run', action='store_true', help='validate against every ROM, write nothing')
+    batch.add_argument('-j', '--jobs', type=int, help='worker processes (default: one per CPU)')
+    batch.set_defaults(func=batch_command)
+
+    rando = commands.add_parser('randomize', help='seeded shuffles written as BPS patches')
+    rando.add_argument('rom', type=Path, help='clean ROM')
+    rando.add_argument('seeds', help="seed or seeds: '7', '1-500', '1,5,9-12'")
+    rando.add_argument('-o', '--output', type=Path, required=True,
+                       help='directory for seed-N.bps patches; a .bps or .z64 file for a single seed')
+    rando.add_argument('--shuffle', action='append', choices=RANDOMIZE_SHUFFLES,
+                       help='what to shuffle (repeatable; default: all)')
+    rando.add_argument('-j', '--jobs', type=int, help='worker processes (default: one per CPU)')
+    rando.set_defaults(func=randomize_command)
+
+    crc = commands.add_parser('crc', help='verify the header boot checksum (exit 1 on mismatch)')
+    crc.add_argument('rom', type=Path, help='ROM file (.z64)')
+    crc.add_argument('--fix', action='store_true', help='write the computed CRC1/CRC2 into the header')
+    crc.set_defaults(func=crc_command)
+
+    synth = commands.add_parser('synth', help='write a synthetic ROM for tests and benchmarks')
+    synth.add_argument('output', type=Path, help='ROM file to create (.z64)')
+    synth.add_argument('--seed', type=int, default=0, help='random seed (default: 0)')
+    synth.add_argument('--scale', type=int, default=1,
+                       help='copies of every record table; extra copies go past 32 MiB (default: 1)')
+    synth.set_defaults(func=synth_command)
+
+    bench = commands.add_parser('bench', help='time lookups, export and editor saves on a synthetic ROM')
+    bench.add_argument('-o', '--output', type=Path, help='JSON results file (default: stdout)')
+    bench.add_argument('--compare', type=Path, metavar='BASELINE',
+                       help='earlier results to compare with (exit 1 on a regression)')
+    bench.add_argument('--threshold', type=float, default=10,
+                       help='percent slowdown of the best time counted as a regression (default: 10)')
+    bench.add_argument('-k', '--select', help='only benchmarks whose name contains this text')
+    bench.add_argument('--repeat', type=int, default=7, help='timed runs per benchmark (default: 7)')
+    bench.add_argument('--scale', type=int, default=1, help='synthetic table size, as for `synth` (default: 1)')
+    bench.add_argument('--seed', type=int, default=0, help='synthetic ROM seed (default: 0)')
+    bench.set_defaults(func=bench_command)
+
+    snapshot = commands.add_parser('snapshot', help="manage the ROM's deduplicated backups")
+    actions = snapshot.add_subparsers(dest='action', required=True)
+    for name, text in (('take', 'snapshot the ROM now'), ('list', 'list snapshots, newest first'),
+                       ('restore', 'write a snapshot back (only changed chunks)'),
+                       ('prune', 'apply a retention policy')):
+        action = actions.add_parser(name, help=text)
+        action.add_argument('rom', type=Path, help='ROM file (.z64)')
+        action.set_defaults(func=snapshot_command)
+        if name == 'restore':
+            action.add_argument('id', nargs='?', help='snapshot id (default: newest)')
+            action.add_argument('-o', '--output', type=Path, help='write to this file instead of the ROM')
+        if name == 'prune':
+            action.add_argument('--keep', type=int, default=SnapshotStore.keep, help='newest snapshots to keep')
+            action.add_argument('--keep-daily', type=int, default=SnapshotStore.keep_daily,
+                                help='also keep the newest snapshot of this many days')
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # reader went away (e.g. `| head`); silence the flush at interpreter exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"{parser.prog}: error: {e}\n")
 
 
 # Application entrypoint: creates root window, browse+backup bar, and event loop.
@@ -2804,14 +5098,24 @@ def main():
     Checkbutton(browse, text="Backup", variable=backup_var).grid(column=1, row=0, padx=6, pady=6)
 
     def on_browse():
-        # pick file, optionally back it up, then mount launchers
+        # pick file, map it (finishing any interrupted save), optionally back it up, then mount launchers
         rom = choose_rom(root)
         if not rom:
             return
+        # map the ROM once for the whole session; editors share this image
+        close_roms()
+        try:
+            recovered = open_rom(rom).recovered
+        except (OSError, ValueError) as e:
+            messagebox.showerror(APP_TITLE, f"Cannot map file:\n{e}")
+            return
+        if recovered:
+            messagebox.showinfo(APP_TITLE, "The last save was interrupted; it has now been completed.")
         if backup_var.get():
             # attempt backup; show anchored success flash if created
             bk = make_backup(rom)
             if bk is None:
+                close_roms()
                 return
             flash_saved(browse_btn, "Backup Created")
         # rebuild window with launcher grid
@@ -2825,6 +5129,9 @@ def main():
     # event loop
     root.mainloop()
 
+    # unmap the ROM and persist its name index for the next launch
+    close_roms()
+
 PARTY_ADDRESSES = [
     0x01FC7C84,  # Abrecan
     0x01FC7D0C,  # Alaron
@@ -3499,6 +5806,9 @@ WEAPON_ANIMATIONS = {
 
 inv_WEAPON_ANIMATIONS = {v: k for k, v in WEAPON_ANIMATIONS.items()}
 
+# Becan's party record; his trainer entry is named from it
+BECAN_ADDRESS = 0x01FC7EA4
+
 SHOPS = [
     "Erromon : Cavern Female",
     "Erromon : Cavern Male",
@@ -3559,6 +5869,14 @@ SHOPS = [
     "Ugarit : Shop-H",
 ]
 
+# trainers without shops
+NOT_SHOPS = [
+    "Talewok : Dryad",
+    "Talewok : Professor 1",
+    "Talewok : Professor 2",
+    "Talewok : Professor 3",
+]
+
 SHOP_TRAINERS = [
     0x01FC7ED3,  # Erromon : Becan
     0x01FC5007,  # Erromon : Cavern Female
@@ -4441,7 +6759,131 @@ SCHOOL = {
 }
 
 inv_SCHOOL = {v: k for k, v in SCHOOL.items()}
+
+# every editable record table, for read_table()/write_table()
+TABLES = {
+    'party': TableSpec(PARTY_ADDRESSES, 9, 44, CHARACTER_CODEC),
+    'enemy': TableSpec(ENEMY_ADDRESSES, 17, 44, ENEMY_CODEC),
+    'loot': TableSpec(DROP_CAT, 19, 22, LOOT_CODEC),
+    'accessory': TableSpec(ACCESSORY_ADDRESSES, 20, 24, ACCESSORY_CODEC),
+    'armor': TableSpec(ARMOR_ADDRESSES, 22, 26, ARMOR_CODEC),
+    'shield': TableSpec(SHIELD_ADDRESSES, 22, 26, ARMOR_CODEC),
+    'weapon': TableSpec(WEAPON_ADDRESSES, 21, 23, WEAPON_CODEC),
+    'wand': TableSpec(WAND_ADDRESSES, 18, 24, WAND_CODEC),
+    'scroll': TableSpec(SCROLL_ADDRESSES, 18, 24, SCROLL_CODEC),
+    'spell': TableSpec(SPELL_ADDRESSES, 22, 25, SPELL_CODEC),
+}
+
+# import-time bounds per table, mirroring each editor's FieldGuards limits
+_CHARACTER_RULES = {
+    'aspect': {1, 2},
+    'skills': {*range(11), 255},    # 255 = cannot learn
+    'shield_skill': {*range(11), 255},
+    'attributes': range(128),
+    'level': range(41),
+    'spell_levels': range(16),
+    'protection': range(128),
+}
+_ITEM_RULES = {
+    'value': range(65536),
+    'aspect': {0, 1, 2},
+    'attribute_amount': range(-128, 128),
+    'skill_amount': range(-128, 128),
+    'spell_level': range(16),
+    'magic_level': range(16),
+}
+FIELD_RULES = {
+    'party': _CHARACTER_RULES,
+    'enemy': {**_CHARACTER_RULES, 'exp': range(256)},
+    'loot': {
+        'gold_min': range(65536), 'gold_max': range(65536),
+        'reagent_min': range(100), 'reagent_max': range(100),
+        **{f'{slot}_chance': range(101) for slot in
+           ('armor', 'shield', 'weapon1', 'weapon2', 'weapon3', 'reagent',
+            'item1', 'item2', 'item3', 'item4', 'item5', 'item6')},
+        **{f'item{i}_{end}': range(100) for i in (1, 2) for end in ('min', 'max')},
+    },
+    'accessory': {**_ITEM_RULES, 'damage': range(128), 'protection': range(128),
+                  'str_required': range(128), 'int_required': range(128)},
+    'armor': {**_ITEM_RULES, 'defense': range(128), 'protection': range(128),
+              'dexterity': range(-128, 128), 'stealth': range(-128, 128)},
+    'weapon': {**_ITEM_RULES, 'str_required': range(256), 'hit': range(256),
+               'damage': range(256), 'range': range(256)},
+    'wand': {'damage': range(256), 'protection': range(256), 'str_required': range(31),
+             'int_required': range(31), 'value': range(65536), 'aspect': {0, 1, 2},
+             'skill_amount': range(-128, 128), 'charges': range(256), 'spell_level': range(16)},
+    'scroll': {'value': range(65536), 'cast_level': range(16)},
+    'spell': {'damage': range(256), 'stamina': range(121), 'wizard': range(11),
+              'range': range(256), 'exp': range(256), 'aspect': {0, 3, 4}},
+}
+FIELD_RULES['shield'] = FIELD_RULES['armor']
+
+# fields that may be given by the editor's combobox label instead of a number
+FIELD_CHOICES = {
+    'school': SCHOOL,
+    'attribute': EQUIPMENT_STAT,
+    'skill': SKILL_ATTRIBUTE,
+    'resist': RESIST, 'resist1': RESIST, 'resist2': RESIST, 'damage_type': RESIST,
+    # amounts are percentages, so their labels take a '%' to stay apart from raw numbers
+    **{f: {f'{k}%': v for k, v in RESIST_AMOUNTS.items()}
+       for f in ('resist_amount', 'resist1_amount', 'resist2_amount')},
+    'weapon_type': WEAPON_TYPE,
+    'animation': WEAPON_ANIMATIONS,
+    'target_num': TARGET_NUM,
+    'target_type': TARGET_TYPE,
+    'ingredient': SPELL_INGREDIENTS,
+}
+FIELD_LABELS = {field: {v: k for k, v in choices.items()} for field, choices in FIELD_CHOICES.items()}
+
+# synthetic ROM names: joiner, then the word lists combined into one name per kind
+_SYNTH_ADJECTIVES = ('Iron', 'Steel', 'Bronze', 'Silver', 'Golden', 'Rusty', 'Old', 'Elven',
+                     'Dwarf', 'Cursed', 'Holy', 'Dark', 'Storm', 'Frost', 'Ember', 'Oak')
+_SYNTH_CREATURES = ('Goblin', 'Troll', 'Wraith', 'Wolf', 'Bandit', 'Ogre', 'Spider', 'Skeleton',
+                    'Lizard', 'Golem')
+_SYNTH_ELEMENTS = ('Air', 'Fire', 'Frost', 'Stone', 'Shadow', 'Light', 'Storm', 'Earth', 'Spirit', 'Mind')
+SYNTH_NAMES = {
+    'party': ('', ('Al', 'Bre', 'Cor', 'Dra', 'El', 'Fen', 'Gor', 'Ja', 'Ke', 'Lo', 'Mor', 'Ra', 'Sy', 'Tha'),
+              ('aric', 'wyn', 'dan', 'ra', 'mund', 'gan', 'las', 'ric')),
+    'enemy': (' ', _SYNTH_ADJECTIVES, _SYNTH_CREATURES),
+    'loot': (' ', _SYNTH_CREATURES, ('Hoard', 'Purse', 'Cache', 'Drop', 'Den', 'Camp', 'Nest')),
+    'spell': (' ', _SYNTH_ELEMENTS, ('Fist', 'Shield', 'Lance', 'Ward', 'Bolt', 'Shroud', 'Sight', 'Web')),
+    'accessory': (' ', _SYNTH_ADJECTIVES, ('Ring', 'Amulet', 'Cloak', 'Helm', 'Gloves', 'Belt', 'Boots')),
+    'armor': (' ', _SYNTH_ADJECTIVES, ('Mail', 'Plate', 'Leather', 'Robe', 'Scale', 'Hauberk')),
+    'shield': (' ', _SYNTH_ADJECTIVES, ('Buckler', 'Shield', 'Targe')),
+    'weapon': (' ', _SYNTH_ADJECTIVES, ('Sword', 'Axe', 'Mace', 'Bow', 'Spear', 'Dagger', 'Club',
+                                        'Flail', 'Halberd')),
+    'wand': (' ', _SYNTH_ADJECTIVES, ('Wand', 'Rod', 'Staff', 'Sceptre')),
+    'scroll': (' ', _SYNTH_ELEMENTS, ('Scroll', 'Tome', 'Rune', 'Glyph', 'Tablet', 'Page', 'Sigil')),
+    'helmet': (' ', _SYNTH_ADJECTIVES, ('Helm', 'Cap', 'Coif')),
+    'cloak': (' ', _SYNTH_ADJECTIVES, ('Cloak', 'Cape', 'Mantle')),
+    'glove': (' ', _SYNTH_ADJECTIVES, ('Gloves', 'Gauntlets')),
+    'ring': (' ', _SYNTH_ADJECTIVES, ('Ring', 'Band')),
+    'belt': (' ', _SYNTH_ADJECTIVES, ('Belt', 'Girdle')),
+    'boots': (' ', _SYNTH_ADJECTIVES, ('Boots', 'Sandals')),
+    'amulet': (' ', _SYNTH_ADJECTIVES, ('Amulet', 'Charm', 'Pendant')),
+    'key': (' ', ('Gate', 'Tower', 'Crypt', 'Vault', 'Cellar', 'Prison', 'Temple', 'Manor', 'Mine'),
+            ('Key', 'Seal', 'Pass')),
+    'misc': (' ', _SYNTH_ADJECTIVES, ('Map', 'Letter', 'Gem', 'Idol', 'Herb', 'Totem', 'Coin')),
+}
+# item type (last byte of an ITEM_DIC code) -> SYNTH_NAMES kind, as get_major_item_dic() labels them
+SYNTH_ITEM_KINDS = {'01': 'misc', '05': 'armor', '06': 'shield', '07': 'weapon', '09': 'helmet',
+                    '0A': 'cloak', '0B': 'glove', '0C': 'ring', '0D': 'wand', '0E': 'belt',
+                    '0F': 'boots', '11': 'scroll', '12': 'key', '13': 'amulet'}
+
+# synthetic values that look like the game's rather than spanning the whole legal range
+SYNTH_RANGES = {
+    'attributes': range(3, 31), 'level': range(1, 41), 'value': range(5, 5001),
+    'gold_min': range(100), 'gold_max': range(100, 1000),
+    'damage': range(1, 41), 'defense': range(1, 21), 'protection': range(21),
+    'str_required': range(21), 'int_required': range(21), 'hit': range(21),
+    'attribute_amount': range(-5, 6), 'skill_amount': range(-5, 6),
+    'dexterity': range(-5, 1), 'stealth': range(-5, 1),
+    'loot': sorted(int(v, 16) for v in DROP_CAT.values()),
+}
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(cli())
     main()
 
 